@@ -22,4 +22,12 @@ app.conf.beat_schedule = {
         'task': 'zmanim_app.tasks.cleanup_old_zmanim',
         'schedule': crontab(minute=0),  # Every hour on the hour
     },
+    'maintain-zmanim-partitions': {
+        'task': 'zmanim_app.tasks.maintain_zmanim_partitions',
+        'schedule': crontab(hour=1, minute=30),  # Daily 1:30 AM
+    },
+    'flush-display-heartbeats': {
+        'task': 'zmanim_app.tasks.flush_display_heartbeats',
+        'schedule': crontab(),  # Every minute
+    },
 }
\ No newline at end of file
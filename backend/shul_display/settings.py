@@ -184,6 +184,53 @@ if sys.platform == 'win32':
     CELERY_TASK_ALWAYS_EAGER = False
     CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Zmanim Calculation
+# 'numpy' computes whole date ranges as arrays (validated against the zmanim
+# library with `manage.py validate_solar_engine`); 'library' uses the zmanim
+# package day by day
+ZMANIM_CALCULATION_BACKEND = config('ZMANIM_CALCULATION_BACKEND', default='numpy')
+
+# Store DailyZmanim as a monthly-partitioned table (PostgreSQL only, see
+# zmanim_app/partitions.py). Applied by migration 0040 or later with
+# `manage.py zmanim_partitions --convert`.
+ZMANIM_PARTITIONED_STORAGE = config('ZMANIM_PARTITIONED_STORAGE', default=False, cast=bool)
+ZMANIM_PARTITION_MONTHS_AHEAD = config('ZMANIM_PARTITION_MONTHS_AHEAD', default=8, cast=int)
+
+# Per-shul fill tasks fanned out by the weekly extension / daily validation:
+# how many calculate at once across all workers, and retries on failure
+# (backoff doubles from ZMANIM_FILL_RETRY_BACKOFF seconds)
+ZMANIM_FILL_CONCURRENCY = config('ZMANIM_FILL_CONCURRENCY', default=4, cast=int)
+ZMANIM_FILL_MAX_RETRIES = config('ZMANIM_FILL_MAX_RETRIES', default=3, cast=int)
+ZMANIM_FILL_RETRY_BACKOFF = config('ZMANIM_FILL_RETRY_BACKOFF', default=30, cast=int)
+
+# Share solar calculations between shuls in the same grid cell (step in
+# degrees, 0 = off; see zmanim_app/solar_buckets.py). Shuls whose difference
+# from their cell on the sampled dates exceeds the bound get an exact calculation.
+ZMANIM_BUCKET_PRECISION = config('ZMANIM_BUCKET_PRECISION', default=0, cast=float)
+ZMANIM_BUCKET_MAX_ERROR_SECONDS = config('ZMANIM_BUCKET_MAX_ERROR_SECONDS', default=30, cast=float)
+
+# Cache calculated solar zmanim per (location, date) in Redis so repeated
+# recalculations read them back instead of redoing the astronomy
+ZMANIM_SOLAR_MEMO = config('ZMANIM_SOLAR_MEMO', default=True, cast=bool)
+ZMANIM_SOLAR_MEMO_TIMEOUT = config('ZMANIM_SOLAR_MEMO_TIMEOUT', default=60 * 60 * 24 * 30, cast=int)
+
+# Calculate a missing DailyZmanim day on demand when a display or the
+# dashboard asks for it, instead of answering 404
+ZMANIM_READ_THROUGH = config('ZMANIM_READ_THROUGH', default=True, cast=bool)
+
+# Days calculated inside the registration request; the rest of the horizon
+# is calculated by a background task
+ZMANIM_ONBOARDING_INLINE_DAYS = config('ZMANIM_ONBOARDING_INLINE_DAYS', default=3, cast=int)
+
+# Store DailyZmanim solar times packed into one small binary column instead
+# of 29 columns (see zmanim_app/packed_times.py); convert existing rows with
+# `manage.py zmanim_compact_times`
+ZMANIM_COMPACT_TIMES = config('ZMANIM_COMPACT_TIMES', default=False, cast=bool)
+
+# Serve date range reads from per-shul monthly blobs of serialized zmanim
+# (see zmanim_app/monthly_blobs.py) instead of serializing every row
+ZMANIM_MONTHLY_BLOBS = config('ZMANIM_MONTHLY_BLOBS', default=True, cast=bool)
+
 # Cache Configuration
 CACHES = {
     'default': {
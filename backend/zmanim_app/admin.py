@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import Shul, CustomTime, DailyZmanim
+from django.db import transaction
+from django.db.models import Min, Max
+from .models import Shul, CustomTime, CustomTimeOccurrence, DailyZmanim, JewishCalendarDay
+from .display_cache import invalidate_shul_display
+from .display_strings import apply_display_strings
+from .monthly_blobs import invalidate_month_blobs
+from .packed_times import pack_times
 
 
 @admin.register(Shul)
@@ -50,8 +56,73 @@ class DailyZmanimAdmin(admin.ModelAdmin):
                 'sof_zman_tfila_gra', 'sof_zman_tfila_mga', 'candle_lighting'
             )
         }),
+        ('Hebrew Calendar & Learning Schedule', {
+            'fields': ('calendar_day',)
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+    raw_id_fields = ('calendar_day',)
+
+    # DailyZmanim has no signals (bulk writes and deletes): an edited row's
+    # stored display strings (or packed times) are re-made from the edited
+    # times here, and the cached display payloads and monthly blobs of the
+    # edited rows are dropped, once per shul
+    def save_model(self, request, obj, form, change):
+        if obj.packed_times is not None:
+            # The columns are set too and take precedence when loaded;
+            # compact rows store no display strings
+            obj.packed_times = pack_times(obj)
+        else:
+            apply_display_strings(obj, obj.shul)
+        super().save_model(request, obj, form, change)
+        self._invalidate([(obj.shul_id, obj.shul.slug, obj.date, obj.date)])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self._invalidate([(obj.shul_id, obj.shul.slug, obj.date, obj.date)])
+
+    def delete_queryset(self, request, queryset):
+        shul_ranges = list(
+            queryset.order_by().values_list('shul_id', 'shul__slug').annotate(first=Min('date'), last=Max('date'))
+        )
+        super().delete_queryset(request, queryset)
+        self._invalidate(shul_ranges)
+
+    @staticmethod
+    def _invalidate(shul_ranges):
+        for shul_id, slug, first, last in shul_ranges:
+            invalidate_shul_display(slug)
+            transaction.on_commit(
+                lambda shul_id=shul_id, first=first, last=last: invalidate_month_blobs(shul_id, first, last)
+            )
+
+
+@admin.register(JewishCalendarDay)
+class JewishCalendarDayAdmin(admin.ModelAdmin):
+    list_display = ('date', 'in_israel', 'jewish_day', 'jewish_month_name', 'jewish_year', 'parsha', 'significant_day')
+    list_filter = ('in_israel', 'is_yom_tov', 'is_rosh_chodesh')
+    search_fields = ('date', 'parsha', 'significant_day')
+    readonly_fields = ('created_at', 'updated_at')
+    date_hierarchy = 'date'
+
+    fieldsets = (
+        ('Basic Info', {
+            'fields': ('date', 'in_israel')
+        }),
+        ('Jewish Date', {
+            'fields': (
+                'jewish_year', 'jewish_month', 'jewish_month_name', 'jewish_day', 'day_of_week',
+                'significant_day', 'day_of_omer', 'day_of_chanukah'
+            )
+        }),
         ('Learning Schedule', {
-            'fields': ('parsha', 'daf_yomi_bavli', 'mishna_yomis', 'tehillim_monthly', 'daf_yomi_yerushalmi')
+            'fields': (
+                'parsha', 'daf_yomi_bavli', 'mishna_yomis', 'tehillim_monthly', 'daf_yomi_yerushalmi',
+                'pirkei_avos', 'daf_hashavua_bavli', 'amud_yomi_bavli_dirshu'
+            )
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -60,6 +131,16 @@ class DailyZmanimAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(CustomTimeOccurrence)
+class CustomTimeOccurrenceAdmin(admin.ModelAdmin):
+    list_display = ('custom_time', 'shul', 'date', 'time', 'updated_at')
+    list_filter = ('date',)
+    search_fields = ('shul__name', 'custom_time__display_name', 'custom_time__internal_name')
+    readonly_fields = ('updated_at',)
+    raw_id_fields = ('shul', 'custom_time')
+    date_hierarchy = 'date'
+
+
 @admin.register(CustomTime)
 class CustomTimeAdmin(admin.ModelAdmin):
     list_display = ('display_name', 'shul', 'time_type', 'daily', 'day_of_week')
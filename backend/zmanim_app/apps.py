@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ZmanimAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'zmanim_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - registers display cache invalidation
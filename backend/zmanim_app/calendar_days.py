@@ -0,0 +1,101 @@
+from datetime import timedelta
+from zmanim.hebrew_calendar.jewish_calendar import JewishCalendar
+from .models import JewishCalendarDay
+from .jewish_year_index import get_year_day
+from .zmanim_fields import CalendarSource, CALENDAR_SOURCE_FIELDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_calendar_day(target_date, in_israel=False):
+    """
+    Calculate the location-independent calendar data for one date
+
+    Returns an unsaved JewishCalendarDay instance.
+    """
+    jc = JewishCalendar(in_israel=in_israel)
+    jc.set_gregorian_date(target_date.year, target_date.month, target_date.day)
+
+    # Parsha and holiday values come from the year index (built once per Jewish year);
+    # every other field is read from its source in the field registry
+    source = CalendarSource(target_date, in_israel, jc, get_year_day(target_date, in_israel))
+
+    return JewishCalendarDay(
+        date=target_date,
+        in_israel=in_israel,
+        **{field.name: field.source(source) for field in CALENDAR_SOURCE_FIELDS}
+    )
+
+
+def get_calendar_days(start_date, end_date, in_israel=False, progress_callback=None):
+    """
+    Get the shared calendar rows for a date range, calculating missing dates
+
+    Each date is only ever calculated once for the whole system; every shul
+    calculating the same range afterwards just reads the existing rows.
+
+    progress_callback(days_done, days_total) is called after each date.
+
+    Returns:
+        Dict mapping date -> JewishCalendarDay
+    """
+    calendar_days = {
+        day.date: day
+        for day in JewishCalendarDay.objects.filter(
+            in_israel=in_israel,
+            date__range=[start_date, end_date]
+        )
+    }
+
+    missing = []
+    days_total = (end_date - start_date).days + 1
+    current_date = start_date
+    while current_date <= end_date:
+        if current_date not in calendar_days:
+            try:
+                missing.append(calculate_calendar_day(current_date, in_israel))
+            except Exception as e:
+                logger.error(f"Error calculating calendar for {current_date}: {str(e)}")
+        current_date += timedelta(days=1)
+        if progress_callback:
+            progress_callback((current_date - start_date).days, days_total)
+
+    if missing:
+        # Another worker may be filling the same dates - skip those and re-read
+        JewishCalendarDay.objects.bulk_create(missing, ignore_conflicts=True)
+        calendar_days.update({
+            day.date: day
+            for day in JewishCalendarDay.objects.filter(
+                in_israel=in_israel,
+                date__in=[day.date for day in missing]
+            )
+        })
+        logger.info(f"Calculated {len(missing)} new calendar days ({'Israel' if in_israel else 'diaspora'})")
+
+    return calendar_days
+
+
+def prune_calendar_days(before):
+    """
+    Delete the calendar days before a date that no DailyZmanim row uses
+
+    One DELETE statement: the ORM can't fast-delete JewishCalendarDay (the
+    PROTECT check on DailyZmanim.calendar_day loads every day first), and
+    NOT EXISTS already guarantees there is nothing to protect.
+
+    Returns:
+        Number of days deleted
+    """
+    from django.db import connection
+    from .models import DailyZmanim
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {JewishCalendarDay._meta.db_table} AS calendar_day "
+            f"WHERE calendar_day.date < %s AND NOT EXISTS ("
+            f"SELECT 1 FROM {DailyZmanim._meta.db_table} AS daily_zmanim "
+            f"WHERE daily_zmanim.calendar_day_id = calendar_day.id)",
+            [before]
+        )
+        return cursor.rowcount
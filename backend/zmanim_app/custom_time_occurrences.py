@@ -0,0 +1,85 @@
+from datetime import timedelta
+from django.db.models import Q, Min, Max
+from .models import CustomTime, CustomTimeOccurrence, DailyZmanim
+import logging
+
+logger = logging.getLogger(__name__)
+
+# weekly_target rules read up to 6 days ahead of the display date
+WEEKLY_TARGET_LOOKAHEAD = 6
+
+
+def materialize_occurrences(shul, start_date, end_date, custom_times=None):
+    """
+    Resolve custom times for every display date in a range and store them
+
+    Args:
+        shul: Shul model instance
+        start_date, end_date: Display dates to materialize (inclusive)
+        custom_times: Rules to materialize (default: all of the shul's)
+
+    Returns:
+        Number of occurrences written
+    """
+    if custom_times is None:
+        custom_times = list(CustomTime.objects.filter(shul=shul))
+    if not custom_times or start_date > end_date:
+        return 0
+
+    # Every DailyZmanim row any rule can read, in one query. Dates without a
+    # row map to None so calculate_many doesn't go looking for them again.
+    specific_dates = {ct.specific_date for ct in custom_times if ct.specific_date}
+    lookahead_end = end_date + timedelta(days=WEEKLY_TARGET_LOOKAHEAD)
+    rows = DailyZmanim.objects.filter(shul=shul).filter(
+        Q(date__range=[start_date, lookahead_end]) | Q(date__in=specific_dates)
+    )
+    rows_by_date = {row.date: row for row in rows}
+
+    occurrences = []
+    current_date = start_date
+    while current_date <= lookahead_end:
+        rows_by_date.setdefault(current_date, None)
+        current_date += timedelta(days=1)
+    for specific_date in specific_dates:
+        rows_by_date.setdefault(specific_date, None)
+
+    current_date = start_date
+    while current_date <= end_date:
+        values = CustomTime.calculate_many(custom_times, current_date, rows_by_date)
+        for custom_time in custom_times:
+            value = values[custom_time.id]
+            occurrences.append(CustomTimeOccurrence(
+                shul=shul,
+                custom_time=custom_time,
+                date=current_date,
+                time=value.time() if value else None,
+            ))
+        current_date += timedelta(days=1)
+
+    CustomTimeOccurrence.objects.bulk_create(
+        occurrences,
+        update_conflicts=True,
+        unique_fields=['custom_time', 'date'],
+        update_fields=['time', 'updated_at'],
+        batch_size=1000,
+    )
+    logger.info(f"Materialized {len(occurrences)} custom time occurrences for {shul.name} ({start_date} to {end_date})")
+    return len(occurrences)
+
+
+def refresh_custom_time(custom_time):
+    """Re-materialize one custom time over the shul's whole DailyZmanim horizon (after it is saved)"""
+    if custom_time.shul_id is None:
+        return 0
+    horizon = DailyZmanim.objects.filter(shul_id=custom_time.shul_id).aggregate(start=Min('date'), end=Max('date'))
+    if horizon['start'] is None:
+        return 0
+    return materialize_occurrences(custom_time.shul, horizon['start'], horizon['end'], [custom_time])
+
+
+def get_occurrences(shul, target_date):
+    """Materialized occurrences for one display date, by custom time id"""
+    return {
+        occurrence.custom_time_id: occurrence
+        for occurrence in CustomTimeOccurrence.objects.filter(shul=shul, date=target_date)
+    }
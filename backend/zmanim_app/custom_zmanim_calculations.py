@@ -1,11 +1,5 @@
 from zmanim.hebrew_calendar.jewish_date import JewishDate
-from zmanim.limudim.calculators.daf_yomi_bavli import DafYomiBavli
-from zmanim.limudim.calculators.mishna_yomis import MishnaYomis
-from zmanim.limudim.calculators.parsha import Parsha
-from zmanim.limudim.calculators.daf_yomi_yerushalmi import DafYomiYerushalmi
-from zmanim.limudim.calculators.pirkei_avos import PirkeiAvos
-from zmanim.limudim.calculators.daf_hashavua_bavli import DafHashavuaBavli
-from .amud_yomi_bavli_dirshu import AmudYomiBavliDirshu
+from .limud_tables import limud_description
 
 
 def get_limud_description(calculator, date):
@@ -20,32 +14,35 @@ def get_limud_description(calculator, date):
         return ""
 
 
+# The get_* functions below read precomputed cycle tables (limud_tables);
+# get_limud_description() is the direct, slow path through a calculator.
+
 def get_daf_yomi_bavli(date):
-    return get_limud_description(DafYomiBavli(), date)
+    return limud_description('daf_yomi_bavli', date)
 
 
 def get_mishna_yomis(date):
-    return get_limud_description(MishnaYomis(), date)
+    return limud_description('mishna_yomis', date)
 
 
 def get_parsha(date, in_israel=False):
-    return get_limud_description(Parsha(in_israel), date)
+    return limud_description('parsha_israel' if in_israel else 'parsha', date)
 
 
 def get_daf_yomi_yerushalmi(date):
-    return get_limud_description(DafYomiYerushalmi(), date)
+    return limud_description('daf_yomi_yerushalmi', date)
 
 
 def get_pirkei_avos(date):
-    return get_limud_description(PirkeiAvos(), date)
+    return limud_description('pirkei_avos', date)
 
 
 def get_daf_hashavua_bavli(date):
-    return get_limud_description(DafHashavuaBavli(), date)
+    return limud_description('daf_hashavua_bavli', date)
 
 
 def get_amud_yomi_bavli_dirshu(date):
-    return get_limud_description(AmudYomiBavliDirshu(), date)
+    return limud_description('amud_yomi_bavli_dirshu', date)
 
 
 def get_tehillim_monthly(date):
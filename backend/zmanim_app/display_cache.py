@@ -0,0 +1,142 @@
+"""
+Cache of the public display payload (shul_display_data)
+
+Every screen polls shul_display_data (the wood/marble displays every 30s),
+but the payload only changes when the shul's data changes or its local date
+rolls over. The payload is built once per shul per local date and stored in
+the Redis cache together with the version tokens it was built from:
+
+    display:payload:<slug>   {'shul_id', 'timezone', 'date', 'versions', 'payload'}
+    display:payload:<slug>:full   the same with every field (?full=1 previews)
+    display:version:<slug>   token bumped when anything of this shul changes
+    display:version:global   token bumped when GlobalMemorialBoxes changes
+
+A poll is one get_many() of those three keys. An entry is only served when
+both tokens still match and its date is the shul's current local date, so
+invalidation is just replacing a token (see signals.py and ZmanimCalculator).
+Tokens are time values; an evicted token is re-created with a new time,
+which invalidates every entry built from the old one.
+"""
+from django.core.cache import cache
+from django.db import transaction
+import datetime
+import hashlib
+import logging
+import pytz
+import time
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_TIMEOUT = 60 * 60 * 24  # Entries expire anyway when the local date changes
+
+GLOBAL_VERSION_KEY = 'display:version:global'
+
+
+# Payload variants: the layout's fields (default) or all of them
+FULL_PAYLOAD = 'full'
+
+
+def payload_key(slug, variant=None):
+    return f'display:payload:{slug}:{variant}' if variant else f'display:payload:{slug}'
+
+
+def shul_version_key(slug):
+    return f'display:version:{slug}'
+
+
+def _new_token():
+    return time.time_ns()
+
+
+def _get_or_create_token(key, token):
+    """Return the stored token, creating it if it is missing or was evicted"""
+    if token is None:
+        cache.add(key, _new_token(), timeout=None)
+        token = cache.get(key)
+    return token
+
+
+def get_display_payload(slug, variant=None):
+    """
+    Return the cached payload entry for a shul if it is still valid
+
+    Returns:
+        (entry, versions) - entry is None on a miss; versions are the current
+        tokens to pass to set_display_payload() when rebuilding
+    """
+    keys = [payload_key(slug, variant), shul_version_key(slug), GLOBAL_VERSION_KEY]
+    found = cache.get_many(keys)
+
+    versions = [
+        _get_or_create_token(shul_version_key(slug), found.get(shul_version_key(slug))),
+        _get_or_create_token(GLOBAL_VERSION_KEY, found.get(GLOBAL_VERSION_KEY)),
+    ]
+
+    entry = found.get(payload_key(slug, variant))
+    if entry is None or entry['versions'] != versions:
+        return None, versions
+
+    local_date = datetime.datetime.now(pytz.timezone(entry['timezone'])).date()
+    if entry['date'] != local_date.isoformat():
+        return None, versions
+
+    return entry, versions
+
+
+def set_display_payload(shul, local_date, payload, versions, variant=None):
+    """
+    Store a freshly built payload
+
+    versions must be the tokens read *before* the payload was built, so a
+    change committed while building leaves the entry stale instead of
+    hiding the change.
+    """
+    entry = {
+        'shul_id': shul.id,
+        'timezone': shul.timezone,
+        'date': local_date.isoformat(),
+        'versions': versions,
+        'payload': payload,
+    }
+    cache.set(payload_key(shul.slug, variant), entry, timeout=PAYLOAD_TIMEOUT)
+    return entry
+
+
+def get_entry_validators(entry):
+    """
+    Conditional GET validators for a payload entry
+
+    The ETag is derived from the payload's inputs (version tokens, the
+    DailyZmanim row's updated_at and the local date), so it can be checked
+    without touching the payload. Last-Modified is the newest of those
+    inputs, including the start of the local day so a date rollover always
+    counts as a modification.
+
+    Returns:
+        (etag, last_modified) - quoted strong ETag and a Unix timestamp
+    """
+    last_updated = entry['payload'].get('last_updated') or ''
+    fingerprint = ':'.join([str(version) for version in entry['versions']] + [last_updated, entry['date']])
+    etag = '"%s"' % hashlib.sha1(fingerprint.encode()).hexdigest()
+
+    tz = pytz.timezone(entry['timezone'])
+    local_midnight = tz.localize(datetime.datetime.combine(datetime.date.fromisoformat(entry['date']), datetime.time()))
+    timestamps = [version / 1e9 for version in entry['versions']] + [local_midnight.timestamp()]
+    if last_updated:
+        timestamps.append(datetime.datetime.fromisoformat(last_updated).timestamp())
+    return etag, int(max(timestamps))
+
+
+def _bump(key):
+    cache.set(key, _new_token(), timeout=None)
+
+
+def invalidate_shul_display(slug):
+    """Invalidate a shul's cached payload once the current transaction commits"""
+    if slug:
+        transaction.on_commit(lambda: _bump(shul_version_key(slug)))
+
+
+def invalidate_all_displays():
+    """Invalidate every shul's cached payload (global data changed)"""
+    transaction.on_commit(lambda: _bump(GLOBAL_VERSION_KEY))
@@ -0,0 +1,95 @@
+"""
+Display access heartbeats, buffered in the cache
+
+Every display poll used to write Shul.last_display_access. Polls now only
+record a heartbeat in the Redis cache, one key per screen so concurrent
+polls of a shul's screens never overwrite each other:
+
+    display:heartbeats:<shul_id>:<screen_id>   unix timestamp
+    display:screens:<shul_id>                 screen ids of the shul
+
+where screen_id identifies one screen (client IP + user agent). The index
+is only rewritten when a screen is not in it yet; a screen lost to two new
+screens registering at once adds itself again on its next poll. Client
+headers make screen ids cheap to forge, so a shul keeps at most
+MAX_SCREENS_PER_SHUL of them (screens whose heartbeat expired make room).
+
+The flush_display_heartbeats task copies the newest heartbeat of every shul
+to last_display_access in one bulk update, and the master admin counts the
+screens seen within SCREEN_ONLINE_SECONDS.
+"""
+from django.core.cache import cache
+import datetime
+import hashlib
+import time
+
+# ShulDisplay polls every 5 minutes, the wood/marble displays every 30s
+SCREEN_ONLINE_SECONDS = 10 * 60
+
+# Long enough to survive a few missed flushes
+HEARTBEAT_TIMEOUT = 60 * 60
+
+# Screens remembered per shul
+MAX_SCREENS_PER_SHUL = 50
+
+
+def heartbeat_key(shul_id, screen_id):
+    return f'display:heartbeats:{shul_id}:{screen_id}'
+
+
+def screens_key(shul_id):
+    return f'display:screens:{shul_id}'
+
+
+def get_screen_id(request):
+    """Stable, anonymous id for the screen making a request"""
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    ip = forwarded_for.split(',')[0].strip() if forwarded_for else request.META.get('REMOTE_ADDR', '')
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    return hashlib.sha1(f'{ip}|{user_agent}'.encode()).hexdigest()[:16]
+
+
+def record_heartbeat(shul_id, screen_id):
+    """Record that a screen polled the display (no database write)"""
+    screens = cache.get(screens_key(shul_id)) or []
+    if screen_id not in screens:
+        if len(screens) >= MAX_SCREENS_PER_SHUL:
+            alive = cache.get_many([heartbeat_key(shul_id, screen) for screen in screens])
+            screens = [screen for screen in screens if heartbeat_key(shul_id, screen) in alive]
+            if len(screens) >= MAX_SCREENS_PER_SHUL:
+                return
+        # Kept until pruned: expiring it would drop screens that are still polling
+        cache.set(screens_key(shul_id), screens + [screen_id], timeout=None)
+    cache.set(heartbeat_key(shul_id, screen_id), time.time(), timeout=HEARTBEAT_TIMEOUT)
+
+
+def get_heartbeats(shul_ids):
+    """Dict of shul_id -> {screen_id: timestamp} for the given shuls"""
+    shul_ids = list(shul_ids)
+    screens = cache.get_many([screens_key(shul_id) for shul_id in shul_ids])
+
+    keys = {}
+    for shul_id in shul_ids:
+        for screen_id in screens.get(screens_key(shul_id)) or []:
+            keys[heartbeat_key(shul_id, screen_id)] = (shul_id, screen_id)
+
+    heartbeats = {}
+    for key, seen in cache.get_many(list(keys)).items():
+        shul_id, screen_id = keys[key]
+        heartbeats.setdefault(shul_id, {})[screen_id] = seen
+    return heartbeats
+
+
+def count_screens_online(shul_ids):
+    """Dict of shul_id -> number of screens seen in the last SCREEN_ONLINE_SECONDS"""
+    cutoff = time.time() - SCREEN_ONLINE_SECONDS
+    heartbeats = get_heartbeats(shul_ids)
+    return {
+        shul_id: sum(1 for seen in heartbeats.get(shul_id, {}).values() if seen >= cutoff)
+        for shul_id in shul_ids
+    }
+
+
+def latest_heartbeat(heartbeats):
+    """Newest heartbeat as an aware datetime"""
+    return datetime.datetime.fromtimestamp(max(heartbeats.values()), tz=datetime.timezone.utc)
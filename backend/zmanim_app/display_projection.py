@@ -0,0 +1,98 @@
+"""
+The DailyZmanim fields a shul's display screen actually shows
+
+ShulDisplayLayout.layout_config lists the items of every box, with ids
+made of the payload section and the display key:
+
+    zmanim_Alos HaShachar    limudim_Parsha    calendar_Jewish Year
+
+(custom times and texts have their own ids and are not DailyZmanim
+fields). get_projection() turns a layout into a DisplayProjection:
+
+    display_keys   frozenset of the display keys to format
+    columns        DailyZmanim columns to load with .only()
+
+The Wood/Marble themes read a fixed set of keys instead of the layout (the
+main zmanim, the Hebrew date, the parsha and a scroller of every limud), so
+BASELINE_DISPLAY_KEYS are always part of it. Projections are kept per
+process by layout version (primary key and updated_at).
+
+Anything else a payload build touches on the row (e.g. the base time of a
+custom time that is not materialized yet) is still loaded by Django on
+access, just with an extra query.
+"""
+from collections import namedtuple
+from .zmanim_fields import FIELDS, FIELDS_BY_NAME, SOLAR, ZMANIM, CALENDAR, LIMUDIM, section_fields
+
+# Layout item id prefix -> payload section
+ITEM_SECTIONS = {'zmanim': ZMANIM, 'limudim': LIMUDIM, 'calendar': CALENDAR}
+
+# Read by ShulDisplayWoodGold / ShulDisplayMarbleGold whatever the layout says
+BASELINE_DISPLAY_KEYS = frozenset([
+    'Alos HaShachar', 'Neitz HaChamah', 'Sof Zman Krias Shema GRA', 'Sof Zman Tefillah GRA',
+    'Chatzos', 'Mincha Gedola', 'Mincha Ketana', 'Plag HaMincha', 'Shkiah', 'Tzais',
+    'Jewish Day', 'Jewish Month Name', 'Jewish Year',
+    # The parsha and the limudim scroller (Object.entries(limudim))
+    *(field.display_key for field in section_fields(LIMUDIM)),
+])
+
+# Loaded for every projection: the row itself, its stored display strings
+# (and packed times, see packed_times.py) and the calendar values of
+# formatted_hebrew_date
+BASE_COLUMNS = [
+    'date', 'updated_at', 'display_strings', 'display_strings_format', 'packed_times', 'calendar_day',
+    'calendar_day__jewish_day', 'calendar_day__jewish_month_name', 'calendar_day__jewish_year',
+]
+
+MAX_CACHED_PROJECTIONS = 1024
+
+DisplayProjection = namedtuple('DisplayProjection', ['display_keys', 'columns'])
+
+_FIELDS_BY_SECTION_KEY = {(field.section, field.display_key): field for field in FIELDS}
+
+
+def layout_fields(layout_config):
+    """DailyZmanim fields referenced by the items of a layout_config"""
+    fields = []
+    for box in (layout_config or {}).values():
+        if not isinstance(box, dict):
+            continue
+        for item in box.get('items') or []:
+            item_type, _, name = str(item.get('id') or '').partition('_')
+            section = ITEM_SECTIONS.get(item_type)
+            if section is None:
+                continue
+            # Display key ids are what the layout editor saves; field name ids
+            # (zmanim_alos) are accepted too
+            field = _FIELDS_BY_SECTION_KEY.get((section, name)) or FIELDS_BY_NAME.get(name)
+            if field is not None:
+                fields.append(field)
+    return fields
+
+
+def build_projection(layout_config):
+    display_keys = set(BASELINE_DISPLAY_KEYS)
+    display_keys.update(field.display_key for field in layout_fields(layout_config))
+
+    columns = list(BASE_COLUMNS)
+    for field in FIELDS:
+        if field.display_key not in display_keys:
+            continue
+        column = field.name if field.source == SOLAR else f'calendar_day__{field.name}'
+        if column not in columns:
+            columns.append(column)
+    return DisplayProjection(frozenset(display_keys), columns)
+
+
+_projections = {}
+
+
+def get_projection(layout):
+    """The DisplayProjection of a ShulDisplayLayout, built once per layout version"""
+    key = (layout.pk, layout.updated_at)
+    projection = _projections.get(key)
+    if projection is None:
+        if len(_projections) >= MAX_CACHED_PROJECTIONS:
+            _projections.clear()
+        projection = _projections[key] = build_projection(layout.layout_config)
+    return projection
@@ -0,0 +1,51 @@
+"""
+Display-ready time strings, stored with each DailyZmanim row
+
+Calculated times never change after calculation, but every display and
+admin request used to round (halachically, per field) and strftime the
+same ~30 values again. The calculator now stores the formatted solar
+fields of zmanim_fields in DailyZmanim.display_strings, keyed by display
+name, together with the format they were made for (display_strings_format, e.g. '12h:0' for
+12-hour without seconds).
+
+Readers call get_display_strings(), which copies the stored strings when
+they match the shul's current time_format/show_seconds and formats the
+row on the spot otherwise (rows written before a settings change, until
+refresh_display_strings has rewritten them, and compact rows, which
+store none - see packed_times.py). A row saved on its own (an admin edit)
+has its strings re-made by DailyZmanimAdmin.save_model.
+"""
+from .zmanim_fields import SOLAR_ZMANIM_FIELDS, get_formatter
+
+
+def display_format_key(time_format, show_seconds):
+    """Identifies the settings a set of display strings was formatted for"""
+    return f"{time_format}:{int(bool(show_seconds))}"
+
+
+def shul_format_key(shul):
+    return display_format_key(shul.time_format, shul.show_seconds)
+
+
+def format_display_strings(daily_zmanim, time_format, show_seconds, display_keys=None):
+    """Display name -> formatted string (or None) for every stored time of a row (or those in display_keys)"""
+    return get_formatter(time_format, show_seconds, display_keys=display_keys).zmanim(daily_zmanim)
+
+
+def apply_display_strings(daily_zmanim, shul):
+    """Store the display strings for the shul's current settings on an (unsaved) row"""
+    daily_zmanim.display_strings = format_display_strings(daily_zmanim, shul.time_format, shul.show_seconds)
+    daily_zmanim.display_strings_format = shul_format_key(shul)
+    return daily_zmanim
+
+
+def get_display_strings(daily_zmanim, shul, display_keys=None):
+    """
+    The row's display strings in the shul's current format (copied when
+    stored, formatted otherwise), limited to display_keys (a frozenset) if given
+    """
+    if daily_zmanim.display_strings and daily_zmanim.display_strings_format == shul_format_key(shul):
+        return {field.display_key: daily_zmanim.display_strings.get(field.display_key)
+                for field in SOLAR_ZMANIM_FIELDS
+                if display_keys is None or field.display_key in display_keys}
+    return format_display_strings(daily_zmanim, shul.time_format, shul.show_seconds, display_keys)
@@ -1,7 +1,6 @@
 import logging
 from zmanim.util.geo_location import GeoLocation
 from zmanim.zmanim_calendar import ZmanimCalendar
-from zmanim.hebrew_calendar.jewish_calendar import JewishCalendar
 from datetime import date
 
 logger = logging.getLogger(__name__)
@@ -14,7 +13,6 @@ def get_daily_zmanim(latitude, longitude, timezone, target_date=None, name="Your
         if target_date is None:
             target_date = date.today()
         zmanim_calendar = ZmanimCalendar(geo_location=location, date=target_date)
-        jewish_calendar = JewishCalendar(date=target_date)
 
         zmanim = {
             'alos': zmanim_calendar.alos(),
@@ -0,0 +1,75 @@
+"""
+Year-ahead index of parsha and holiday values, one per Jewish year
+
+Parsha, significant day, omer and chanukah counters only depend on the
+date and on Israel vs. the diaspora. JewishYearIndex walks a whole Jewish
+year once with a single JewishCalendar (forward() a day at a time) and
+keeps the values in a list indexed by days since Rosh Hashana, so every
+later lookup for that year is a subtraction and a list index.
+
+Indexes are built on first use and kept per process; the calendar day
+calculation reads them, and anything else that needs these values for a
+date range (e.g. a calendar export) should too.
+"""
+from collections import namedtuple
+from datetime import timedelta
+import threading
+from zmanim.hebrew_calendar.jewish_calendar import JewishCalendar
+from zmanim.hebrew_calendar.jewish_date import JewishDate
+from .custom_zmanim_calculations import get_parsha
+
+YearDay = namedtuple('YearDay', ['parsha', 'significant_day', 'day_of_omer', 'day_of_chanukah'])
+
+TISHREI = 7
+
+
+class JewishYearIndex:
+    """Parsha and holiday values for every day of one Jewish year"""
+
+    def __init__(self, jewish_year, in_israel=False):
+        self.jewish_year = jewish_year
+        self.in_israel = in_israel
+        self.days = []
+
+        jc = JewishCalendar(in_israel=in_israel)
+        jc.set_jewish_date(jewish_year, TISHREI, 1)
+        self.start = jc.gregorian_date
+        while jc.jewish_year == jewish_year:
+            self.days.append(YearDay(
+                parsha=get_parsha(jc.gregorian_date, in_israel),
+                significant_day=jc.significant_day() or '',
+                day_of_omer=jc.day_of_omer(),
+                day_of_chanukah=jc.day_of_chanukah(),
+            ))
+            jc.forward()
+        self.end = self.start + timedelta(days=len(self.days) - 1)
+
+    def __contains__(self, gregorian_date):
+        return self.start <= gregorian_date <= self.end
+
+    def get(self, gregorian_date):
+        return self.days[(gregorian_date - self.start).days]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_year_index(jewish_year, in_israel=False):
+    """The (cached) index of a Jewish year"""
+    key = (jewish_year, in_israel)
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = _indexes[key] = JewishYearIndex(jewish_year, in_israel)
+    return index
+
+
+def get_year_day(gregorian_date, in_israel=False):
+    """YearDay (parsha, significant_day, day_of_omer, day_of_chanukah) for a Gregorian date"""
+    for (_, index_in_israel), index in list(_indexes.items()):
+        if index_in_israel == in_israel and gregorian_date in index:
+            return index.get(gregorian_date)
+    return get_year_index(JewishDate(gregorian_date).jewish_year, in_israel).get(gregorian_date)
@@ -0,0 +1,142 @@
+"""
+Precomputed lookup tables for the limud (learning schedule) calculators
+
+A zmanim LimudCalculator answers limud(date) by walking every interval
+from the start of the date's cycle up to the date - hundreds of steps for
+Daf Yomi, each creating JewishDates. LimudTable walks a cycle once, with
+the calculator's own interval and unit logic, and keeps
+
+    interval_starts   Gregorian ordinals of each interval's first day
+    interval_ends     ... and last day
+    descriptions      limud description of each interval
+
+so any date in that cycle is a bisect into interval_starts. Cycles are
+built the first time a date inside them is looked up and kept for the
+life of the process (a whole Daf Yomi cycle is ~2700 short strings).
+"""
+from bisect import bisect_right
+import logging
+import threading
+from zmanim.hebrew_calendar.jewish_date import JewishDate
+from zmanim.limudim.calculators.daf_yomi_bavli import DafYomiBavli
+from zmanim.limudim.calculators.mishna_yomis import MishnaYomis
+from zmanim.limudim.calculators.parsha import Parsha
+from zmanim.limudim.calculators.daf_yomi_yerushalmi import DafYomiYerushalmi
+from zmanim.limudim.calculators.pirkei_avos import PirkeiAvos
+from zmanim.limudim.calculators.daf_hashavua_bavli import DafHashavuaBavli
+from zmanim.limudim.interval import Interval
+from .amud_yomi_bavli_dirshu import AmudYomiBavliDirshu
+
+logger = logging.getLogger(__name__)
+
+CALCULATORS = {
+    'daf_yomi_bavli': DafYomiBavli,
+    'mishna_yomis': MishnaYomis,
+    'parsha': lambda: Parsha(False),
+    'parsha_israel': lambda: Parsha(True),
+    'daf_yomi_yerushalmi': DafYomiYerushalmi,
+    'pirkei_avos': PirkeiAvos,
+    'daf_hashavua_bavli': DafHashavuaBavli,
+    'amud_yomi_bavli_dirshu': AmudYomiBavliDirshu,
+}
+
+
+class LimudCycle:
+    """One calculator cycle flattened into parallel interval arrays"""
+
+    def __init__(self, calculator, cycle):
+        self.start = cycle.start_date.gregorian_date.toordinal()
+        self.end = cycle.end_date.gregorian_date.toordinal()
+        self.interval_starts = []
+        self.interval_ends = []
+        self.descriptions = []
+
+        units = calculator.cycle_units_calculation(cycle)
+        errors = 0
+        interval = Interval.first_for_cycle(cycle, calculator.interval_end_calculation)
+        while interval is not None:
+            try:
+                unit = calculator.unit_for_interval(units, interval)
+                description = str(unit) if unit is not None else ''
+            except Exception:
+                description = ''
+                errors += 1
+
+            self.interval_starts.append(interval.start_date.gregorian_date.toordinal())
+            self.interval_ends.append(interval.end_date.gregorian_date.toordinal())
+            self.descriptions.append(description)
+
+            if calculator.is_skip_interval(interval):
+                interval = interval.skip(calculator.interval_end_calculation)
+            else:
+                interval = interval.next(calculator.interval_end_calculation)
+
+        if errors:
+            logger.error(
+                f"{calculator.__class__.__name__}: {errors} of {len(self.descriptions)} intervals "
+                f"in the cycle starting {cycle.start_date.gregorian_date} failed"
+            )
+
+    def description(self, ordinal):
+        index = bisect_right(self.interval_starts, ordinal) - 1
+        if index < 0 or ordinal > self.interval_ends[index]:
+            return ''
+        return self.descriptions[index]
+
+
+class LimudTable:
+    """Lazily built cycles of one limud calculator"""
+
+    def __init__(self, calculator):
+        self.calculator = calculator
+        self.cycles = []
+        self.outside = set()  # ordinals of dates no cycle covers
+        self.lock = threading.Lock()
+
+    def description(self, gregorian_date):
+        """Limud description for a date ('' outside any cycle), same as calculator.limud()"""
+        ordinal = gregorian_date.toordinal()
+        if ordinal in self.outside:
+            return ''
+        cycle = self._find_cycle(ordinal)
+        if cycle is None:
+            with self.lock:
+                cycle = self._find_cycle(ordinal) or self._build_cycle(gregorian_date)
+        return cycle.description(ordinal) if cycle else ''
+
+    def _find_cycle(self, ordinal):
+        for cycle in self.cycles:
+            if cycle.start <= ordinal <= cycle.end:
+                return cycle
+        return None
+
+    def _build_cycle(self, gregorian_date):
+        jewish_date = JewishDate(gregorian_date)
+        cycle = self.calculator.find_cycle(jewish_date)
+        if cycle is None or cycle.end_date < jewish_date:
+            self.outside.add(gregorian_date.toordinal())
+            return None
+        limud_cycle = LimudCycle(self.calculator, cycle)
+        self.cycles.append(limud_cycle)
+        return limud_cycle
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_table(name):
+    table = _tables.get(name)
+    if table is None:
+        with _tables_lock:
+            table = _tables.setdefault(name, LimudTable(CALCULATORS[name]()))
+    return table
+
+
+def limud_description(name, gregorian_date):
+    """Description of the limud of one of CALCULATORS for a Gregorian date"""
+    try:
+        return get_table(name).description(gregorian_date)
+    except Exception as e:
+        logger.error(f"Error in {name} limud table for {gregorian_date}: {str(e)}")
+        return ''
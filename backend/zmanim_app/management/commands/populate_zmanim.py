@@ -1,9 +1,31 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import time
 from zmanim_app.models import Shul
 from zmanim_app.zmanim_calculator import ZmanimCalculator
 
 
+def populate_shul(shul_id, start_date, end_date):
+    """
+    Calculate zmanim for one shul (runs inside a worker process)
+
+    Returns a (shul_id, shul_name, record_count, error, elapsed_seconds) tuple
+    so failures are reported back to the parent instead of killing the pool.
+    """
+    started = time.monotonic()
+    shul_name = f"Shul {shul_id}"
+    try:
+        shul = Shul.objects.get(id=shul_id)
+        shul_name = shul.name
+        count = ZmanimCalculator.calculate_date_range(shul, start_date, end_date)
+        return shul_id, shul_name, count, None, time.monotonic() - started
+    except Exception as e:
+        return shul_id, shul_name, 0, str(e), time.monotonic() - started
+
+
 class Command(BaseCommand):
     help = 'Pre-calculate and populate zmanim for all or specific shuls'
 
@@ -24,11 +46,21 @@ class Command(BaseCommand):
             default=6,
             help='Number of months to calculate (default: 6)',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes for --all-shuls (default: 1, runs serially)',
+        )
 
     def handle(self, *args, **options):
         shul_id = options.get('shul_id')
         all_shuls = options.get('all_shuls')
         months = options.get('months')
+        workers = options.get('workers')
+
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
 
         if shul_id:
             # Calculate for single shul
@@ -47,23 +79,79 @@ class Command(BaseCommand):
 
         elif all_shuls:
             # Calculate for all active shuls
-            shuls = Shul.objects.filter(is_active=True)
-            total_shuls = shuls.count()
-
-            self.stdout.write(f"Calculating {months} months of zmanim for {total_shuls} shuls...")
+            shul_ids = list(Shul.objects.filter(is_active=True).values_list('id', flat=True))
+            total_shuls = len(shul_ids)
 
             start_date = date.today()
             end_date = start_date + timedelta(days=months * 30)
 
-            for index, shul in enumerate(shuls, 1):
-                self.stdout.write(f"[{index}/{total_shuls}] Processing {shul.name}...")
-                try:
-                    count = ZmanimCalculator.calculate_date_range(shul, start_date, end_date)
-                    self.stdout.write(self.style.SUCCESS(f"  SUCCESS: Created {count} records"))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"  ERROR: {str(e)}"))
+            self.stdout.write(
+                f"Calculating {months} months of zmanim for {total_shuls} shuls "
+                f"using {workers} worker{'s' if workers > 1 else ''}..."
+            )
+
+            started = time.monotonic()
+            if workers == 1:
+                results = (populate_shul(shul_id, start_date, end_date) for shul_id in shul_ids)
+                failures, total_records = self._report_progress(results, total_shuls, started)
+            else:
+                failures, total_records = self._run_parallel(shul_ids, start_date, end_date, workers, started)
 
-            self.stdout.write(self.style.SUCCESS(f"\nSUCCESS: Completed processing {total_shuls} shuls"))
+            elapsed = time.monotonic() - started
+            self._report_summary(total_shuls, total_records, failures, elapsed)
 
         else:
             self.stdout.write(self.style.ERROR("Please specify --shul-id or --all-shuls"))
+
+    def _run_parallel(self, shul_ids, start_date, end_date, workers, started):
+        """Fan shuls out across a process pool, each worker with its own DB connection"""
+        # Close the parent's connections before forking so no child inherits
+        # (and later tears down) a socket that belongs to another process
+        connections.close_all()
+
+        methods = multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            futures = [
+                executor.submit(populate_shul, shul_id, start_date, end_date)
+                for shul_id in shul_ids
+            ]
+            results = (future.result() for future in as_completed(futures))
+            return self._report_progress(results, len(shul_ids), started)
+
+    def _report_progress(self, results, total_shuls, started):
+        """Print one line per finished shul and collect failures"""
+        failures = []
+        total_records = 0
+
+        for index, (shul_id, shul_name, count, error, shul_elapsed) in enumerate(results, 1):
+            rate = index / max(time.monotonic() - started, 1e-6)
+            prefix = f"[{index}/{total_shuls}] {shul_name}"
+            if error:
+                failures.append((shul_id, shul_name, error))
+                self.stdout.write(self.style.ERROR(f"{prefix}: ERROR: {error}"))
+            else:
+                total_records += count
+                self.stdout.write(
+                    f"{prefix}: {count} records in {shul_elapsed:.1f}s "
+                    f"({rate:.2f} shuls/s overall)"
+                )
+
+        return failures, total_records
+
+    def _report_summary(self, total_shuls, total_records, failures, elapsed):
+        succeeded = total_shuls - len(failures)
+        shuls_per_minute = succeeded / elapsed * 60 if elapsed else 0
+        records_per_second = total_records / elapsed if elapsed else 0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\nSUCCESS: Completed processing {succeeded}/{total_shuls} shuls "
+            f"({total_records} records) in {elapsed:.1f}s "
+            f"- {shuls_per_minute:.1f} shuls/min, {records_per_second:.0f} records/s"
+        ))
+
+        if failures:
+            self.stdout.write(self.style.ERROR(f"{len(failures)} shuls failed:"))
+            for shul_id, shul_name, error in failures:
+                self.stdout.write(self.style.ERROR(f"  [{shul_id}] {shul_name}: {error}"))
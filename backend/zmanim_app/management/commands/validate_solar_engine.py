@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from datetime import date, timedelta
+import time
+from zmanim_app.models import Shul
+from zmanim_app.solar_engine import (
+    validate_backends, calculate_solar_range, BACKEND_LIBRARY, BACKEND_NUMPY, np
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare the NumPy solar engine against the zmanim library for one or all shuls'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--shul-id',
+            type=int,
+            help='Validate a specific shul ID',
+        )
+        parser.add_argument(
+            '--all-shuls',
+            action='store_true',
+            help='Validate every active shul',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=180,
+            help='Number of days to compare, starting today (default: 180)',
+        )
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError("NumPy is not installed")
+
+        if options.get('shul_id'):
+            shuls = Shul.objects.filter(id=options['shul_id'])
+        elif options.get('all_shuls'):
+            shuls = Shul.objects.filter(is_active=True)
+        else:
+            raise CommandError("Please specify --shul-id or --all-shuls")
+
+        start_date = date.today()
+        end_date = start_date + timedelta(days=options['days'] - 1)
+        failed = 0
+
+        for shul in shuls:
+            max_difference, mismatches = validate_backends(
+                shul.latitude, shul.longitude, shul.timezone, start_date, end_date, name=shul.name
+            )
+            library_seconds = self._time_backend(shul, start_date, end_date, BACKEND_LIBRARY)
+            numpy_seconds = self._time_backend(shul, start_date, end_date, BACKEND_NUMPY)
+
+            summary = (
+                f"{shul.name}: max difference {max_difference:.6f}s, "
+                f"library {library_seconds * 1000:.0f}ms, numpy {numpy_seconds * 1000:.1f}ms"
+            )
+            if mismatches:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"{summary} - {len(mismatches)} mismatches"))
+                for target_date, field, expected, actual in mismatches[:10]:
+                    self.stdout.write(f"  {target_date} {field}: library={expected} numpy={actual}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{summary} - OK"))
+
+        if failed:
+            raise CommandError(f"{failed} shuls differ by a second or more")
+
+    def _time_backend(self, shul, start_date, end_date, backend):
+        started = time.monotonic()
+        calculate_solar_range(shul.latitude, shul.longitude, shul.timezone, start_date, end_date,
+                              name=shul.name, backend=backend)
+        return time.monotonic() - started
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from zmanim_app.models import DailyZmanim, MonthlyZmanimBlob
+from zmanim_app.display_strings import apply_display_strings
+from zmanim_app.packed_times import TIME_COLUMNS, compact_row, expand_row
+
+BATCH_SIZE = 1000
+
+# Compact rows store no display strings; expanded rows get theirs back
+UPDATE_FIELDS = TIME_COLUMNS + ['display_strings', 'display_strings_format']
+
+
+class Command(BaseCommand):
+    help = 'Convert stored DailyZmanim rows to compact packed times (ZMANIM_COMPACT_TIMES), or back with --expand'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expand',
+            action='store_true',
+            help='Move packed times back into the regular columns',
+        )
+
+    def handle(self, *args, **options):
+        expand = options['expand']
+        rows = DailyZmanim.objects.select_related(None).select_related('shul').filter(
+            packed_times__isnull=not expand
+        ).only('id', 'shul__time_format', 'shul__show_seconds', *TIME_COLUMNS)
+        if expand:
+            def convert(row):
+                return apply_display_strings(expand_row(row), row.shul)
+        else:
+            convert = compact_row
+
+        converted = 0
+        last_id = 0
+        while True:
+            batch = list(rows.filter(id__gt=last_id).order_by('id')[:BATCH_SIZE])
+            if not batch:
+                break
+            with transaction.atomic():
+                DailyZmanim.objects.bulk_update([convert(row) for row in batch], UPDATE_FIELDS)
+            converted += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f"{converted} rows...")
+
+        # Compacting drops microseconds, so serialized months may differ
+        if converted:
+            MonthlyZmanimBlob.objects.all().delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Expanded' if expand else 'Compacted'} {converted} DailyZmanim rows"
+        ))
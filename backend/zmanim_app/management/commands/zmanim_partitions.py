@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from zmanim_app import partitions
+
+
+class Command(BaseCommand):
+    help = 'Manage the monthly partitions of the DailyZmanim table (PostgreSQL only)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert the existing DailyZmanim table to monthly partitions',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            help='Months of partitions to create ahead (default: ZMANIM_PARTITION_MONTHS_AHEAD)',
+        )
+        parser.add_argument(
+            '--drop-expired',
+            action='store_true',
+            help='Drop partitions whose dates are all in the past',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioned storage requires PostgreSQL")
+
+        with transaction.atomic():
+            if options['convert']:
+                if partitions.convert_to_partitioned(connection):
+                    self.stdout.write(self.style.SUCCESS("Converted DailyZmanim to monthly partitions"))
+                else:
+                    self.stdout.write("DailyZmanim is already partitioned")
+
+            if not partitions.is_partitioned(connection):
+                raise CommandError("DailyZmanim is not partitioned (run with --convert first)")
+
+            created = partitions.ensure_partitions(ahead=options['months_ahead'], connection=connection)
+            self.stdout.write(f"Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}")
+
+            if options['drop_expired']:
+                dropped = partitions.drop_expired_partitions(connection)
+                self.stdout.write(f"Dropped {len(dropped)} partitions{': ' + ', '.join(dropped) if dropped else ''}")
+
+            existing = partitions.list_partitions(connection)
+            self.stdout.write(self.style.SUCCESS(
+                f"{len(existing)} monthly partitions "
+                f"({min(existing):%Y-%m} to {max(existing):%Y-%m})" if existing else "No monthly partitions"
+            ))
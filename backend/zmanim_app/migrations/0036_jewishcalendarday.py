@@ -0,0 +1,63 @@
+# Generated by Django 5.0.8 on 2026-10-17 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0035_shul_show_box5'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JewishCalendarDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('in_israel', models.BooleanField(default=False)),
+                ('jewish_year', models.IntegerField(blank=True, null=True)),
+                ('jewish_month', models.IntegerField(blank=True, null=True)),
+                ('jewish_month_name', models.CharField(blank=True, max_length=50)),
+                ('jewish_day', models.IntegerField(blank=True, null=True)),
+                ('day_of_week', models.IntegerField(blank=True, null=True)),
+                ('significant_day', models.CharField(blank=True, max_length=100)),
+                ('day_of_omer', models.IntegerField(blank=True, null=True)),
+                ('day_of_chanukah', models.IntegerField(blank=True, null=True)),
+                ('is_rosh_chodesh', models.BooleanField(default=False)),
+                ('is_yom_tov', models.BooleanField(default=False)),
+                ('is_chol_hamoed', models.BooleanField(default=False)),
+                ('is_erev_yom_tov', models.BooleanField(default=False)),
+                ('is_chanukah', models.BooleanField(default=False)),
+                ('is_taanis', models.BooleanField(default=False)),
+                ('is_assur_bemelacha', models.BooleanField(default=False)),
+                ('is_erev_rosh_chodesh', models.BooleanField(default=False)),
+                ('molad_datetime', models.DateTimeField(blank=True, null=True)),
+                ('kiddush_levana_earliest_3_days', models.DateTimeField(blank=True, null=True)),
+                ('kiddush_levana_earliest_7_days', models.DateTimeField(blank=True, null=True)),
+                ('kiddush_levana_latest_15_days', models.DateTimeField(blank=True, null=True)),
+                ('parsha', models.CharField(blank=True, max_length=100)),
+                ('daf_yomi_bavli', models.CharField(blank=True, max_length=100)),
+                ('mishna_yomis', models.CharField(blank=True, max_length=100)),
+                ('tehillim_monthly', models.CharField(blank=True, max_length=100)),
+                ('daf_yomi_yerushalmi', models.CharField(blank=True, max_length=100)),
+                ('pirkei_avos', models.CharField(blank=True, max_length=100)),
+                ('daf_hashavua_bavli', models.CharField(blank=True, max_length=100)),
+                ('amud_yomi_bavli_dirshu', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Jewish Calendar Day',
+                'verbose_name_plural': 'Jewish Calendar Days',
+                'ordering': ['date'],
+                'unique_together': {('date', 'in_israel')},
+            },
+        ),
+        migrations.AddField(
+            model_name='dailyzmanim',
+            name='calendar_day',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='daily_zmanim', to='zmanim_app.jewishcalendarday'),
+        ),
+    ]
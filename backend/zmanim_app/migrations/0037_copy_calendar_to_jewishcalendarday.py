@@ -0,0 +1,52 @@
+# Generated by Django 5.0.8 on 2026-10-17 12:20
+
+from django.db import migrations
+
+
+CALENDAR_FIELDS = [
+    'jewish_year', 'jewish_month', 'jewish_month_name', 'jewish_day', 'day_of_week',
+    'significant_day', 'day_of_omer', 'day_of_chanukah',
+    'is_rosh_chodesh', 'is_yom_tov', 'is_chol_hamoed', 'is_erev_yom_tov',
+    'is_chanukah', 'is_taanis', 'is_assur_bemelacha', 'is_erev_rosh_chodesh',
+    'molad_datetime',
+    'kiddush_levana_earliest_3_days', 'kiddush_levana_earliest_7_days', 'kiddush_levana_latest_15_days',
+    'parsha', 'daf_yomi_bavli', 'mishna_yomis', 'tehillim_monthly', 'daf_yomi_yerushalmi',
+    'pirkei_avos', 'daf_hashavua_bavli', 'amud_yomi_bavli_dirshu',
+]
+
+
+def copy_calendar_to_shared_rows(apps, schema_editor):
+    """Create one JewishCalendarDay per existing date and point every DailyZmanim row at it"""
+    DailyZmanim = apps.get_model('zmanim_app', 'DailyZmanim')
+    JewishCalendarDay = apps.get_model('zmanim_app', 'JewishCalendarDay')
+
+    dates = DailyZmanim.objects.order_by('date').values_list('date', flat=True).distinct()
+    for current_date in dates:
+        # All shuls were calculated with in_israel=False, so any row for the date will do
+        values = DailyZmanim.objects.filter(date=current_date).values(*CALENDAR_FIELDS).first()
+        calendar_day, _ = JewishCalendarDay.objects.get_or_create(
+            date=current_date,
+            in_israel=False,
+            defaults=values
+        )
+        DailyZmanim.objects.filter(date=current_date).update(calendar_day=calendar_day)
+
+
+def copy_calendar_back_to_daily_rows(apps, schema_editor):
+    DailyZmanim = apps.get_model('zmanim_app', 'DailyZmanim')
+    JewishCalendarDay = apps.get_model('zmanim_app', 'JewishCalendarDay')
+
+    for values in JewishCalendarDay.objects.values('id', *CALENDAR_FIELDS):
+        calendar_day_id = values.pop('id')
+        DailyZmanim.objects.filter(calendar_day_id=calendar_day_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0036_jewishcalendarday'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_calendar_to_shared_rows, copy_calendar_back_to_daily_rows),
+    ]
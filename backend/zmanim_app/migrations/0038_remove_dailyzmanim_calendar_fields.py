@@ -0,0 +1,125 @@
+# Generated by Django 5.0.8 on 2026-10-17 12:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0037_copy_calendar_to_jewishcalendarday'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='amud_yomi_bavli_dirshu',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='daf_hashavua_bavli',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='daf_yomi_bavli',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='daf_yomi_yerushalmi',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='day_of_chanukah',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='day_of_omer',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='day_of_week',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_assur_bemelacha',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_chanukah',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_chol_hamoed',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_erev_rosh_chodesh',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_erev_yom_tov',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_rosh_chodesh',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_taanis',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='is_yom_tov',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='jewish_day',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='jewish_month',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='jewish_month_name',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='jewish_year',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='kiddush_levana_earliest_3_days',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='kiddush_levana_earliest_7_days',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='kiddush_levana_latest_15_days',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='mishna_yomis',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='molad_datetime',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='parsha',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='pirkei_avos',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='significant_day',
+        ),
+        migrations.RemoveField(
+            model_name='dailyzmanim',
+            name='tehillim_monthly',
+        ),
+    ]
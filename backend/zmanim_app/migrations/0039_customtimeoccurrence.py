@@ -0,0 +1,31 @@
+# Generated by Django 5.0.8 on 2026-10-17 12:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0038_remove_dailyzmanim_calendar_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomTimeOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('time', models.TimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('custom_time', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='zmanim_app.customtime')),
+                ('shul', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='custom_time_occurrences', to='zmanim_app.shul')),
+            ],
+            options={
+                'verbose_name': 'Custom Time Occurrence',
+                'verbose_name_plural': 'Custom Time Occurrences',
+                'indexes': [models.Index(fields=['shul', 'date'], name='zmanim_app__shul_id_8fd807_idx')],
+                'unique_together': {('custom_time', 'date')},
+            },
+        ),
+    ]
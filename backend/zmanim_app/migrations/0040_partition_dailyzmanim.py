@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def partition_dailyzmanim(apps, schema_editor):
+    """Convert DailyZmanim to monthly partitions if ZMANIM_PARTITIONED_STORAGE is on"""
+    from zmanim_app.partitions import partitioning_enabled, convert_to_partitioned
+
+    if partitioning_enabled():
+        convert_to_partitioned(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0039_customtimeoccurrence'),
+    ]
+
+    operations = [
+        # The model is unchanged either way, so there is nothing to undo on
+        # rollback - a partitioned table works with the older schema too
+        migrations.RunPython(partition_dailyzmanim, migrations.RunPython.noop),
+    ]
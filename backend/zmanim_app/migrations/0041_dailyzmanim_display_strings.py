@@ -0,0 +1,23 @@
+# Generated by Django 5.0.8 on 2026-10-17 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0040_partition_dailyzmanim'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyzmanim',
+            name='display_strings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='dailyzmanim',
+            name='display_strings_format',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.8 on 2026-10-17 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0041_dailyzmanim_display_strings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyzmanim',
+            name='packed_times',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
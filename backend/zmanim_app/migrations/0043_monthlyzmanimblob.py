@@ -0,0 +1,29 @@
+# Generated by Django 5.0.8 on 2026-10-17 12:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zmanim_app', '0042_dailyzmanim_packed_times'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyZmanimBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('data', models.JSONField(default=dict)),
+                ('built_at', models.DateTimeField(auto_now_add=True)),
+                ('shul', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_zmanim_blobs', to='zmanim_app.shul')),
+            ],
+            options={
+                'verbose_name': 'Monthly Zmanim Blob',
+                'verbose_name_plural': 'Monthly Zmanim Blobs',
+                'unique_together': {('shul', 'month')},
+            },
+        ),
+    ]
@@ -3,9 +3,12 @@ from django.contrib.auth.models import User
 from django.conf import settings
 from django.utils.text import slugify
 import uuid
+import logging
 from datetime import timedelta
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 
 class Shul(models.Model):
     """Represents a synagogue with all its settings"""
@@ -145,6 +148,13 @@ class Shul(models.Model):
         return self.get_zmanim_for_date(date.today())
 
 
+class DailyZmanimManager(models.Manager):
+    def get_queryset(self):
+        # Calendar and limudim attributes are read through calendar_day,
+        # so always join it to avoid a query per row
+        return super().get_queryset().select_related('calendar_day')
+
+
 class DailyZmanim(models.Model):
     """Pre-calculated zmanim for a specific shul on a specific date"""
     shul = models.ForeignKey(Shul, on_delete=models.CASCADE, related_name='daily_zmanim')
@@ -193,6 +203,75 @@ class DailyZmanim(models.Model):
     shaah_zmanis_mga = models.FloatField(null=True, blank=True)
     temporal_hour = models.FloatField(null=True, blank=True)
 
+    # ========== HEBREW CALENDAR & LIMUDIM ==========
+    # Location-independent, so shared by every shul via JewishCalendarDay.
+    # The old per-row attributes (parsha, is_yom_tov, molad_datetime, ...)
+    # are still readable on DailyZmanim through the accessors defined below.
+    calendar_day = models.ForeignKey(
+        'JewishCalendarDay',
+        on_delete=models.PROTECT,
+        related_name='daily_zmanim',
+        null=True,
+        blank=True
+    )
+
+    # ========== DISPLAY STRINGS ==========
+    # Times formatted (and rounded) for the shul's time_format/show_seconds,
+    # keyed by display name - see display_strings.py
+    display_strings = models.JSONField(default=dict, blank=True)
+    display_strings_format = models.CharField(max_length=10, blank=True)
+
+    # ========== COMPACT STORAGE ==========
+    # With ZMANIM_COMPACT_TIMES the solar fields above are NULL and their
+    # values are packed here - see packed_times.py (unpacked in from_db)
+    packed_times = models.BinaryField(null=True, blank=True, editable=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['shul', 'date']
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['shul', 'date']),
+        ]
+        verbose_name_plural = 'Daily Zmanim'
+
+    objects = DailyZmanimManager()
+
+    def __str__(self):
+        return f"{self.shul.name} - {self.date}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if instance.__dict__.get('packed_times') is not None:
+            from .packed_times import load_packed
+            load_packed(instance)
+        return instance
+
+    @classmethod
+    def get_for_date(cls, shul, target_date):
+        """Get zmanim for a specific date"""
+        return cls.objects.filter(shul=shul, date=target_date).first()
+
+    @classmethod
+    def get_range(cls, shul, start_date, end_date):
+        """Get zmanim for a date range"""
+        return cls.objects.filter(shul=shul, date__range=[start_date, end_date]).order_by('date')
+
+
+class JewishCalendarDay(models.Model):
+    """
+    Hebrew calendar data and learning schedules for a single date.
+
+    None of these values depend on a shul's coordinates (only on the date and
+    Israel/diaspora), so they are calculated once per date for the whole
+    system and referenced from DailyZmanim.calendar_day.
+    """
+    date = models.DateField()
+    in_israel = models.BooleanField(default=False)
+
     # ========== JEWISH CALENDAR - DATE INFO (5 fields) ==========
     jewish_year = models.IntegerField(null=True, blank=True)
     jewish_month = models.IntegerField(null=True, blank=True)
@@ -238,26 +317,43 @@ class DailyZmanim(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields exposed on DailyZmanim for backwards compatibility
+    CALENDAR_FIELDS = [
+        'jewish_year', 'jewish_month', 'jewish_month_name', 'jewish_day', 'day_of_week',
+        'significant_day', 'day_of_omer', 'day_of_chanukah',
+        'is_rosh_chodesh', 'is_yom_tov', 'is_chol_hamoed', 'is_erev_yom_tov',
+        'is_chanukah', 'is_taanis', 'is_assur_bemelacha', 'is_erev_rosh_chodesh',
+        'molad_datetime',
+        'kiddush_levana_earliest_3_days', 'kiddush_levana_earliest_7_days', 'kiddush_levana_latest_15_days',
+        'parsha', 'daf_yomi_bavli', 'mishna_yomis', 'tehillim_monthly', 'daf_yomi_yerushalmi',
+        'pirkei_avos', 'daf_hashavua_bavli', 'amud_yomi_bavli_dirshu',
+    ]
+
     class Meta:
-        unique_together = ['shul', 'date']
+        unique_together = ['date', 'in_israel']
         ordering = ['date']
-        indexes = [
-            models.Index(fields=['shul', 'date']),
-        ]
-        verbose_name_plural = 'Daily Zmanim'
+        verbose_name = 'Jewish Calendar Day'
+        verbose_name_plural = 'Jewish Calendar Days'
 
     def __str__(self):
-        return f"{self.shul.name} - {self.date}"
+        return f"{self.date}{' (Israel)' if self.in_israel else ''}"
 
-    @classmethod
-    def get_for_date(cls, shul, target_date):
-        """Get zmanim for a specific date"""
-        return cls.objects.filter(shul=shul, date=target_date).first()
 
-    @classmethod
-    def get_range(cls, shul, start_date, end_date):
-        """Get zmanim for a date range"""
-        return cls.objects.filter(shul=shul, date__range=[start_date, end_date]).order_by('date')
+def _calendar_attribute(name):
+    """Read-through accessor for a JewishCalendarDay field on DailyZmanim"""
+    default = JewishCalendarDay._meta.get_field(name).get_default()
+
+    def getter(self):
+        if self.calendar_day is None:
+            return default
+        return getattr(self.calendar_day, name)
+
+    getter.__name__ = name
+    return property(getter)
+
+
+for _field_name in JewishCalendarDay.CALENDAR_FIELDS:
+    setattr(DailyZmanim, _field_name, _calendar_attribute(_field_name))
 
 
 class ShulDisplayLayout(models.Model):
@@ -345,79 +441,144 @@ class CustomTime(models.Model):
     def __str__(self):
         return f"{self.shul.name} - {self.display_name}"
 
-    def calculate_time(self, target_date=None):
+    def calculate_time(self, target_date=None, daily_zmanim=None):
         """
         Calculate the time for this custom time.
 
         Args:
             target_date: The date to display the time on (defaults to today)
+            daily_zmanim: Optional pre-loaded DailyZmanim row for the
+                calculation date (saves a query)
 
         Returns:
             datetime object with the calculated time, or None if not applicable
 
-        The calculation works in two steps:
-        1. Determine WHICH date's zmanim to use (based on calculation_mode)
-        2. Check if we should DISPLAY on target_date (based on daily/days_of_week)
+        The calculation works in three steps:
+        1. Check if we should DISPLAY on target_date (based on daily/days_of_week)
+        2. Determine WHICH date's zmanim to use (based on calculation_mode)
+        3. Resolve the time from that date's zmanim
         """
-        from datetime import datetime, timedelta, date, time as dt_time
-        import logging
-
-        logger = logging.getLogger(__name__)
+        from datetime import date
 
         if target_date is None:
             target_date = date.today()
 
         # STEP 1: Check if we should DISPLAY on this date
-        if self.daily:
-            # Display on all days
-            pass
-        else:
-            # Check if this custom time should be displayed on the target date
-            # Convert Python weekday (0=Monday) to our model format (0=Sunday)
-            target_day_of_week = (target_date.weekday() + 1) % 7
-
-            # Support both new (days_of_week list) and legacy (day_of_week single int)
-            applicable_days = self.days_of_week if self.days_of_week else []
-            if not applicable_days and self.day_of_week is not None:
-                # Legacy: single day_of_week
-                applicable_days = [self.day_of_week]
-
-            if not applicable_days:
-                logger.info(f"Custom time '{self.display_name}' has no display days and is not daily.")
-                return None
-
-            if target_day_of_week not in applicable_days:
-                # This custom time doesn't display on this day
-                logger.info(f"Custom time '{self.display_name}' does not display on day {target_day_of_week} (target: {target_date})")
-                return None
+        if not self.displays_on(target_date):
+            return None
 
         # STEP 2: Determine WHICH date's zmanim to use for calculation
         calculation_date = self._get_calculation_date(target_date)
-
         if calculation_date is None:
             logger.error(f"Could not determine calculation date for '{self.display_name}'")
             return None
 
-        logger.info(f"Calculating custom time '{self.display_name}' using date {calculation_date} (display date: {target_date})")
-
         # STEP 3: Calculate the actual time
+        if self.time_type == 'dynamic' and daily_zmanim is None:
+            daily_zmanim = DailyZmanim.objects.filter(shul_id=self.shul_id, date=calculation_date).first()
+        return self.resolve_time(calculation_date, daily_zmanim)
+
+    @classmethod
+    def calculate_many(cls, custom_times, target_date, daily_zmanim_by_date=None):
+        """
+        Calculate many custom times for one display date with at most one query
+
+        Args:
+            custom_times: Iterable of CustomTime instances
+            target_date: The date to display the times on
+            daily_zmanim_by_date: Optional dict of already-loaded DailyZmanim
+                rows by date (e.g. {today: todays_row})
+
+        Returns:
+            Dict mapping CustomTime id -> datetime, or None if not applicable
+        """
+        daily_zmanim_by_date = dict(daily_zmanim_by_date or {})
+
+        # Steps 1 & 2 for every rule, collecting the zmanim dates we still need
+        calculation_dates = {}
+        missing = set()
+        for custom_time in custom_times:
+            if not custom_time.displays_on(target_date):
+                calculation_dates[custom_time.id] = None
+                continue
+            calculation_date = custom_time._get_calculation_date(target_date)
+            calculation_dates[custom_time.id] = calculation_date
+            if calculation_date is None:
+                logger.error(f"Could not determine calculation date for '{custom_time.display_name}'")
+            elif custom_time.time_type == 'dynamic' and calculation_date not in daily_zmanim_by_date:
+                missing.add((custom_time.shul_id, calculation_date))
+
+        # One query for every (shul, date) row not passed in
+        rows_by_key = {}
+        if missing:
+            rows = DailyZmanim.objects.filter(
+                shul_id__in={shul_id for shul_id, _ in missing},
+                date__in={calculation_date for _, calculation_date in missing}
+            )
+            rows_by_key = {(row.shul_id, row.date): row for row in rows}
+
+        # Step 3
+        results = {}
+        for custom_time in custom_times:
+            calculation_date = calculation_dates[custom_time.id]
+            if calculation_date is None:
+                results[custom_time.id] = None
+                continue
+            daily_zmanim = daily_zmanim_by_date.get(calculation_date) or \
+                rows_by_key.get((custom_time.shul_id, calculation_date))
+            results[custom_time.id] = custom_time.resolve_time(calculation_date, daily_zmanim)
+        return results
+
+    def displays_on(self, target_date):
+        """Whether this custom time is shown on target_date (daily / days_of_week)"""
+        if self.daily:
+            # Display on all days
+            return True
+
+        # Convert Python weekday (0=Monday) to our model format (0=Sunday)
+        target_day_of_week = (target_date.weekday() + 1) % 7
+
+        # Support both new (days_of_week list) and legacy (day_of_week single int)
+        applicable_days = self.days_of_week if self.days_of_week else []
+        if not applicable_days and self.day_of_week is not None:
+            # Legacy: single day_of_week
+            applicable_days = [self.day_of_week]
+
+        if not applicable_days:
+            logger.debug(f"Custom time '{self.display_name}' has no display days and is not daily.")
+            return False
+
+        if target_day_of_week not in applicable_days:
+            logger.debug(f"Custom time '{self.display_name}' does not display on day {target_day_of_week} (target: {target_date})")
+            return False
+
+        return True
+
+    def resolve_time(self, calculation_date, daily_zmanim=None):
+        """
+        Resolve the time from the calculation date's zmanim
+
+        Args:
+            calculation_date: Date whose zmanim the time is based on
+            daily_zmanim: DailyZmanim row for calculation_date (dynamic times only)
+
+        Returns:
+            datetime, or None if it cannot be resolved
+        """
+        from datetime import datetime, timedelta, time as dt_time
+
+        logger.debug(f"Calculating custom time '{self.display_name}' using date {calculation_date}")
+
         if self.time_type == 'fixed':
-            fixed_time = self.fixed_time
-            calculated_datetime = datetime.combine(calculation_date, fixed_time)
-            return calculated_datetime
+            return datetime.combine(calculation_date, self.fixed_time)
         elif self.time_type == 'dynamic':
             try:
-                # Get zmanim from DailyZmanim table for the calculation date
-                daily_zmanim = DailyZmanim.objects.filter(shul=self.shul, date=calculation_date).first()
-
                 if not daily_zmanim:
-                    logger.error(f"No DailyZmanim found for {self.shul.name} on {calculation_date}")
+                    logger.error(f"No DailyZmanim found for shul {self.shul_id} on {calculation_date}")
                     return None
 
                 # Get the base time field value from DailyZmanim
                 base_time_field = self.base_time
-                logger.info(f"Calculating custom time for base_time_field: {base_time_field}")
-
                 base_time_value = getattr(daily_zmanim, base_time_field, None)
 
                 if base_time_value is None:
@@ -437,8 +598,7 @@ class CustomTime(models.Model):
                     return None
 
                 # Apply offset
-                calculated_datetime = base_datetime + timedelta(minutes=self.offset_minutes)
-                return calculated_datetime
+                return base_datetime + timedelta(minutes=self.offset_minutes)
 
             except Exception as e:
                 logger.error(f"Error calculating custom time: {e}")
@@ -457,10 +617,7 @@ class CustomTime(models.Model):
         Returns:
             The date whose zmanim should be used for calculation
         """
-        from datetime import date, timedelta
-        import logging
-
-        logger = logging.getLogger(__name__)
+        from datetime import timedelta
 
         if self.calculation_mode == 'daily':
             # Use the target date's own zmanim
@@ -484,7 +641,7 @@ class CustomTime(models.Model):
                 days_ahead = (7 - current_day_of_week) + self.target_weekday
 
             calculation_date = target_date + timedelta(days=days_ahead)
-            logger.info(f"Weekly target mode: using {calculation_date} (target weekday: {self.target_weekday})")
+            logger.debug(f"Weekly target mode: using {calculation_date} (target weekday: {self.target_weekday})")
             return calculation_date
 
         elif self.calculation_mode == 'specific_date':
@@ -493,7 +650,7 @@ class CustomTime(models.Model):
                 logger.error(f"Custom time '{self.display_name}' is in specific_date mode but has no specific_date")
                 return None
 
-            logger.info(f"Specific date mode: using {self.specific_date}")
+            logger.debug(f"Specific date mode: using {self.specific_date}")
             return self.specific_date
 
         else:
@@ -501,6 +658,56 @@ class CustomTime(models.Model):
             return None
 
 
+class CustomTimeOccurrence(models.Model):
+    """
+    Resolved value of a custom time on one display date
+
+    Materialized for the same horizon as DailyZmanim (see
+    custom_time_occurrences.py) so the display reads finished times instead
+    of evaluating every rule. time is null when the custom time is not shown
+    on that date or cannot be resolved.
+    """
+    shul = models.ForeignKey('Shul', on_delete=models.CASCADE, related_name='custom_time_occurrences')
+    custom_time = models.ForeignKey('CustomTime', on_delete=models.CASCADE, related_name='occurrences')
+    date = models.DateField(db_index=True)
+    time = models.TimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['custom_time', 'date']
+        indexes = [
+            models.Index(fields=['shul', 'date']),
+        ]
+        verbose_name = 'Custom Time Occurrence'
+        verbose_name_plural = 'Custom Time Occurrences'
+
+    def __str__(self):
+        return f"{self.custom_time_id} on {self.date}: {self.time}"
+
+
+class MonthlyZmanimBlob(models.Model):
+    """
+    One month of a shul's serialized DailyZmanim rows, stored column-wise
+
+    Built on demand for whole-range reads and dropped whenever rows of the
+    month change - see monthly_blobs.py.
+    """
+    shul = models.ForeignKey('Shul', on_delete=models.CASCADE, related_name='monthly_zmanim_blobs')
+    month = models.DateField()  # First day of the month
+    data = models.JSONField(default=dict)
+
+    built_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['shul', 'month']
+        verbose_name = 'Monthly Zmanim Blob'
+        verbose_name_plural = 'Monthly Zmanim Blobs'
+
+    def __str__(self):
+        return f"{self.shul_id} - {self.month:%Y-%m}"
+
+
 class CustomText(models.Model):
     """Custom text fields and dividers specific to each shul"""
     TEXT_TYPE_CHOICES = [
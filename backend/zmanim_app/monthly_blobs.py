@@ -0,0 +1,135 @@
+"""
+Per-shul, per-month precomputed zmanim for whole-range reads
+
+get_zmanim_range (and any calendar-style view) returns every field of
+every day in a range. Instead of loading ~180 wide rows and running them
+through DailyZmanimSerializer on every request, each month is serialized
+once into a MonthlyZmanimBlob row:
+
+    {'fields': [serializer field names], 'columns': [[values of one field], ...]}
+
+so a 6-month range is one query for ~7 blobs plus zipping columns back
+into rows. shul_name is not stored (it is the same for every row and a
+rename must not stale the blobs); get_zmanim_rows() adds it.
+
+Blobs are built on first read. Anything that changes a shul's rows drops
+the blobs of the months it touched: the calculator's upserts and
+deletes, the cleanup task, the compact storage command, rows edited or
+deleted in DailyZmanimAdmin and calendar day edits (signals.py). With
+ZMANIM_MONTHLY_BLOBS = False the range endpoint reads the rows directly.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError
+from .models import DailyZmanim, MonthlyZmanimBlob
+from .partitions import month_start, next_month
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def monthly_blobs_enabled():
+    return getattr(settings, 'ZMANIM_MONTHLY_BLOBS', True)
+
+
+def months_between(start_date, end_date):
+    """First days of every month from start_date's to end_date's"""
+    months = []
+    month = month_start(start_date)
+    while month <= end_date:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def invalidate_month_blobs(shul_id, start_date, end_date):
+    """Drop a shul's blobs of the months from start_date to end_date"""
+    MonthlyZmanimBlob.objects.filter(
+        shul_id=shul_id,
+        month__range=[month_start(start_date), month_start(end_date)]
+    ).delete()
+
+
+def serialize_rows(shul, start_date, end_date):
+    """Serialized DailyZmanim rows of a range, without shul_name (the ORM path)"""
+    from .serializers import DailyZmanimSerializer
+
+    # shul joined once so shul_name does not cost a query per row
+    rows = DailyZmanim.objects.filter(
+        shul=shul, date__range=[start_date, end_date]
+    ).select_related('shul').order_by('date')
+    data = DailyZmanimSerializer(rows, many=True).data
+    for row in data:
+        row.pop('shul_name', None)
+    return data
+
+
+def build_month_blobs(shul, months):
+    """
+    Serialize and store the blobs of some months (one query for all of them)
+
+    Returns:
+        Dict of month -> blob data (months without rows are not stored)
+    """
+    if not months:
+        return {}
+
+    rows_by_month = defaultdict(list)
+    last_day = next_month(max(months)) - timedelta(days=1)
+    for row in serialize_rows(shul, min(months), last_day):
+        rows_by_month[row['date'][:8] + '01'].append(row)
+
+    built = {}
+    for month in months:
+        rows = rows_by_month.get(month.isoformat())
+        if not rows:
+            continue
+        fields = list(rows[0].keys())
+        built[month] = {
+            'fields': fields,
+            'columns': [[row[field] for row in rows] for field in fields],
+        }
+
+    try:
+        MonthlyZmanimBlob.objects.bulk_create(
+            [MonthlyZmanimBlob(shul=shul, month=month, data=data) for month, data in built.items()],
+            ignore_conflicts=True,
+        )
+    except IntegrityError as e:
+        # The shul was deleted meanwhile - the built data is still valid to return
+        logger.warning(f"Could not store monthly zmanim blobs for shul {shul.id}: {str(e)}")
+    return built
+
+
+def get_zmanim_rows(shul, start_date, end_date):
+    """
+    Serialized DailyZmanim rows (as returned by get_zmanim_range) for a
+    range, read from the monthly blobs and building any that are missing
+    """
+    if not monthly_blobs_enabled():
+        rows = serialize_rows(shul, start_date, end_date)
+    else:
+        months = months_between(start_date, end_date)
+        blobs = dict(
+            MonthlyZmanimBlob.objects.filter(shul=shul, month__in=months).values_list('month', 'data')
+        )
+        missing = [month for month in months if month not in blobs]
+        if missing:
+            blobs.update(build_month_blobs(shul, missing))
+
+        first, last = start_date.isoformat(), end_date.isoformat()
+        rows = []
+        for month in months:
+            data = blobs.get(month)
+            if not data:
+                continue
+            fields = data['fields']
+            date_column = data['columns'][fields.index('date')]
+            for index, values in enumerate(zip(*data['columns'])):
+                if first <= date_column[index] <= last:
+                    rows.append(dict(zip(fields, values)))
+
+    for row in rows:
+        row['shul_name'] = shul.name
+    return rows
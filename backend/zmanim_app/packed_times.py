@@ -0,0 +1,111 @@
+"""
+Compact storage of a DailyZmanim row's solar values
+
+With ZMANIM_COMPACT_TIMES enabled, the calculator stores the 29 solar
+values of a row (SOLAR_FIELDS order) as one small binary column instead
+of 26 time and 3 float columns, which are left NULL:
+
+    version byte, then one little-endian int32 per field
+        times        seconds since local midnight
+        hour fields  milliseconds (rounded)
+        missing      -1
+
+That is 117 bytes against ~230 for the columns, and NULL columns cost
+PostgreSQL one bitmap bit each. Compact rows also store no display
+strings (display_strings.py, ~1 KB of JSON a row): get_display_strings
+formats them from the unpacked times when read, which the cached display
+payload does once per shul per day. Displays never show more than seconds
+and round from the seconds value, so nothing shown changes; the times
+returned by get_zmanim_range lose their microseconds.
+
+DailyZmanim.from_db() unpacks the blob into the usual attributes, so
+row.alos etc. read the same either way. Queries that load solar fields
+with .only() must include 'packed_times' (see TIME_COLUMNS). Existing rows
+are converted by `manage.py zmanim_compact_times` (and back with --expand);
+the calculator also rewrites a row in the other format whenever it
+recalculates it.
+"""
+from datetime import time
+from django.conf import settings
+import struct
+from .solar_engine import SOLAR_FIELDS, SOLAR_HOUR_FIELDS
+
+PACK_VERSION = 1
+
+_STRUCT = struct.Struct(f'<B{len(SOLAR_FIELDS)}i')
+
+MISSING = -1
+
+# Columns to load wherever a row's solar values are read
+TIME_COLUMNS = SOLAR_FIELDS + ['packed_times']
+
+
+def compact_times_enabled():
+    return getattr(settings, 'ZMANIM_COMPACT_TIMES', False)
+
+
+def pack_times(values):
+    """Pack a field -> value mapping (or a DailyZmanim) into bytes"""
+    get = values.get if isinstance(values, dict) else lambda field: getattr(values, field)
+    packed = []
+    for field in SOLAR_FIELDS:
+        value = get(field)
+        if value is None:
+            packed.append(MISSING)
+        elif field in SOLAR_HOUR_FIELDS:
+            packed.append(round(value))
+        else:
+            packed.append((value.hour * 60 + value.minute) * 60 + value.second)
+    return _STRUCT.pack(PACK_VERSION, *packed)
+
+
+def unpack_times(data):
+    """field -> value dict of packed bytes"""
+    version, *packed = _STRUCT.unpack(bytes(data))
+    if version != PACK_VERSION:
+        raise ValueError(f"Unknown packed zmanim version {version}")
+
+    values = {}
+    for field, value in zip(SOLAR_FIELDS, packed):
+        if value == MISSING:
+            values[field] = None
+        elif field in SOLAR_HOUR_FIELDS:
+            values[field] = float(value)
+        else:
+            minutes, second = divmod(value, 60)
+            hour, minute = divmod(minutes, 60)
+            values[field] = time(hour, minute, second)
+    return values
+
+
+def compact_row(daily_zmanim):
+    """Move a row's solar values into packed_times (columns and display strings emptied)"""
+    daily_zmanim.packed_times = pack_times(daily_zmanim)
+    for field in SOLAR_FIELDS:
+        setattr(daily_zmanim, field, None)
+    daily_zmanim.display_strings = {}
+    daily_zmanim.display_strings_format = ''
+    return daily_zmanim
+
+
+def expand_row(daily_zmanim):
+    """Move a row's packed values back into its columns (display strings are not re-made)"""
+    if daily_zmanim.packed_times is not None:
+        for field, value in unpack_times(daily_zmanim.packed_times).items():
+            setattr(daily_zmanim, field, value)
+        daily_zmanim.packed_times = None
+    return daily_zmanim
+
+
+def load_packed(daily_zmanim):
+    """
+    Fill a freshly loaded row's solar attributes from packed_times
+
+    Columns that hold a value (e.g. edited in the admin) take precedence.
+    """
+    # PostgreSQL returns a memoryview
+    packed = daily_zmanim.__dict__['packed_times'] = bytes(daily_zmanim.__dict__['packed_times'])
+    values = unpack_times(packed)
+    for field, value in values.items():
+        if daily_zmanim.__dict__.get(field) is None:
+            daily_zmanim.__dict__[field] = value
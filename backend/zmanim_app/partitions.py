@@ -0,0 +1,263 @@
+"""
+Optional monthly partitioning of the DailyZmanim table (PostgreSQL only)
+
+With ZMANIM_PARTITIONED_STORAGE enabled, zmanim_app_dailyzmanim is a
+declaratively partitioned table, range-partitioned on date:
+
+    zmanim_app_dailyzmanim_p202610   dates in October 2026
+    zmanim_app_dailyzmanim_p202611   ...
+    zmanim_app_dailyzmanim_default   anything no monthly partition covers
+
+Lookups by (shul, date) only touch one small partition, and a month that
+is entirely in the past is expired by dropping its partition instead of
+deleting (and later vacuuming) its rows one by one.
+
+The Django model is unchanged. The table's primary key becomes (id, date)
+because PostgreSQL requires the partition key in every unique constraint;
+ids still come from a single sequence, so they stay unique.
+
+Conversion happens in migration 0040 when the setting is on, or later with
+`manage.py zmanim_partitions --convert`. The maintain_zmanim_partitions
+task keeps ZMANIM_PARTITION_MONTHS_AHEAD months of partitions ahead and
+drops expired ones.
+"""
+from datetime import date, timedelta
+from django.conf import settings
+from django.db import connection as default_connection
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'zmanim_app_dailyzmanim'
+DEFAULT_PARTITION = f'{TABLE}_default'
+SEQUENCE = f'{TABLE}_id_seq'
+
+PARTITION_NAME_RE = re.compile(rf'^{TABLE}_p(\d{{4}})(\d{{2}})$')
+
+
+def partitioning_enabled():
+    return getattr(settings, 'ZMANIM_PARTITIONED_STORAGE', False)
+
+
+def months_ahead():
+    return getattr(settings, 'ZMANIM_PARTITION_MONTHS_AHEAD', 8)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def is_partitioned(connection=None):
+    """Whether the DailyZmanim table is currently partitioned"""
+    connection = connection or default_connection
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+            [TABLE]
+        )
+        return cursor.fetchone()[0]
+
+
+def list_partitions(connection=None):
+    """Monthly partitions as {month_start: partition name} (the default partition is excluded)"""
+    connection = connection or default_connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def _bounds(month):
+    return f"FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+
+
+def create_partition(month, connection=None):
+    """
+    Create the partition for one month (no-op if it exists)
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition - attaching would fail otherwise.
+
+    Returns:
+        True if the partition was created
+    """
+    connection = connection or default_connection
+    month = month_start(month)
+    name = partition_name(month)
+    date_range = [month, next_month(month)]
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return False
+
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s)",
+            date_range
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES {_bounds(month)}")
+        else:
+            cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            cursor.execute(
+                f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s",
+                date_range
+            )
+            cursor.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s", date_range)
+            cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES {_bounds(month)}")
+
+    logger.info(f"Created zmanim partition {name}")
+    return True
+
+
+def ensure_partitions(start_month=None, ahead=None, connection=None):
+    """
+    Create monthly partitions from start_month (default: last month) through
+    `ahead` months after the current one
+
+    Returns:
+        Names of the partitions created
+    """
+    if start_month is None:
+        # Shuls west of UTC can still be on the last day of last month
+        start_month = month_start(date.today() - timedelta(days=1))
+    if ahead is None:
+        ahead = months_ahead()
+
+    end_month = month_start(date.today())
+    for _ in range(ahead):
+        end_month = next_month(end_month)
+
+    created = []
+    month = month_start(start_month)
+    while month <= end_month:
+        if create_partition(month, connection):
+            created.append(partition_name(month))
+        month = next_month(month)
+    return created
+
+
+def drop_partitions_before(cutoff_date, connection=None):
+    """
+    Drop every monthly partition whose dates are all before cutoff_date
+
+    Returns:
+        Names of the partitions dropped
+    """
+    connection = connection or default_connection
+    dropped = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(list_partitions(connection).items()):
+            if next_month(month) > cutoff_date:
+                continue
+            cursor.execute(f"DROP TABLE {name}")
+            dropped.append(name)
+        # Normally empty, but don't let stray old rows pile up there either
+        cursor.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE date < %s", [cutoff_date])
+
+    if dropped:
+        logger.info(f"Dropped zmanim partitions: {', '.join(dropped)}")
+    return dropped
+
+
+def drop_expired_partitions(connection=None):
+    """Drop the partitions of months that are over in every timezone"""
+    # No timezone is more than a day behind UTC
+    return drop_partitions_before(date.today() - timedelta(days=1), connection)
+
+
+def convert_to_partitioned(connection=None):
+    """
+    Rebuild the DailyZmanim table as a partitioned table, keeping its rows,
+    constraints and indexes (run inside a transaction)
+
+    Returns:
+        False if there was nothing to do (not PostgreSQL or already partitioned)
+    """
+    connection = connection or default_connection
+    if connection.vendor != 'postgresql' or is_partitioned(connection):
+        return False
+
+    unpartitioned = f'{TABLE}_unpartitioned'
+    new_sequence = f'{TABLE}_partitioned_id_seq'
+
+    with connection.cursor() as cursor:
+        # Definitions to re-create once the old table (and its names) are gone.
+        # NOT NULL is carried over by LIKE.
+        cursor.execute(
+            """
+            SELECT conname, contype, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f', 'c')
+            ORDER BY contype DESC
+            """,
+            [TABLE]
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = %s::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            """,
+            [TABLE]
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT min(date), max(id) FROM {TABLE}")
+        first_date, max_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {unpartitioned}")
+        cursor.execute(f"CREATE TABLE {TABLE} (LIKE {unpartitioned}) PARTITION BY RANGE (date)")
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+        # The old id sequence belongs to the old table; continue numbering in a new one
+        cursor.execute(f"CREATE SEQUENCE {new_sequence}")
+        if max_id is not None:
+            cursor.execute("SELECT setval(%s, %s)", [new_sequence, max_id])
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{new_sequence}')")
+        cursor.execute(f"ALTER SEQUENCE {new_sequence} OWNED BY {TABLE}.id")
+
+    ensure_partitions(start_month=min(first_date or date.today(), date.today() - timedelta(days=1)),
+                      connection=connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {unpartitioned}")
+        cursor.execute(f"DROP TABLE {unpartitioned}")
+        cursor.execute(f"ALTER SEQUENCE {new_sequence} RENAME TO {SEQUENCE}")
+
+        for name, kind, definition in constraints:
+            if kind == 'p':
+                # The partition key has to be part of the primary key
+                definition = 'PRIMARY KEY (id, date)'
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+        for definition in indexes:
+            cursor.execute(definition)
+
+    logger.info(f"Converted {TABLE} to monthly partitions")
+    return True
@@ -302,18 +302,11 @@ class RegistrationSerializer(serializers.Serializer):
             show_seconds=validated_data.get('show_seconds', False)
         )
         
-        # Auto-calculate 6 months of zmanim for new shul
+        # Auto-calculate zmanim for new shul: the first days now, the rest
+        # of the 6 months in the background
         if latitude and longitude and latitude != 0.0 and longitude != 0.0:
             from .zmanim_calculator import ZmanimCalculator
-            from datetime import timedelta
-            import pytz
-            import datetime
-
-            # Get today's date in the shul's timezone, not server timezone
-            tz = pytz.timezone(timezone)
-            start_date = datetime.datetime.now(tz).date()
-            end_date = start_date + timedelta(days=180)
-            ZmanimCalculator.calculate_date_range(shul, start_date, end_date)
+            ZmanimCalculator.onboard_shul(shul)
 
         return {'user': user, 'shul': shul}
 
@@ -322,9 +315,41 @@ class DailyZmanimSerializer(serializers.ModelSerializer):
     """Serializer for DailyZmanim model"""
     shul_name = serializers.CharField(source='shul.name', read_only=True)
 
+    # Hebrew calendar & limudim (stored once per date on JewishCalendarDay,
+    # flattened here so each row keeps its original shape)
+    jewish_year = serializers.IntegerField(read_only=True)
+    jewish_month = serializers.IntegerField(read_only=True)
+    jewish_month_name = serializers.CharField(read_only=True)
+    jewish_day = serializers.IntegerField(read_only=True)
+    day_of_week = serializers.IntegerField(read_only=True)
+    significant_day = serializers.CharField(read_only=True)
+    day_of_omer = serializers.IntegerField(read_only=True)
+    day_of_chanukah = serializers.IntegerField(read_only=True)
+    is_rosh_chodesh = serializers.BooleanField(read_only=True)
+    is_yom_tov = serializers.BooleanField(read_only=True)
+    is_chol_hamoed = serializers.BooleanField(read_only=True)
+    is_erev_yom_tov = serializers.BooleanField(read_only=True)
+    is_chanukah = serializers.BooleanField(read_only=True)
+    is_taanis = serializers.BooleanField(read_only=True)
+    is_assur_bemelacha = serializers.BooleanField(read_only=True)
+    is_erev_rosh_chodesh = serializers.BooleanField(read_only=True)
+    molad_datetime = serializers.DateTimeField(read_only=True)
+    kiddush_levana_earliest_3_days = serializers.DateTimeField(read_only=True)
+    kiddush_levana_earliest_7_days = serializers.DateTimeField(read_only=True)
+    kiddush_levana_latest_15_days = serializers.DateTimeField(read_only=True)
+    parsha = serializers.CharField(read_only=True)
+    daf_yomi_bavli = serializers.CharField(read_only=True)
+    mishna_yomis = serializers.CharField(read_only=True)
+    tehillim_monthly = serializers.CharField(read_only=True)
+    daf_yomi_yerushalmi = serializers.CharField(read_only=True)
+    pirkei_avos = serializers.CharField(read_only=True)
+    daf_hashavua_bavli = serializers.CharField(read_only=True)
+    amud_yomi_bavli_dirshu = serializers.CharField(read_only=True)
+
     class Meta:
         model = DailyZmanim
-        fields = '__all__'
+        # Storage details - the values are in the regular fields
+        exclude = ('calendar_day', 'display_strings', 'display_strings_format', 'packed_times')
         read_only_fields = ('created_at', 'updated_at')
 
 
@@ -518,23 +543,16 @@ class CompleteRegistrationSerializer(serializers.Serializer):
         # Auto-calculate 6 months of zmanim for new shul if coordinates exist
         if latitude and longitude and latitude != 0.0 and longitude != 0.0:
             from .zmanim_calculator import ZmanimCalculator
-            from datetime import timedelta
             import logging
-            import pytz
-            import datetime
 
             logger = logging.getLogger(__name__)
             logger.info(f"Starting automatic 6-month zmanim calculation for new shul: {shul.name} (ID: {shul.id})")
             logger.info(f"Location: Lat {latitude}, Lon {longitude}, Timezone: {timezone}")
 
-            # Get today's date in the shul's timezone, not server timezone
-            tz = pytz.timezone(timezone)
-            start_date = datetime.datetime.now(tz).date()
-            end_date = start_date + timedelta(days=180)
-
+            # The first days now, the rest of the 6 months in the background
             try:
-                count = ZmanimCalculator.calculate_date_range(shul, start_date, end_date)
-                logger.info(f"Successfully calculated {count} days of zmanim for {shul.name}")
+                count = ZmanimCalculator.onboard_shul(shul)
+                logger.info(f"Calculated the first {count} days of zmanim for {shul.name}, queued the rest")
             except Exception as e:
                 logger.error(f"Failed to calculate zmanim for {shul.name}: {e}")
         else:
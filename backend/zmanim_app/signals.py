@@ -0,0 +1,107 @@
+"""
+Keep derived data in step with the models it is derived from
+
+Cached display payloads are invalidated when the data behind them changes,
+custom time occurrences are re-materialized when a rule is edited, and the
+stored display strings are re-formatted when a shul's time format changes.
+
+DailyZmanim is deliberately not hooked here: it is written in bulk by
+ZmanimCalculator (which invalidates explicitly), DailyZmanimAdmin handles
+edited rows, and a delete signal would stop Django from fast-deleting the
+cleanup task's and recalculations' rows.
+"""
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Shul, CustomTime, CustomText, ShulDisplayLayout, GlobalMemorialBoxes, JewishCalendarDay
+from .display_cache import invalidate_shul_display, invalidate_all_displays
+from .custom_time_occurrences import refresh_custom_time
+from .monthly_blobs import invalidate_month_blobs
+
+# Saves that never change what a display shows
+IGNORED_SHUL_UPDATE_FIELDS = {'last_display_access'}
+
+
+def _is_ignored_shul_save(update_fields):
+    return update_fields is not None and set(update_fields) <= IGNORED_SHUL_UPDATE_FIELDS
+
+
+@receiver(pre_save, sender=Shul)
+def invalidate_renamed_shul_display(sender, instance, update_fields=None, **kwargs):
+    """
+    A slug change must also drop the payload cached under the old slug
+
+    Also notes whether the time format changed, for refresh_shul_display_strings.
+    """
+    instance._time_format_changed = False
+    if instance.pk is None or _is_ignored_shul_save(update_fields):
+        return
+    old = Shul.objects.filter(pk=instance.pk).values_list('slug', 'time_format', 'show_seconds').first()
+    if old is None:
+        return
+    old_slug, old_time_format, old_show_seconds = old
+    if old_slug and old_slug != instance.slug:
+        invalidate_shul_display(old_slug)
+    instance._time_format_changed = (old_time_format, old_show_seconds) != (instance.time_format, instance.show_seconds)
+
+
+@receiver(post_save, sender=Shul)
+@receiver(post_delete, sender=Shul)
+def invalidate_shul(sender, instance, update_fields=None, **kwargs):
+    if _is_ignored_shul_save(update_fields):
+        return
+    invalidate_shul_display(instance.slug)
+
+
+@receiver(post_save, sender=Shul)
+def refresh_shul_display_strings(sender, instance, raw=False, **kwargs):
+    """Stored display strings are per format - re-format them in the background"""
+    if raw or not getattr(instance, '_time_format_changed', False):
+        return
+    from .tasks import refresh_display_strings
+    shul_id = instance.id
+    transaction.on_commit(lambda: refresh_display_strings.delay(shul_id))
+
+
+@receiver(post_save, sender=CustomTime)
+@receiver(post_delete, sender=CustomTime)
+@receiver(post_save, sender=CustomText)
+@receiver(post_delete, sender=CustomText)
+@receiver(post_save, sender=ShulDisplayLayout)
+@receiver(post_delete, sender=ShulDisplayLayout)
+def invalidate_shul_content(sender, instance, **kwargs):
+    if instance.shul_id is None:
+        return
+    slug = Shul.objects.filter(pk=instance.shul_id).values_list('slug', flat=True).first()
+    invalidate_shul_display(slug)
+
+
+@receiver(post_save, sender=JewishCalendarDay)
+def invalidate_calendar_day_shuls(sender, instance, raw=False, **kwargs):
+    """
+    A calendar day is shared - invalidate every shul with a row on it
+
+    Deletes need no receiver: DailyZmanim.calendar_day is PROTECT, so only
+    days without rows can be deleted (and the cleanup task fast-deletes them).
+    """
+    if raw:
+        return
+    shuls = Shul.objects.filter(daily_zmanim__calendar_day=instance).order_by().values_list('id', 'slug').distinct()
+    day = instance.date
+    for shul_id, slug in shuls:
+        invalidate_shul_display(slug)
+        transaction.on_commit(lambda shul_id=shul_id: invalidate_month_blobs(shul_id, day, day))
+
+
+@receiver(post_save, sender=CustomTime)
+def refresh_custom_time_occurrences(sender, instance, raw=False, **kwargs):
+    """Re-materialize an edited custom time (deletes cascade to its occurrences)"""
+    if raw:
+        return
+    refresh_custom_time(instance)
+
+
+@receiver(post_save, sender=GlobalMemorialBoxes)
+@receiver(post_delete, sender=GlobalMemorialBoxes)
+def invalidate_global_memorial_boxes(sender, instance, **kwargs):
+    invalidate_all_displays()
@@ -0,0 +1,134 @@
+"""
+Shared solar calculations for shuls at (almost) the same location
+
+Shuls in one neighbourhood have near-identical coordinates and the same
+timezone, so their solar zmanim differ by a second or two. With
+ZMANIM_BUCKET_PRECISION set (a grid step in degrees, e.g. 0.01 ~ 1 km),
+locations are snapped to the centre of their grid cell and every cell is
+calculated once per date range for all shuls in it.
+
+The error is checked, not guaranteed: each shul's exact times are
+calculated on sample dates (every SAMPLE_INTERVAL_DAYS) and compared with
+its cell's. A shul whose difference on those dates exceeds
+ZMANIM_BUCKET_MAX_ERROR_SECONDS - or where only one of the two has a
+sunrise/sunset at all (polar days) - gets its own exact calculation
+instead. Between sample dates the difference changes slowly with the
+season, but is not measured.
+
+Savings are counted in solar days (one location, one date), including
+the exact sample days the check costs.
+
+Shul has no elevation field (every calculation is at sea level), so the
+cell is (latitude, longitude, timezone).
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+import math
+from .solar_engine import compare_solar_days
+from .solar_memo import get_solar_range
+
+# Exact times are checked this often across the range (plus its last day)
+SAMPLE_INTERVAL_DAYS = 30
+
+
+def bucket_precision():
+    """Grid step in degrees, or 0 when bucketing is off"""
+    return getattr(settings, 'ZMANIM_BUCKET_PRECISION', 0)
+
+
+def bucket_max_error():
+    return getattr(settings, 'ZMANIM_BUCKET_MAX_ERROR_SECONDS', 30)
+
+
+def location_bucket(latitude, longitude, timezone, precision=None):
+    """The (latitude, longitude, timezone) of the grid cell centre a location falls in"""
+    precision = precision or bucket_precision()
+    if not precision:
+        return float(latitude), float(longitude), timezone
+
+    def centre(degrees):
+        return round((math.floor(float(degrees) / precision) + 0.5) * precision, 6)
+
+    return centre(latitude), centre(longitude), timezone
+
+
+def calculate_shared_solar_ranges(locations, start_date, end_date, precision=None, max_error_seconds=None):
+    """
+    Solar zmanim for several locations, calculated once per grid cell
+
+    Args:
+        locations: Dict of key -> (latitude, longitude, timezone)
+        start_date, end_date: datetime.date (inclusive)
+
+    Returns:
+        (solar_by_key, stats) - calculate_solar_range() results by key, and
+        a dict with 'locations', 'fallbacks', 'max_error_seconds' (max
+        error on the sampled dates of a shared result) and, in solar days,
+        'calculations' (all of them), 'sample_calculations' (the part spent
+        on the sampled check) and 'saved' (against one range per location)
+    """
+    precision = precision or bucket_precision()
+    if max_error_seconds is None:
+        max_error_seconds = bucket_max_error()
+
+    buckets = defaultdict(list)
+    for key, (latitude, longitude, timezone) in locations.items():
+        buckets[location_bucket(latitude, longitude, timezone, precision)].append(key)
+
+    range_days = (end_date - start_date).days + 1
+    stats = {
+        'locations': len(locations), 'calculations': 0, 'sample_calculations': 0,
+        'fallbacks': 0, 'max_error_seconds': 0.0,
+    }
+    solar_by_key = {}
+
+    for bucket, keys in buckets.items():
+        if len(keys) == 1:
+            # Nothing to share - calculate the exact location
+            solar_by_key[keys[0]] = get_solar_range(*locations[keys[0]], start_date, end_date)
+            stats['calculations'] += range_days
+            continue
+
+        shared = get_solar_range(*bucket, start_date, end_date)
+        stats['calculations'] += range_days
+
+        for key in keys:
+            error, samples = _sampled_error(locations[key], shared, start_date, end_date)
+            stats['calculations'] += samples
+            stats['sample_calculations'] += samples
+            if error is None or error > max_error_seconds:
+                solar_by_key[key] = get_solar_range(*locations[key], start_date, end_date)
+                stats['calculations'] += range_days
+                stats['fallbacks'] += 1
+            else:
+                solar_by_key[key] = shared
+                stats['max_error_seconds'] = max(stats['max_error_seconds'], error)
+
+    stats['saved'] = stats['locations'] * range_days - stats['calculations']
+    return solar_by_key, stats
+
+
+def _sampled_error(location, shared, start_date, end_date):
+    """
+    Largest difference in seconds between a location's exact times and the
+    shared ones on the sample dates
+
+    Returns:
+        (max error or None if not comparable, number of sample days calculated)
+    """
+    sample_dates = []
+    current_date = start_date
+    while current_date < end_date:
+        sample_dates.append(current_date)
+        current_date += timedelta(days=SAMPLE_INTERVAL_DAYS)
+    sample_dates.append(end_date)
+
+    max_error = 0.0
+    for samples, sample_date in enumerate(sample_dates, 1):
+        exact = get_solar_range(*location, sample_date, sample_date)
+        max_difference, mismatches = compare_solar_days(exact, {sample_date: shared.get(sample_date, {})})
+        if any(expected is None or actual is None for _, _, expected, actual in mismatches):
+            return None, samples
+        max_error = max(max_error, max_difference)
+    return max_error, len(sample_dates)
@@ -0,0 +1,440 @@
+"""
+Solar zmanim for whole date ranges
+
+Two interchangeable backends produce the same per-day dict of solar zmanim:
+
+- 'library': the zmanim package, one ZmanimCalendar per day (the reference)
+- 'numpy':   the same NOAA algorithm evaluated for every day and every
+             depression angle at once as NumPy arrays
+
+The NumPy backend mirrors the library step for step (NOAA two-pass sunrise /
+sunset, sea-level zenith adjustment, UTC wraparound and antimeridian
+handling, microsecond truncation), so its output matches the library to the
+second. Use validate_backends() / `manage.py validate_solar_engine` to check.
+"""
+from datetime import date, datetime, time, timedelta
+from django.conf import settings
+from dateutil import tz
+from zmanim.util.geo_location import GeoLocation
+from zmanim.zmanim_calendar import ZmanimCalendar
+from .get_daily_zmanim import get_daily_zmanim
+from .zmanim_fields import SOLAR_ZMANIM_FIELDS, TIME, HOURS
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is in requirements.txt
+    np = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_LIBRARY = 'library'
+BACKEND_NUMPY = 'numpy'
+
+# DailyZmanim time fields produced by the solar calculation (see zmanim_fields)
+SOLAR_TIME_FIELDS = [field.name for field in SOLAR_ZMANIM_FIELDS if field.kind == TIME]
+
+# DailyZmanim float fields (milliseconds per halachic hour)
+SOLAR_HOUR_FIELDS = [field.name for field in SOLAR_ZMANIM_FIELDS if field.kind == HOURS]
+
+SOLAR_FIELDS = SOLAR_TIME_FIELDS + SOLAR_HOUR_FIELDS
+
+# Depression angles below the horizon, in degrees
+ALOS_DEGREES = {'alos_16_1': 16.1, 'alos_18': 18, 'alos_19_8': 19.8}
+TZAIS_DEGREES = {'tzais_8_5': 8.5, 'tzais_7_083': 7.083, 'tzais_5_95': 5.95, 'tzais_6_45': 6.45}
+
+CANDLE_LIGHTING_MINUTES = 18
+
+# NOAA / zmanim library constants
+GEOMETRIC_ZENITH = 90.0
+REFRACTION = 34 / 60.0
+SOLAR_RADIUS = 16 / 60.0
+JULIAN_DAY_JAN_1_2000 = 2451545.0
+JULIAN_DAYS_PER_CENTURY = 36525.0
+# Julian day at midnight of date.fromordinal(1) is 1721425.5 - 1
+JULIAN_DAY_ORDINAL_OFFSET = 1721424.5
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+MICROS_PER_SECOND = 1_000_000
+MICROS_PER_MINUTE = 60 * MICROS_PER_SECOND
+MICROS_PER_HOUR = 60 * MICROS_PER_MINUTE
+MICROS_PER_DAY = 24 * MICROS_PER_HOUR
+HOUR_MILLIS = 60 * 60 * 1000
+MINUTE_MILLIS = 60 * 1000
+
+
+def get_backend():
+    """Configured backend name, falling back to the library without NumPy"""
+    backend = getattr(settings, 'ZMANIM_CALCULATION_BACKEND', BACKEND_NUMPY)
+    if backend == BACKEND_NUMPY and np is None:
+        logger.warning("ZMANIM_CALCULATION_BACKEND is 'numpy' but NumPy is not installed - using the zmanim library")
+        return BACKEND_LIBRARY
+    return backend
+
+
+def calculate_solar_range(latitude, longitude, timezone, start_date, end_date, name="Your Shul Name", backend=None):
+    """
+    Calculate the solar zmanim for every date in a range
+
+    Args:
+        latitude, longitude: Location in degrees
+        timezone: IANA timezone name
+        start_date, end_date: datetime.date (inclusive)
+        backend: 'numpy' or 'library' (default: settings.ZMANIM_CALCULATION_BACKEND)
+
+    Returns:
+        Dict mapping date -> {field: datetime.time / float / None} for SOLAR_FIELDS.
+        Dates that fail to calculate are left out.
+    """
+    backend = backend or get_backend()
+    if backend == BACKEND_NUMPY:
+        return _numpy_solar_range(latitude, longitude, timezone, start_date, end_date, name)
+    if backend == BACKEND_LIBRARY:
+        return _library_solar_range(latitude, longitude, timezone, start_date, end_date, name)
+    raise ValueError(f"Unknown zmanim calculation backend: {backend}")
+
+
+# ============================================================================
+# Library backend (reference implementation)
+# ============================================================================
+
+def _library_solar_day(latitude, longitude, timezone, target_date, name):
+    zmanim = get_daily_zmanim(latitude, longitude, timezone, target_date=target_date, name=name)
+
+    location = GeoLocation(name, latitude, longitude, timezone)
+    zc = ZmanimCalendar(geo_location=location, date=target_date)
+
+    def to_time(dt):
+        return dt.time() if dt else None
+
+    values = {field: to_time(zmanim.get(field)) for field in zmanim}
+    values.update({
+        'sea_level_sunrise': to_time(zc.sea_level_sunrise()),
+        'sea_level_sunset': to_time(zc.sea_level_sunset()),
+        'elevation_adjusted_sunrise': to_time(zc.elevation_adjusted_sunrise()),
+        'elevation_adjusted_sunset': to_time(zc.elevation_adjusted_sunset()),
+        'sun_transit': to_time(zc.sun_transit()),
+        'shaah_zmanis_gra': zc.shaah_zmanis_gra(),
+        'shaah_zmanis_mga': zc.shaah_zmanis_mga(),
+        'temporal_hour': zc.temporal_hour(),
+    })
+    for field, degrees in ALOS_DEGREES.items():
+        values[field] = to_time(zc.alos({'degrees': degrees}))
+    for field, degrees in TZAIS_DEGREES.items():
+        values[field] = to_time(zc.tzais({'degrees': degrees}))
+    return values
+
+
+def _library_solar_range(latitude, longitude, timezone, start_date, end_date, name):
+    results = {}
+    current_date = start_date
+    while current_date <= end_date:
+        try:
+            results[current_date] = _library_solar_day(latitude, longitude, timezone, current_date, name)
+        except Exception as e:
+            logger.error(f"Error calculating zmanim for {current_date}: {str(e)}")
+        current_date += timedelta(days=1)
+    return results
+
+
+# ============================================================================
+# NumPy backend
+# ============================================================================
+
+def _numpy_solar_range(latitude, longitude, timezone, start_date, end_date, name):
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        return {}
+
+    location = GeoLocation(name, latitude, longitude, timezone)
+    ordinals = start_date.toordinal() + np.arange(days, dtype=np.int64)
+    # The library shifts the calculation date by a day near the antimeridian
+    adjusted_ordinals = ordinals + location.antimeridian_adjustment()
+    julian_days = adjusted_ordinals.astype(np.float64) + JULIAN_DAY_ORDINAL_OFFSET
+    # Longitude in hours, as used by the library's UTC wraparound check
+    local_offset_hours = (location.local_mean_time_offset() + location.standard_time_offset()) / HOUR_MILLIS
+
+    # Sunrise / sunset for the horizon and every depression angle in one pass
+    rise_zeniths = [GEOMETRIC_ZENITH] + [GEOMETRIC_ZENITH + 16.1] + [GEOMETRIC_ZENITH + d for d in ALOS_DEGREES.values()]
+    set_zeniths = [GEOMETRIC_ZENITH] + [GEOMETRIC_ZENITH + 8.5] + [GEOMETRIC_ZENITH + d for d in TZAIS_DEGREES.values()]
+    rises = _utc_event_micros(julian_days, latitude, longitude, rise_zeniths, 'sunrise', local_offset_hours)
+    sets = _utc_event_micros(julian_days, latitude, longitude, set_zeniths, 'sunset', local_offset_hours)
+
+    sunrise, sunset = rises[0], sets[0]
+    alos_72 = sunrise - 72 * MICROS_PER_MINUTE
+    tzais_72 = sunset + 72 * MICROS_PER_MINUTE
+
+    temporal_hour = _temporal_hour(sunrise, sunset)
+    temporal_hour_mga = _temporal_hour(alos_72, tzais_72)
+
+    micros = {
+        'alos': rises[1],
+        'hanetz': sunrise,
+        'chatzos': sunrise + np.round(temporal_hour / HOUR_MILLIS * 6.0 / 24.0 * MICROS_PER_DAY),
+        'mincha_gedola': _shaos_into_day(sunrise, temporal_hour, 6.5),
+        'mincha_ketana': _shaos_into_day(sunrise, temporal_hour, 9.5),
+        'plag_hamincha': _shaos_into_day(sunrise, temporal_hour, 10.75),
+        'shkia': sunset,
+        'tzais': sets[1],
+        'tzais_72': tzais_72,
+        'sof_zman_krias_shema_gra': _shaos_into_day(sunrise, temporal_hour, 3),
+        'sof_zman_krias_shema_mga': _shaos_into_day(alos_72, temporal_hour_mga, 3),
+        'sof_zman_tfila_gra': _shaos_into_day(sunrise, temporal_hour, 4),
+        'sof_zman_tfila_mga': _shaos_into_day(alos_72, temporal_hour_mga, 4),
+        'candle_lighting': sunset - CANDLE_LIGHTING_MINUTES * MICROS_PER_MINUTE,
+        'sea_level_sunrise': sunrise,
+        'sea_level_sunset': sunset,
+        'elevation_adjusted_sunrise': sunrise,
+        'elevation_adjusted_sunset': sunset,
+    }
+    micros['sun_transit'] = micros['chatzos']
+    for index, field in enumerate(ALOS_DEGREES, 2):
+        micros[field] = rises[index]
+    for index, field in enumerate(TZAIS_DEGREES, 2):
+        micros[field] = sets[index]
+
+    # UTC micros are relative to midnight UTC of the adjusted date - convert
+    # to local time of day in one go for every field
+    midnight_epoch_micros = (adjusted_ordinals - UNIX_EPOCH_ORDINAL).astype(np.float64) * MICROS_PER_DAY
+    fields = list(micros)
+    epoch_micros = np.stack([micros[field] for field in fields]) + midnight_epoch_micros
+    local_micros = _local_micros_of_day(epoch_micros, location.time_zone)
+
+    hours = {
+        'shaah_zmanis_gra': temporal_hour,
+        'shaah_zmanis_mga': temporal_hour_mga,
+        'temporal_hour': temporal_hour,
+    }
+
+    results = {}
+    for day_index in range(days):
+        values = {}
+        for field_index, field in enumerate(fields):
+            value = local_micros[field_index, day_index]
+            values[field] = None if np.isnan(value) else _micros_to_time(int(value))
+        for field, array in hours.items():
+            value = array[day_index]
+            values[field] = None if np.isnan(value) else float(value)
+        results[date.fromordinal(int(ordinals[day_index]))] = values
+    return results
+
+
+def _temporal_hour(day_start, day_end):
+    """Milliseconds per halachic hour (NaN where either end is missing)"""
+    return (day_end - day_start) / MICROS_PER_SECOND / 3600.0 / 12 * HOUR_MILLIS
+
+
+def _shaos_into_day(day_start, temporal_hour, shaos):
+    return day_start + np.round(temporal_hour / MINUTE_MILLIS * shaos * MICROS_PER_MINUTE)
+
+
+def _micros_to_time(micros):
+    seconds, microsecond = divmod(micros, MICROS_PER_SECOND)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond)
+
+
+def _local_micros_of_day(epoch_micros, time_zone):
+    """
+    Convert UTC epoch microseconds to local microseconds since midnight
+
+    UTC offsets are looked up once per UTC day; only instants on a day where
+    the offset changes (DST transitions) are resolved individually.
+    """
+    valid = ~np.isnan(epoch_micros)
+    utc_days = np.full(epoch_micros.shape, 0, dtype=np.int64)
+    utc_days[valid] = np.floor_divide(epoch_micros[valid], MICROS_PER_DAY).astype(np.int64)
+    if not valid.any():
+        return epoch_micros
+
+    first_day = int(utc_days[valid].min())
+    last_day = int(utc_days[valid].max()) + 1
+    day_offsets = np.array([
+        _utc_offset_micros(day * MICROS_PER_DAY, time_zone)
+        for day in range(first_day, last_day + 1)
+    ], dtype=np.float64)
+
+    index = utc_days - first_day
+    index[~valid] = 0
+    offsets = day_offsets[index]
+    transition = valid & (day_offsets[index] != day_offsets[np.minimum(index + 1, len(day_offsets) - 1)])
+    for position in zip(*np.nonzero(transition)):
+        offsets[position] = _utc_offset_micros(epoch_micros[position], time_zone)
+
+    return np.mod(epoch_micros + offsets, MICROS_PER_DAY)
+
+
+def _utc_offset_micros(epoch_micros, time_zone):
+    utc_time = datetime(1970, 1, 1, tzinfo=tz.tzutc()) + timedelta(microseconds=int(epoch_micros))
+    return utc_time.astimezone(time_zone).utcoffset().total_seconds() * MICROS_PER_SECOND
+
+
+def _utc_event_micros(julian_days, latitude, longitude, zeniths, mode, local_offset_hours):
+    """
+    NOAA sunrise / sunset for every (zenith, day) pair
+
+    Returns a (len(zeniths), days) array of microseconds since midnight UTC of
+    each day, NaN where the sun never reaches the zenith (polar day / night).
+    """
+    zeniths = np.array([
+        zenith + SOLAR_RADIUS + REFRACTION if zenith == GEOMETRIC_ZENITH else zenith
+        for zenith in zeniths
+    ], dtype=np.float64)[:, np.newaxis]
+    julian_days = julian_days[np.newaxis, :]
+    # NOAA uses west-positive longitude
+    longitude = -longitude
+
+    with np.errstate(invalid='ignore'):
+        julian_centuries = _julian_centuries(julian_days)
+        noon_minutes = _solar_noon_utc(julian_centuries, longitude)
+        first_pass = _approximate_utc_sun_position(
+            _julian_centuries(julian_days + noon_minutes / 1440.0), latitude, longitude, zeniths, mode
+        )
+        minutes = _approximate_utc_sun_position(
+            _julian_centuries(julian_days + first_pass / 1440.0), latitude, longitude, zeniths, mode
+        )
+
+    # Same float steps as AstronomicalCalendar._date_time_from_time_of_day
+    time_of_day = np.mod(minutes / 60.0, 24)
+    hours, remainder = np.divmod(time_of_day * 3600, 3600)
+    minutes, remainder = np.divmod(remainder, 60)
+    seconds, micros = np.divmod(remainder * 10**6, 10**6)
+    utc_micros = hours * MICROS_PER_HOUR + minutes * MICROS_PER_MINUTE + seconds * MICROS_PER_SECOND + np.trunc(micros)
+
+    # Wraparound: the UTC event belongs to the previous / next UTC date
+    if mode == 'sunrise':
+        utc_micros = np.where(hours + local_offset_hours > 18, utc_micros - MICROS_PER_DAY, utc_micros)
+    else:
+        utc_micros = np.where(hours + local_offset_hours < 6, utc_micros + MICROS_PER_DAY, utc_micros)
+    return utc_micros
+
+
+def _julian_centuries(julian_days):
+    return (julian_days - JULIAN_DAY_JAN_1_2000) / JULIAN_DAYS_PER_CENTURY
+
+
+def _approximate_utc_sun_position(julian_centuries, latitude, longitude, zenith, mode):
+    eq_time = _equation_of_time(julian_centuries)
+    solar_dec = _solar_declination(julian_centuries)
+    hour_angle = _sun_hour_angle_at_horizon(latitude, solar_dec, zenith, mode)
+    delta = longitude - np.degrees(hour_angle)
+    return 720 + delta * 4.0 - eq_time
+
+
+def _sun_hour_angle_at_horizon(latitude, solar_dec, zenith, mode):
+    lat_r = np.radians(latitude)
+    solar_dec_r = np.radians(solar_dec)
+    zenith_r = np.radians(zenith)
+    hour_angle = np.arccos(
+        (np.cos(zenith_r) / (np.cos(lat_r) * np.cos(solar_dec_r))) -
+        (np.tan(lat_r) * np.tan(solar_dec_r))
+    )
+    return -hour_angle if mode == 'sunset' else hour_angle
+
+
+def _solar_declination(julian_centuries):
+    correction = np.radians(_obliquity_correction(julian_centuries))
+    apparent_longitude = np.radians(_sun_apparent_longitude(julian_centuries))
+    return np.degrees(np.arcsin(np.sin(correction) * np.sin(apparent_longitude)))
+
+
+def _sun_apparent_longitude(julian_centuries):
+    true_longitude = _sun_geometric_mean_longitude(julian_centuries) + _sun_equation_of_center(julian_centuries)
+    omega = 125.04 - (1934.136 * julian_centuries)
+    return true_longitude - 0.00569 - (0.00478 * np.sin(np.radians(omega)))
+
+
+def _sun_equation_of_center(julian_centuries):
+    mrad = np.radians(_sun_geometric_mean_anomaly(julian_centuries))
+    return (np.sin(mrad) * (1.914602 - (julian_centuries * (0.004817 + (0.000014 * julian_centuries))))) + \
+           (np.sin(2 * mrad) * (0.019993 - (0.000101 * julian_centuries))) + \
+           (np.sin(3 * mrad) * 0.000289)
+
+
+def _solar_noon_utc(julian_centuries, longitude):
+    century_start = julian_centuries * JULIAN_DAYS_PER_CENTURY + JULIAN_DAY_JAN_1_2000
+
+    approx_tnoon = _julian_centuries(century_start + (longitude / 360.0))
+    approx_sol_noon = 720 + (longitude * 4) - _equation_of_time(approx_tnoon)
+
+    tnoon = _julian_centuries(century_start - 0.5 + (approx_sol_noon / 1440.0))
+    return 720 + (longitude * 4) - _equation_of_time(tnoon)
+
+
+def _equation_of_time(julian_centuries):
+    epsilon = np.radians(_obliquity_correction(julian_centuries))
+    sgml = np.radians(_sun_geometric_mean_longitude(julian_centuries))
+    sgma = np.radians(_sun_geometric_mean_anomaly(julian_centuries))
+    eoe = 0.016708634 - (julian_centuries * (0.000042037 + (0.0000001267 * julian_centuries)))
+
+    y = np.tan(epsilon / 2.0) ** 2
+    sinm = np.sin(sgma)
+    eq_time = (y * np.sin(2.0 * sgml)) - (2.0 * eoe * sinm) + (4.0 * eoe * y * sinm * np.cos(2.0 * sgml)) - \
+              (0.5 * y * y * np.sin(4.0 * sgml)) - (1.25 * eoe * eoe * np.sin(2.0 * sgma))
+    return np.degrees(eq_time) * 4.0
+
+
+def _sun_geometric_mean_anomaly(julian_centuries):
+    return np.mod(357.52911 + (julian_centuries * (35999.05029 - (0.0001537 * julian_centuries))), 360)
+
+
+def _sun_geometric_mean_longitude(julian_centuries):
+    return np.mod(280.46646 + (julian_centuries * (36000.76983 + (0.0003032 * julian_centuries))), 360)
+
+
+def _obliquity_correction(julian_centuries):
+    seconds = 21.448 - (julian_centuries * (46.8150 + (julian_centuries * (0.00059 - (julian_centuries * 0.001813)))))
+    obliquity_of_ecliptic = 23.0 + ((26.0 + (seconds / 60)) / 60.0)
+    omega = 125.04 - (1934.136 * julian_centuries)
+    return np.mod(obliquity_of_ecliptic + (0.00256 * np.cos(np.radians(omega))), 360)
+
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+def validate_backends(latitude, longitude, timezone, start_date, end_date, name="Validation"):
+    """
+    Compare the NumPy backend against the zmanim library for a date range
+
+    Returns:
+        (max_difference_seconds, mismatches) where mismatches is a list of
+        (date, field, library_value, numpy_value) differing by a second or more
+        (or where only one backend produced a value).
+    """
+    reference = _library_solar_range(latitude, longitude, timezone, start_date, end_date, name)
+    candidate = _numpy_solar_range(latitude, longitude, timezone, start_date, end_date, name)
+    return compare_solar_days(reference, candidate)
+
+
+def compare_solar_days(reference, candidate):
+    """
+    Compare two calculate_solar_range() results
+
+    Returns:
+        (max_difference_seconds, mismatches) - see validate_backends()
+    """
+    max_difference = 0.0
+    mismatches = []
+    for target_date, expected_values in reference.items():
+        actual_values = candidate.get(target_date, {})
+        for field in SOLAR_FIELDS:
+            expected, actual = expected_values.get(field), actual_values.get(field)
+            if expected is None or actual is None:
+                if expected is not actual:
+                    mismatches.append((target_date, field, expected, actual))
+                continue
+            if field in SOLAR_HOUR_FIELDS:
+                difference = abs(expected - actual) / 1000.0
+            else:
+                difference = abs(_seconds_of_day(expected) - _seconds_of_day(actual))
+                difference = min(difference, 86400 - difference)
+            max_difference = max(max_difference, difference)
+            if difference >= 1:
+                mismatches.append((target_date, field, expected, actual))
+    return max_difference, mismatches
+
+
+def _seconds_of_day(value):
+    return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / MICROS_PER_SECOND
@@ -0,0 +1,107 @@
+"""
+Read-through cache of calculated solar zmanim, per location and date
+
+Recalculations (populate_zmanim, a manual refresh, a coordinate change
+and back) keep producing the solar times already calculated for the same
+place and date. get_solar_range() returns those from the Redis cache and
+only calculates the dates that are missing:
+
+    solar:<version>:<backend>:<latitude>:<longitude>:<timezone>:<date>
+
+Each value is a list in SOLAR_FIELDS order - microseconds since local
+midnight for times, milliseconds for the hour lengths, None where there
+is no value - so an entry is a few hundred bytes and a 6-month range is
+one get_many() and at most one set_many(). Entries expire after
+ZMANIM_SOLAR_MEMO_TIMEOUT and are safe to evict (Redis allkeys-lru).
+"""
+from datetime import time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from .solar_engine import calculate_solar_range, get_backend, SOLAR_FIELDS, SOLAR_HOUR_FIELDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the calculation changes so old entries are never read again
+MEMO_VERSION = 1
+
+
+def memo_enabled():
+    return getattr(settings, 'ZMANIM_SOLAR_MEMO', True)
+
+
+def memo_timeout():
+    return getattr(settings, 'ZMANIM_SOLAR_MEMO_TIMEOUT', 60 * 60 * 24 * 30)
+
+
+def memo_key(latitude, longitude, timezone, target_date, backend):
+    return f'solar:{MEMO_VERSION}:{backend}:{float(latitude):.6f}:{float(longitude):.6f}:{timezone}:{target_date.isoformat()}'
+
+
+def _pack(values):
+    packed = []
+    for field in SOLAR_FIELDS:
+        value = values.get(field)
+        if value is None or field in SOLAR_HOUR_FIELDS:
+            packed.append(value)
+        else:
+            packed.append(((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond)
+    return packed
+
+
+def _unpack(packed):
+    values = {}
+    for field, value in zip(SOLAR_FIELDS, packed):
+        if value is None or field in SOLAR_HOUR_FIELDS:
+            values[field] = value
+        else:
+            seconds, microsecond = divmod(value, 1_000_000)
+            minutes, second = divmod(seconds, 60)
+            hour, minute = divmod(minutes, 60)
+            values[field] = time(hour, minute, second, microsecond)
+    return values
+
+
+def get_solar_range(latitude, longitude, timezone, start_date, end_date, name="Your Shul Name", backend=None):
+    """
+    calculate_solar_range(), served from the cache where possible
+
+    The dates not in the cache are calculated in one calculate_solar_range()
+    call spanning the first to the last missing date, and stored.
+    """
+    backend = backend or get_backend()
+    if not memo_enabled() or start_date > end_date:
+        return calculate_solar_range(latitude, longitude, timezone, start_date, end_date, name, backend)
+
+    keys = {}
+    current_date = start_date
+    while current_date <= end_date:
+        keys[current_date] = memo_key(latitude, longitude, timezone, current_date, backend)
+        current_date += timedelta(days=1)
+
+    try:
+        found = cache.get_many(list(keys.values()))
+    except Exception as e:
+        logger.warning(f"Solar memo cache unavailable: {str(e)}")
+        return calculate_solar_range(latitude, longitude, timezone, start_date, end_date, name, backend)
+
+    results = {
+        target_date: _unpack(found[key])
+        for target_date, key in keys.items() if key in found
+    }
+    missing = [target_date for target_date in keys if target_date not in results]
+    if not missing:
+        return results
+
+    calculated = calculate_solar_range(latitude, longitude, timezone, missing[0], missing[-1], name, backend)
+    try:
+        cache.set_many(
+            {keys[target_date]: _pack(values) for target_date, values in calculated.items() if target_date in keys},
+            timeout=memo_timeout()
+        )
+    except Exception as e:
+        logger.warning(f"Could not store solar memo entries: {str(e)}")
+
+    results.update(calculated)
+    logger.debug(f"Solar memo: {len(keys) - len(missing)} of {len(keys)} days cached")
+    return results
@@ -1,77 +1,197 @@
-from celery import shared_task
+from celery import shared_task, chord
+from collections import defaultdict
 from datetime import date, timedelta
 import logging
+import time
 from .models import Shul, DailyZmanim
 from .zmanim_calculator import ZmanimCalculator
 from django.core.mail import send_mail
 from django.conf import settings
+from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# A worker that dies mid-calculation frees its fill slot after this long
+FILL_SLOT_TIMEOUT = 15 * 60
+
+# How long a fill task waits before checking for a free slot again
+# (doubling per check up to FILL_SLOT_MAX_WAIT)
+FILL_SLOT_WAIT = 10
+FILL_SLOT_MAX_WAIT = 120
+
+# A fill task gives up after this many checks (about an hour of waiting);
+# its shuls are picked up by the next fill run
+FILL_SLOT_MAX_CHECKS = 35
+
+
+def _dispatch_missing_zmanim(start_date, end_date, job_name):
+    """
+    Fan out fill_missing_zmanim tasks for every active shul with a gap
+
+    The tasks run as a Celery chord whose callback logs one summary for
+    the whole job. With ZMANIM_BUCKET_PRECISION set, shuls at nearly the
+    same location go to one task so their solar zmanim are calculated once.
+    Tomorrow onwards is checked: depending on its timezone a shul's row for
+    today (UTC) may already have been cleaned up.
+
+    Returns:
+        Dict of shul_id -> number of missing days
+    """
+    from .solar_buckets import bucket_precision, location_bucket
+
+    incomplete = ZmanimCalculator.find_incomplete_shuls(start_date + timedelta(days=1), end_date)
+    if not incomplete:
+        return incomplete
+
+    if bucket_precision():
+        groups = defaultdict(list)
+        for shul_id, latitude, longitude, timezone in Shul.objects.filter(
+            id__in=incomplete
+        ).values_list('id', 'latitude', 'longitude', 'timezone'):
+            groups[location_bucket(latitude, longitude, timezone)].append(shul_id)
+        shul_groups = list(groups.values())
+    else:
+        shul_groups = [[shul_id] for shul_id in incomplete]
+
+    chord(
+        fill_missing_zmanim.s(shul_ids, start_date.isoformat(), end_date.isoformat())
+        for shul_ids in shul_groups
+    )(summarize_zmanim_fill.s(job_name, time.time()))
+    return incomplete
+
+
+def _acquire_fill_slot(task_id):
+    """Take one of ZMANIM_FILL_CONCURRENCY slots, shared by all workers (None if all are busy)"""
+    for slot in range(settings.ZMANIM_FILL_CONCURRENCY):
+        key = f'zmanim:fill:slot:{slot}'
+        if cache.add(key, task_id, timeout=FILL_SLOT_TIMEOUT):
+            return key
+    return None
+
+
+def _release_fill_slot(key, task_id):
+    if cache.get(key) == task_id:
+        cache.delete(key)
+
+
+# Retries are bounded by the task's own counters (slot_checks, failures):
+# retry(max_retries=None) would fall back to Celery's default of 3
+@shared_task(bind=True, max_retries=None)
+def fill_missing_zmanim(self, shul_ids, start_date, end_date, failures=0, slot_checks=0):
+    """
+    Calculate the missing dates of some shuls' range (ISO date strings)
+
+    shul_ids are shuls at nearly the same location (or a single shul);
+    their solar zmanim are shared where that stays within the error bound.
+
+    At most ZMANIM_FILL_CONCURRENCY of these calculate at once, however
+    many workers there are; the rest wait for a free slot, checking less
+    often the longer they wait, and give up after FILL_SLOT_MAX_CHECKS.
+    Failures are retried with exponential backoff. The result always comes
+    back (with the error once retries or slot checks are exhausted) so the
+    chord summary still runs.
+    """
+    result = {'shul_ids': shul_ids, 'days': 0, 'calculations_saved': 0, 'error': None}
+
+    slot = _acquire_fill_slot(self.request.id)
+    if slot is None:
+        if slot_checks + 1 >= FILL_SLOT_MAX_CHECKS:
+            logger.error(f"No free fill slot for shuls {shul_ids} after {slot_checks + 1} checks, giving up")
+            result['error'] = 'No free fill slot'
+            return result
+        raise self.retry(
+            args=[shul_ids, start_date, end_date],
+            kwargs={'failures': failures, 'slot_checks': slot_checks + 1},
+            countdown=min(FILL_SLOT_WAIT * 2 ** slot_checks, FILL_SLOT_MAX_WAIT)
+        )
+    try:
+        shuls = list(Shul.objects.filter(id__in=shul_ids))
+        if not shuls:
+            result['error'] = 'Shul not found'
+        elif len(shuls) == 1:
+            result['days'] = ZmanimCalculator.fill_missing_dates(
+                shuls[0],
+                date.fromisoformat(start_date),
+                date.fromisoformat(end_date)
+            )
+        else:
+            result['days'], stats = ZmanimCalculator.fill_missing_dates_for_shuls(
+                shuls,
+                date.fromisoformat(start_date),
+                date.fromisoformat(end_date)
+            )
+            result['calculations_saved'] = stats['saved'] if stats else 0
+        return result
+
+    except Exception as e:
+        if failures < settings.ZMANIM_FILL_MAX_RETRIES:
+            countdown = settings.ZMANIM_FILL_RETRY_BACKOFF * 2 ** failures
+            logger.warning(f"Filling zmanim for shuls {shul_ids} failed ({str(e)}), retrying in {countdown}s")
+            raise self.retry(
+                args=[shul_ids, start_date, end_date],
+                kwargs={'failures': failures + 1},
+                countdown=countdown
+            )
+        logger.error(f"Error filling missing zmanim for shuls {shul_ids}: {str(e)}")
+        result['error'] = str(e)
+        return result
+
+    finally:
+        _release_fill_slot(slot, self.request.id)
+
+
+@shared_task
+def summarize_zmanim_fill(results, job_name, started_at):
+    """Chord callback: log one summary for a fill_missing_zmanim fan-out"""
+    failed = [result for result in results if result['error']]
+    shul_count = sum(len(result['shul_ids']) for result in results)
+    failed_count = sum(len(result['shul_ids']) for result in failed)
+    days = sum(result['days'] for result in results)
+    saved = sum(result['calculations_saved'] for result in results)
+    elapsed = time.time() - started_at
+
+    logger.info(
+        f"{job_name}: filled {days} days for {shul_count - failed_count}/{shul_count} shuls "
+        f"in {elapsed:.1f}s ({saved} solar days saved by sharing)"
+    )
+    for result in failed:
+        logger.error(f"{job_name}: shuls {result['shul_ids']} failed: {result['error']}")
+
+    return f"{job_name}: filled {days} days, {failed_count} shuls failed, {saved} solar days saved"
+
 
 @shared_task
 def extend_all_shuls_forward():
     """
     Weekly task to extend zmanim calculations to ensure 6 months from today
     Maintains a rolling 6-month buffer even if task hasn't run for a while
-    """
-    shuls = Shul.objects.filter(is_active=True)
-    logger.info(f"Extending zmanim for {shuls.count()} active shuls")
 
+    One aggregate query finds the shuls that are short; each of them is
+    filled by its own fill_missing_zmanim task, spread across the workers.
+    """
     today = date.today()
     target_end_date = today + timedelta(days=180)  # 6 months from today
 
-    for shul in shuls:
-        try:
-            # Find last date we have data for
-            last_record = DailyZmanim.objects.filter(shul=shul).order_by('-date').first()
-
-            if last_record and last_record.date >= target_end_date:
-                # Already have 6 months of data
-                logger.info(f"{shul.name}: Already has 6 months of data (last date: {last_record.date})")
-                continue
-
-            if last_record:
-                start_date = last_record.date + timedelta(days=1)
-                days_to_add = (target_end_date - last_record.date).days
-            else:
-                # No data exists, start from today
-                start_date = today
-                days_to_add = 180
-
-            # Calculate missing zmanim up to 6 months from today
-            count = ZmanimCalculator.calculate_date_range(shul, start_date, target_end_date)
-            logger.info(f"Extended {shul.name}: added {count} days (was missing {days_to_add} days)")
-
-        except Exception as e:
-            logger.error(f"Error extending {shul.name}: {str(e)}")
+    incomplete = _dispatch_missing_zmanim(today, target_end_date, 'Weekly extension')
+    logger.info(f"Extending zmanim for {len(incomplete)} shuls missing {sum(incomplete.values())} days")
 
-    return f"Extended {shuls.count()} shuls to 6 months from today"
+    return f"Queued extension of {len(incomplete)} shuls to 6 months from today"
 
 
 @shared_task
 def validate_zmanim_integrity():
     """
     Daily validation to ensure all shuls have data for next 6 months
-    Auto-fills any gaps
+    Auto-fills any gaps, including missing days in the middle of the range
     """
-    shuls = Shul.objects.filter(is_active=True)
     target_date = date.today() + timedelta(days=180)  # 6 months ahead
 
-    issues_found = 0
-
-    for shul in shuls:
-        last_record = DailyZmanim.objects.filter(shul=shul).order_by('-date').first()
-
-        if not last_record or last_record.date < target_date:
-            logger.warning(f"Shul {shul.name} missing data, auto-filling...")
-
-            start = last_record.date + timedelta(days=1) if last_record else date.today()
-            ZmanimCalculator.calculate_date_range(shul, start, target_date)
-            issues_found += 1
+    incomplete = _dispatch_missing_zmanim(date.today(), target_date, 'Integrity validation')
+    for shul_id, missing_days in incomplete.items():
+        logger.warning(f"Shul {shul_id} missing {missing_days} days, auto-filling...")
 
-    logger.info(f"Validation complete. Fixed {issues_found} shuls.")
-    return f"Validated {shuls.count()} shuls, fixed {issues_found}"
+    logger.info(f"Validation complete. Fixing {len(incomplete)} shuls.")
+    return f"Validated zmanim horizon, fixing {len(incomplete)} shuls"
 
 
 @shared_task
@@ -79,37 +199,142 @@ def cleanup_old_zmanim():
     """
     Hourly cleanup task that deletes past zmanim for each shul based on their timezone.
     Runs every hour and checks if it's past midnight in each shul's timezone.
+
+    Shuls are grouped by their local date (computed once per timezone), so
+    each run is one set-based DELETE per distinct local date - at most a
+    few - however many shuls there are. Past custom time occurrences go with
+    them, and shared calendar days nobody references any more are pruned
+    in one statement (tests.py pins the query count).
     """
     from datetime import datetime
+    from collections import defaultdict
+    from .models import CustomTimeOccurrence, MonthlyZmanimBlob
+    from .calendar_days import prune_calendar_days
+    from .partitions import month_start
     import pytz
+    import time
 
-    shuls = Shul.objects.filter(is_active=True)
-    total_deleted = 0
+    started = time.monotonic()
 
-    for shul in shuls:
+    # Local date -> timezones that are currently on it
+    timezones_by_date = defaultdict(list)
+    for timezone_name in Shul.objects.filter(is_active=True).order_by().values_list('timezone', flat=True).distinct():
         try:
-            # Get current time in the shul's timezone
-            tz = pytz.timezone(shul.timezone)
-            shul_now = datetime.now(tz)
-            shul_today = shul_now.date()
+            timezones_by_date[datetime.now(pytz.timezone(timezone_name)).date()].append(timezone_name)
+        except Exception as e:
+            logger.error(f"Error cleaning up shuls in timezone {timezone_name}: {str(e)}")
 
-            # Delete all records before today in this shul's timezone
-            deleted_count, _ = DailyZmanim.objects.filter(
-                shul=shul,
-                date__lt=shul_today
-            ).delete()
+    zmanim_deleted = 0
+    occurrences_deleted = 0
+    for shul_today, timezone_names in timezones_by_date.items():
+        shul_filter = {'shul__is_active': True, 'shul__timezone__in': timezone_names}
 
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} old records for {shul.name} (timezone: {shul.timezone}, local date: {shul_today})")
-                total_deleted += deleted_count
+        # Delete all records before today in these shuls' timezones
+        deleted_count, _ = DailyZmanim.objects.filter(date__lt=shul_today, **shul_filter).delete()
+        zmanim_deleted += deleted_count
+        # No display invalidation: payloads are per local date, so past days
+        # are never part of a valid one
+        if deleted_count:
+            # Blobs of the current month still hold the deleted days
+            MonthlyZmanimBlob.objects.filter(month__lte=month_start(shul_today), **shul_filter).delete()
 
-        except Exception as e:
-            logger.error(f"Error cleaning up {shul.name}: {str(e)}")
+        deleted_count, _ = CustomTimeOccurrence.objects.filter(date__lt=shul_today, **shul_filter).delete()
+        occurrences_deleted += deleted_count
+
+        logger.debug(f"Cleaned up records before {shul_today} for {len(timezone_names)} timezones")
+
+    # Calendar days are shared: keep a margin for shuls that are a day behind
+    calendar_days_deleted = 0
+    if timezones_by_date:
+        calendar_cutoff = min(timezones_by_date) - timedelta(days=2)
+        calendar_days_deleted = prune_calendar_days(calendar_cutoff)
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"Cleanup: deleted {zmanim_deleted} zmanim, {occurrences_deleted} custom time occurrences "
+        f"and {calendar_days_deleted} calendar days ({len(timezones_by_date)} local dates) in {elapsed:.2f}s"
+    )
+
+    return f"Deleted {zmanim_deleted} old records across all shuls in {elapsed:.2f}s"
+
+
+@shared_task
+def maintain_zmanim_partitions():
+    """
+    Daily upkeep of the partitioned DailyZmanim table (see partitions.py)
+
+    Creates the partitions for the months ahead and drops the partitions of
+    months that are over, which is how old days are expired for good - the
+    hourly cleanup only deletes the few past days of the current month.
+    Does nothing unless the table is partitioned.
+    """
+    from django.db import transaction
+    from . import partitions
+
+    if not partitions.is_partitioned():
+        return "DailyZmanim is not partitioned"
+
+    with transaction.atomic():
+        created = partitions.ensure_partitions()
+        dropped = partitions.drop_expired_partitions()
+
+    return f"Created {len(created)} and dropped {len(dropped)} zmanim partitions"
+
+
+@shared_task
+def run_zmanim_job(job_id, shul_id, kind):
+    """
+    Refresh or extend one shul's zmanim in the background
+
+    Progress and the result are reported through zmanim_jobs (polled by the
+    zmanim/jobs/<job_id>/ endpoint).
+    """
+    from .zmanim_jobs import claim_job, finish_job, progress_reporter
+
+    try:
+        shul = Shul.objects.get(id=shul_id)
+        if not claim_job(job_id, shul_id):
+            finish_job(job_id, shul_id, error='Superseded by a newer zmanim job')
+            return 'Superseded'
 
-    if total_deleted > 0:
-        logger.info(f"Total cleanup: deleted {total_deleted} old records across all shuls")
+        if kind == 'refresh':
+            result = ZmanimCalculator.refresh_shul(shul, progress_reporter(job_id))
+        else:
+            result = ZmanimCalculator.extend_shul(shul, progress_reporter(job_id))
 
-    return f"Deleted {total_deleted} old records across all shuls"
+        finish_job(job_id, shul_id, result=result)
+        return result.get('message')
+
+    except Exception as e:
+        logger.error(f"Zmanim {kind} job {job_id} for shul {shul_id} failed: {str(e)}")
+        finish_job(job_id, shul_id, error=str(e))
+        return f"Failed: {str(e)}"
+
+
+@shared_task
+def flush_display_heartbeats():
+    """
+    Copy buffered display heartbeats to Shul.last_display_access
+
+    Runs every minute. Display polls only write to the cache; this turns
+    them into a single bulk UPDATE of the shuls whose newest heartbeat is
+    more recent than what is stored.
+    """
+    from .display_heartbeats import get_heartbeats, latest_heartbeat
+
+    stored = dict(Shul.objects.values_list('id', 'last_display_access'))
+    heartbeats = get_heartbeats(stored.keys())
+
+    updated = []
+    for shul_id, screens in heartbeats.items():
+        last_seen = latest_heartbeat(screens)
+        if stored[shul_id] is None or last_seen > stored[shul_id]:
+            updated.append(Shul(id=shul_id, last_display_access=last_seen))
+
+    if updated:
+        Shul.objects.bulk_update(updated, ['last_display_access'], batch_size=500)
+
+    return f"Flushed display access for {len(updated)} shuls"
 
 
 @shared_task
@@ -129,12 +354,8 @@ def recalculate_shul_zmanim(shul_id, from_date=None):
         elif isinstance(from_date, str):
             from_date = date.fromisoformat(from_date)
 
-        # Delete existing records from this date forward
-        DailyZmanim.objects.filter(shul=shul, date__gte=from_date).delete()
-
-        # Recalculate 6 months forward
-        end_date = from_date + timedelta(days=180)
-        count = ZmanimCalculator.calculate_date_range(shul, from_date, end_date)
+        # Recalculate 6 months forward (upsert - no window with missing days)
+        count = ZmanimCalculator.recalculate_from_date(shul, from_date)
 
         logger.info(f"Recalculated {count} days for {shul.name}")
         return f"Recalculated {count} days"
@@ -144,6 +365,19 @@ def recalculate_shul_zmanim(shul_id, from_date=None):
         return f"Shul {shul_id} not found"
 
 
+@shared_task
+def refresh_display_strings(shul_id):
+    """Re-format a shul's stored display strings after its time format settings changed"""
+    try:
+        shul = Shul.objects.get(id=shul_id)
+    except Shul.DoesNotExist:
+        logger.error(f"Shul {shul_id} not found")
+        return f"Shul {shul_id} not found"
+
+    count = ZmanimCalculator.refresh_display_strings(shul)
+    return f"Refreshed display strings of {count} days"
+
+
 # ========== EMAIL TASKS (Async to prevent blocking) ==========
 
 @shared_task
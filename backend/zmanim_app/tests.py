@@ -1,3 +1,95 @@
-from django.test import TestCase
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from .display_strings import get_display_strings
+from .models import Shul, DailyZmanim, JewishCalendarDay, MonthlyZmanimBlob
+from .tasks import cleanup_old_zmanim
+from .zmanim_fields import get_formatter
 
-# Create your tests here.
+
+class CleanupOldZmanimTests(TestCase):
+    """cleanup_old_zmanim must stay set-based, whatever number of rows it deletes"""
+
+    # Active timezones; zmanim, blobs and custom time occurrences of the one
+    # local date; unused calendar days
+    EXPECTED_QUERIES = 1 + 3 + 1
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create_user('cleanup', 'cleanup@example.com', 'password')
+        cls.shuls = [
+            Shul.objects.create(name=f'Shul {number}', admin=admin, country='US', timezone='America/New_York')
+            for number in range(2)
+        ]
+
+    def create_rows(self, past_days):
+        """past_days rows per shul that are over everywhere, plus some that are not"""
+        today = date.today()
+        days = [today - timedelta(days=offset) for offset in range(3, 3 + past_days)]
+        days += [today + timedelta(days=offset) for offset in range(2, 5)]
+
+        calendar_days = JewishCalendarDay.objects.bulk_create(
+            [JewishCalendarDay(date=day) for day in days]
+            # Old and unreferenced - pruned by the same cleanup
+            + [JewishCalendarDay(date=today - timedelta(days=offset)) for offset in range(400, 400 + past_days)]
+        )
+        calendar_day_by_date = {calendar_day.date: calendar_day for calendar_day in calendar_days}
+        DailyZmanim.objects.bulk_create([
+            DailyZmanim(shul=shul, date=day, calendar_day=calendar_day_by_date[day])
+            for shul in self.shuls
+            for day in days
+        ])
+        MonthlyZmanimBlob.objects.bulk_create([
+            MonthlyZmanimBlob(shul=shul, month=day.replace(day=1))
+            for shul in self.shuls
+            for day in {min(days), max(days)}
+        ], ignore_conflicts=True)
+
+    def assert_cleanup(self, past_days):
+        self.create_rows(past_days)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            cleanup_old_zmanim()
+
+        self.assertFalse(DailyZmanim.objects.filter(date__lt=date.today() - timedelta(days=1)).exists())
+        self.assertEqual(DailyZmanim.objects.count(), 3 * len(self.shuls))
+        self.assertFalse(JewishCalendarDay.objects.filter(daily_zmanim__isnull=True).exists())
+
+    def test_few_rows(self):
+        self.assert_cleanup(past_days=5)
+
+    def test_many_rows(self):
+        self.assert_cleanup(past_days=60)
+
+
+class ZmanimFormattingTests(SimpleTestCase):
+    """Times shown by get_zmanim and the displays, and the Hebrew calendar's weekday"""
+
+    def test_day_of_week_is_one_based(self):
+        # JewishCalendar.day_of_week is 1 (Sunday) to 7 (Saturday)
+        formatter = get_formatter('24h', False)
+        names = [
+            formatter.jewish_calendar(JewishCalendarDay(day_of_week=value))['Day of Week']
+            for value in range(1, 8)
+        ]
+        self.assertEqual(names, ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'])
+
+    def test_hidden_seconds_round_per_field(self):
+        """get_zmanim shows the same minutes as the displays (stringent per field)"""
+        shul = SimpleNamespace(time_format='24h', show_seconds=False)
+        row = DailyZmanim(
+            alos=time(5, 10, 1),                         # earliest time - up
+            sof_zman_krias_shema_gra=time(9, 41, 59),    # deadline - down
+            shkia=time(18, 2, 29),                       # neutral - nearest
+            chatzos=time(12, 30, 30),
+        )
+        strings = get_display_strings(row, shul)
+        self.assertEqual(strings['Alos HaShachar'], '05:11')
+        self.assertEqual(strings['Sof Zman Krias Shema GRA'], '09:41')
+        self.assertEqual(strings['Shkiah'], '18:02')
+        self.assertEqual(strings['Chatzos'], '12:31')
+
+    def test_shown_seconds_are_not_rounded(self):
+        shul = SimpleNamespace(time_format='12h', show_seconds=True)
+        strings = get_display_strings(DailyZmanim(sof_zman_krias_shema_gra=time(9, 41, 59)), shul)
+        self.assertEqual(strings['Sof Zman Krias Shema GRA'], '9:41:59')
@@ -19,6 +19,7 @@ urlpatterns = [
     path('zmanim/', views.get_zmanim, name='get_zmanim'),
     path('zmanim/refresh/', views.refresh_zmanim, name='refresh_zmanim'),
     path('zmanim/extend/', views.extend_zmanim_forward, name='extend_zmanim_forward'),
+    path('zmanim/jobs/<str:job_id>/', views.zmanim_job_status, name='zmanim_job_status'),
     path('zmanim/range/', views.get_zmanim_range, name='get_zmanim_range'),
     path('zmanim/available-fields/', views.get_available_base_times, name='available_fields'),
     
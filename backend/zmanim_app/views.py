@@ -2,6 +2,8 @@ import requests
 import logging
 from django.contrib.auth import authenticate
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
@@ -17,14 +19,14 @@ from .serializers import (
     PendingRegistrationSerializer, PendingRegistrationCreateSerializer, CompleteRegistrationSerializer
 )
 from .get_daily_zmanim import get_daily_zmanim
+from .display_cache import get_display_payload, set_display_payload, get_entry_validators, FULL_PAYLOAD
+from .display_heartbeats import record_heartbeat, get_screen_id, count_screens_online
+from .custom_time_occurrences import get_occurrences
+from .display_strings import get_display_strings
+from .zmanim_fields import FIELDS as ZMANIM_FIELDS, format_value, shul_formatter
+from .zmanim_jobs import start_job, get_job
 from .translations import (
     translate_dict_keys,
-    translate_term,
-    translate_daf_yomi,
-    translate_parsha,
-    translate_mishna_yomis,
-    translate_tehillim,
-    translate_amud_yomi,
     number_to_gematria,
     JEWISH_MONTH_NAMES
 )
@@ -254,92 +256,6 @@ def update_coordinates(request):
     return Response(ShulSerializer(shul).data)
 
 
-def get_rounding_direction(field_name):
-    """Determine rounding direction for a field based on halachic stringency"""
-    field_lower = field_name.lower()
-
-    # Round DOWN (truncate) - Latest times (deadlines)
-    round_down_fields = [
-        'sof zman', 'candle lighting', 'kiddush levana latest'
-    ]
-    if any(field in field_lower for field in round_down_fields):
-        return 'down'
-
-    # Round UP (ceiling) - Earliest times
-    round_up_fields = [
-        'alos', 'netz', 'neitz', 'sunrise', 'mincha gedola', 'mincha ketana',
-        'plag', 'tzais', 'tzeis', 'tzeit', 'kiddush levana earliest'
-    ]
-    if any(field in field_lower for field in round_up_fields):
-        return 'up'
-
-    # Round to NEAREST - Neutral times
-    round_nearest_fields = ['shkia', 'shkiah', 'sunset', 'chatzos', 'chatzot', 'sun transit']
-    if any(field in field_lower for field in round_nearest_fields):
-        return 'nearest'
-
-    # Default to rounding up for safety (le'chumra)
-    return 'up'
-
-
-def round_time_for_display(time_obj, field_name=''):
-    """Round a time object based on field type for halachic stringency"""
-    from datetime import time as dt_time
-
-    if not isinstance(time_obj, (dt_time, datetime.datetime)):
-        return time_obj
-
-    # Extract time if it's a datetime object
-    if isinstance(time_obj, datetime.datetime):
-        time_part = time_obj.time()
-        is_datetime = True
-    else:
-        time_part = time_obj
-        is_datetime = False
-
-    seconds = time_part.second
-    if seconds == 0:
-        return time_obj  # No rounding needed
-
-    direction = get_rounding_direction(field_name)
-
-    # Convert time to datetime for easier manipulation
-    dt = datetime.datetime.combine(datetime.datetime.today(), time_part)
-
-    if direction == 'down':
-        # Round down - just remove seconds
-        dt = dt.replace(second=0, microsecond=0)
-    elif direction == 'up':
-        # Round up - add 1 minute if there are any seconds
-        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
-    else:  # nearest
-        # Round to nearest minute
-        if seconds >= 30:
-            dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
-        else:
-            dt = dt.replace(second=0, microsecond=0)
-
-    # Return in same format as input
-    if is_datetime:
-        return datetime.datetime.combine(time_obj.date(), dt.time())
-    else:
-        return dt.time()
-
-
-def format_value(value, time_format="24h", show_seconds=True, field_name=''):
-    """Format time values for display with intelligent rounding"""
-    if hasattr(value, 'strftime'):
-        # Apply intelligent rounding if not showing seconds
-        if not show_seconds and hasattr(value, 'replace'):
-            value = round_time_for_display(value, field_name)
-
-        if time_format == "12h":
-            formatted_time = value.strftime('%I:%M:%S' if show_seconds else '%I:%M').lstrip('0')
-            return formatted_time
-        return value.strftime('%H:%M:%S') if show_seconds else value.strftime('%H:%M')
-    return str(value) if value is not None else None
-
-
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_zmanim(request):
@@ -353,100 +269,26 @@ def get_zmanim(request):
     tz = pytz.timezone(shul.timezone)
     today = datetime.datetime.now(tz).date()
 
-    # Get today's zmanim from DailyZmanim table
-    daily_zmanim = DailyZmanim.objects.filter(shul=shul, date=today).first()
+    # Get today's zmanim from DailyZmanim table (calculated now if missing)
+    from .zmanim_calculator import ZmanimCalculator
+    daily_zmanim = ZmanimCalculator.get_or_calculate_day(shul, today)
 
     if not daily_zmanim:
         return Response({'error': 'No zmanim data available for today. Please contact support.'},
                        status=status.HTTP_404_NOT_FOUND)
 
-    # Format zmanim data - BASIC ZMANIM (14 fields)
-    zmanim_data = {
-        'Alos HaShachar': format_value(daily_zmanim.alos, shul.time_format, shul.show_seconds),
-        'Neitz HaChamah': format_value(daily_zmanim.hanetz, shul.time_format, shul.show_seconds),
-        'Chatzos': format_value(daily_zmanim.chatzos, shul.time_format, shul.show_seconds),
-        'Mincha Gedola': format_value(daily_zmanim.mincha_gedola, shul.time_format, shul.show_seconds),
-        'Mincha Ketana': format_value(daily_zmanim.mincha_ketana, shul.time_format, shul.show_seconds),
-        'Plag HaMincha': format_value(daily_zmanim.plag_hamincha, shul.time_format, shul.show_seconds),
-        'Shkiah': format_value(daily_zmanim.shkia, shul.time_format, shul.show_seconds),
-        'Tzais': format_value(daily_zmanim.tzais, shul.time_format, shul.show_seconds),
-        'Tzais 72 minutes': format_value(daily_zmanim.tzais_72, shul.time_format, shul.show_seconds),
-        'Sof Zman Krias Shema GRA': format_value(daily_zmanim.sof_zman_krias_shema_gra, shul.time_format, shul.show_seconds),
-        'Sof Zman Krias Shema MGA': format_value(daily_zmanim.sof_zman_krias_shema_mga, shul.time_format, shul.show_seconds),
-        'Sof Zman Tefillah GRA': format_value(daily_zmanim.sof_zman_tfila_gra, shul.time_format, shul.show_seconds),
-        'Sof Zman Tefillah MGA': format_value(daily_zmanim.sof_zman_tfila_mga, shul.time_format, shul.show_seconds),
-        'Candle Lighting': format_value(daily_zmanim.candle_lighting, shul.time_format, shul.show_seconds),
-        # ADDITIONAL ZMANIM (12 time fields)
-        'Sea Level Sunrise': format_value(daily_zmanim.sea_level_sunrise, shul.time_format, shul.show_seconds),
-        'Sea Level Sunset': format_value(daily_zmanim.sea_level_sunset, shul.time_format, shul.show_seconds),
-        'Elevation Adjusted Sunrise': format_value(daily_zmanim.elevation_adjusted_sunrise, shul.time_format, shul.show_seconds),
-        'Elevation Adjusted Sunset': format_value(daily_zmanim.elevation_adjusted_sunset, shul.time_format, shul.show_seconds),
-        'Alos 16.1°': format_value(daily_zmanim.alos_16_1, shul.time_format, shul.show_seconds),
-        'Alos 18°': format_value(daily_zmanim.alos_18, shul.time_format, shul.show_seconds),
-        'Alos 19.8°': format_value(daily_zmanim.alos_19_8, shul.time_format, shul.show_seconds),
-        'Tzais 8.5°': format_value(daily_zmanim.tzais_8_5, shul.time_format, shul.show_seconds),
-        'Tzais 7.083°': format_value(daily_zmanim.tzais_7_083, shul.time_format, shul.show_seconds),
-        'Tzais 5.95°': format_value(daily_zmanim.tzais_5_95, shul.time_format, shul.show_seconds),
-        'Tzais 6.45°': format_value(daily_zmanim.tzais_6_45, shul.time_format, shul.show_seconds),
-        'Sun Transit': format_value(daily_zmanim.sun_transit, shul.time_format, shul.show_seconds),
-        # HALACHIC HOURS (3 fields) - formatted as minutes
-        'Shaah Zmanis GRA': f"{(daily_zmanim.shaah_zmanis_gra / 60000):.1f} min" if daily_zmanim.shaah_zmanis_gra else None,
-        'Shaah Zmanis MGA': f"{(daily_zmanim.shaah_zmanis_mga / 60000):.1f} min" if daily_zmanim.shaah_zmanis_mga else None,
-        'Temporal Hour': f"{(daily_zmanim.temporal_hour / 60000):.1f} min" if daily_zmanim.temporal_hour else None,
-    }
+    # Zmanim strings (BASIC, ADDITIONAL and HALACHIC HOURS), formatted at calculation time
+    zmanim_data = get_display_strings(daily_zmanim, shul)
 
-    # Add learning schedule if available - LIMUDIM (8 fields)
-    limudim_data = {}
-    if daily_zmanim.parsha:
-        limudim_data['Parsha'] = daily_zmanim.parsha
-    if daily_zmanim.daf_yomi_bavli:
-        limudim_data['Daf Yomi Bavli'] = daily_zmanim.daf_yomi_bavli
-    if daily_zmanim.daf_yomi_yerushalmi:
-        limudim_data['Daf Yomi Yerushalmi'] = daily_zmanim.daf_yomi_yerushalmi
-    if daily_zmanim.mishna_yomis:
-        limudim_data['Mishna Yomis'] = daily_zmanim.mishna_yomis
-    if daily_zmanim.tehillim_monthly:
-        limudim_data['Tehillim Monthly'] = daily_zmanim.tehillim_monthly
-    if daily_zmanim.pirkei_avos:
-        limudim_data['Pirkei Avos'] = daily_zmanim.pirkei_avos
-    if daily_zmanim.daf_hashavua_bavli:
-        limudim_data['Daf HaShavua Bavli'] = daily_zmanim.daf_hashavua_bavli
-    if daily_zmanim.amud_yomi_bavli_dirshu:
-        limudim_data['Amud Yomi Bavli Dirshu'] = daily_zmanim.amud_yomi_bavli_dirshu
+    # LIMUDIM (those with a value today, names translated) and JEWISH CALENDAR
+    # DATA, formatted by the shul's precompiled formatter (see zmanim_fields)
+    formatter = shul_formatter(shul)
+    translated_limudim = formatter.limudim(daily_zmanim)
+    jewish_calendar_data = formatter.jewish_calendar(daily_zmanim)
 
     # Apply translations based on shul language setting
     language = shul.language if shul.language else 'en'
 
-    # JEWISH CALENDAR DATA (20 fields)
-    # Translate month name
-    translated_month_name = daily_zmanim.jewish_month_name
-    if daily_zmanim.jewish_month_name:
-        month_name_lower = daily_zmanim.jewish_month_name.lower().replace(' ', '_')
-        translated_month_name = JEWISH_MONTH_NAMES.get(month_name_lower, {}).get(language, daily_zmanim.jewish_month_name)
-
-    jewish_calendar_data = {
-        'Jewish Year': daily_zmanim.jewish_year,
-        'Jewish Month': daily_zmanim.jewish_month,
-        'Jewish Month Name': translated_month_name,
-        'Jewish Day': daily_zmanim.jewish_day,
-        'Day of Week': ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'][daily_zmanim.day_of_week] if daily_zmanim.day_of_week is not None else None,
-        'Significant Day': daily_zmanim.significant_day if daily_zmanim.significant_day else None,
-        'Day of Omer': daily_zmanim.day_of_omer,
-        'Day of Chanukah': daily_zmanim.day_of_chanukah,
-        'Is Rosh Chodesh': daily_zmanim.is_rosh_chodesh,
-        'Is Yom Tov': daily_zmanim.is_yom_tov,
-        'Is Chol HaMoed': daily_zmanim.is_chol_hamoed,
-        'Is Erev Yom Tov': daily_zmanim.is_erev_yom_tov,
-        'Is Chanukah': daily_zmanim.is_chanukah,
-        'Is Fast Day': daily_zmanim.is_taanis,
-        'Is Assur Bemelacha': daily_zmanim.is_assur_bemelacha,
-        'Is Erev Rosh Chodesh': daily_zmanim.is_erev_rosh_chodesh,
-        'Molad': format_value(daily_zmanim.molad_datetime, shul.time_format, shul.show_seconds, 'Molad') if daily_zmanim.molad_datetime else None,
-        'Kiddush Levana Earliest (3 Days)': format_value(daily_zmanim.kiddush_levana_earliest_3_days, shul.time_format, shul.show_seconds, 'Kiddush Levana Earliest (3 Days)') if daily_zmanim.kiddush_levana_earliest_3_days else None,
-        'Kiddush Levana Earliest (7 Days)': format_value(daily_zmanim.kiddush_levana_earliest_7_days, shul.time_format, shul.show_seconds, 'Kiddush Levana Earliest (7 Days)') if daily_zmanim.kiddush_levana_earliest_7_days else None,
-        'Kiddush Levana Latest (15 Days)': format_value(daily_zmanim.kiddush_levana_latest_15_days, shul.time_format, shul.show_seconds, 'Kiddush Levana Latest (15 Days)') if daily_zmanim.kiddush_levana_latest_15_days else None,
-    }
-
     # Create formatted Hebrew date
     formatted_hebrew_date = None
     if daily_zmanim.jewish_day and daily_zmanim.jewish_month_name and daily_zmanim.jewish_year:
@@ -466,25 +308,9 @@ def get_zmanim(request):
             formatted_hebrew_date = f"{daily_zmanim.jewish_day} {translated_month} {daily_zmanim.jewish_year}"
 
     # Create display name translations (keep original keys for lookup)
-    zmanim_display_names = {key: translate_term(key, language) for key in zmanim_data.keys()}
-    limudim_display_names = {key: translate_term(key, language) for key in limudim_data.keys()}
-    calendar_display_names = {key: translate_term(key, language) for key in jewish_calendar_data.keys()}
-
-    # Translate tractate names in Daf Yomi values
-    translated_limudim = {}
-    for key, value in limudim_data.items():
-        if key in ['Daf Yomi Bavli', 'Daf Yomi Yerushalmi', 'Daf HaShavua Bavli'] and value:
-            translated_limudim[key] = translate_daf_yomi(value, language)
-        elif key == 'Amud Yomi Bavli Dirshu' and value:
-            translated_limudim[key] = translate_amud_yomi(value, language)
-        elif key == 'Mishna Yomis' and value:
-            translated_limudim[key] = translate_mishna_yomis(value, language)
-        elif key == 'Tehillim Monthly' and value:
-            translated_limudim[key] = translate_tehillim(value, language)
-        elif key == 'Parsha' and value:
-            translated_limudim[key] = translate_parsha(value, language)
-        else:
-            translated_limudim[key] = value
+    zmanim_display_names = formatter.names(zmanim_data)
+    limudim_display_names = formatter.names(translated_limudim)
+    calendar_display_names = formatter.names(jewish_calendar_data)
 
     return Response({
         'zmanim': zmanim_data,
@@ -520,12 +346,13 @@ class CustomTimeListCreateView(generics.ListCreateAPIView):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
 
-        # Add calculated times for today
+        # Add calculated times for today (one DailyZmanim query for all of them)
         today = date.today()
+        calculated_times = CustomTime.calculate_many(queryset, today)
         data = []
         for item, custom_time_obj in zip(serializer.data, queryset):
             item_dict = dict(item)
-            calculated_time = custom_time_obj.calculate_time(today)
+            calculated_time = calculated_times[custom_time_obj.id]
             if calculated_time:
                 item_dict['calculated_time'] = calculated_time.isoformat()
             else:
@@ -584,53 +411,36 @@ class CustomTextDetailView(generics.RetrieveUpdateDestroyAPIView):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def refresh_zmanim(request):
-    """Manually refresh zmanim for the user's shul (recalculates 6 months)"""
+    """
+    Manually refresh zmanim for the user's shul (recalculates 6 months)
+
+    The recalculation runs in the background; poll zmanim/jobs/<job_id>/
+    for progress and the result.
+    """
     shul = request.user.shuls.first()
     if not shul:
         return Response({'error': 'No shul found'}, status=status.HTTP_404_NOT_FOUND)
 
-    from .zmanim_calculator import ZmanimCalculator
-    import pytz
-
-    # Get today's date in the shul's timezone, not server timezone
-    tz = pytz.timezone(shul.timezone)
-    today = datetime.datetime.now(tz).date()
-    end_date = today + timedelta(days=180)  # 6 months
-
-    # Delete all past records (before today)
-    DailyZmanim.objects.filter(shul=shul, date__lt=today).delete()
-
-    # Delete existing records in the 6-month range
-    DailyZmanim.objects.filter(shul=shul, date__range=[today, end_date]).delete()
-
-    # Recalculate
-    count = ZmanimCalculator.calculate_date_range(shul, today, end_date)
-
-    return Response({
-        'message': f'Recalculated zmanim for 6 months',
-        'start_date': today.isoformat(),
-        'end_date': end_date.isoformat(),
-        'records_created': count
-    })
+    job, created = start_job(shul, 'refresh')
+    return _job_response(job, created)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def extend_zmanim_forward(request):
-    """Extend zmanim forward to ensure 6 months of data from today"""
+    """
+    Extend zmanim forward to ensure 6 months of data from today
+
+    Runs in the background like refresh_zmanim, except when there is
+    nothing to extend.
+    """
     shul = request.user.shuls.first()
     if not shul:
         return Response({'error': 'No shul found'}, status=status.HTTP_404_NOT_FOUND)
 
     from .zmanim_calculator import ZmanimCalculator
-    import pytz
 
-    # Get today's date in the shul's timezone, not server timezone
-    tz = pytz.timezone(shul.timezone)
-    today = datetime.datetime.now(tz).date()
-    target_end_date = today + timedelta(days=180)  # 6 months from today
-
-    # Find last date we have data for
+    target_end_date = ZmanimCalculator.local_today(shul) + timedelta(days=180)  # 6 months from today
     last_record = DailyZmanim.objects.filter(shul=shul).order_by('-date').first()
 
     if last_record and last_record.date >= target_end_date:
@@ -642,27 +452,28 @@ def extend_zmanim_forward(request):
             'records_created': 0
         })
 
-    if last_record:
-        # Start from day after last record
-        start_date = last_record.date + timedelta(days=1)
-        days_missing = (target_end_date - last_record.date).days
-    else:
-        # No data exists, start from today
-        start_date = today
-        days_missing = 180
+    job, created = start_job(shul, 'extend')
+    return _job_response(job, created)
 
-    # Calculate missing zmanim up to 6 months from today
-    count = ZmanimCalculator.calculate_date_range(shul, start_date, target_end_date)
 
-    return Response({
-        'message': f'Extended zmanim to ensure 6 months from today',
-        'start_date': start_date.isoformat(),
-        'end_date': target_end_date.isoformat(),
-        'records_created': count,
-        'days_added': days_missing,
-        'last_date_before': last_record.date.isoformat() if last_record else None,
-        'last_date_after': target_end_date.isoformat()
-    })
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def zmanim_job_status(request, job_id):
+    """Progress of a refresh / extend job started by the user's shul"""
+    shul = request.user.shuls.first()
+    job = get_job(job_id)
+    if not shul or job is None or job['shul_id'] != shul.id:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response(job)
+
+
+def _job_response(job, created):
+    """202 with the job's progress; deduplicated when an existing job was returned"""
+    return Response(
+        dict(job, deduplicated=not created, status_url=f"zmanim/jobs/{job['job_id']}/"),
+        status=status.HTTP_202_ACCEPTED
+    )
 
 
 @api_view(['GET'])
@@ -679,15 +490,15 @@ def get_zmanim_range(request):
     if not start_date or not end_date:
         return Response({'error': 'start_date and end_date required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    zmanim_records = DailyZmanim.objects.filter(
-        shul=shul,
-        date__range=[start_date, end_date]
-    ).order_by('date')
+    try:
+        start_date = date.fromisoformat(start_date)
+        end_date = date.fromisoformat(end_date)
+    except ValueError:
+        return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
 
-    from .serializers import DailyZmanimSerializer
-    serializer = DailyZmanimSerializer(zmanim_records, many=True)
+    from .monthly_blobs import get_zmanim_rows
 
-    return Response(serializer.data)
+    return Response(get_zmanim_rows(shul, start_date, end_date))
 
 
 @api_view(['GET'])
@@ -695,84 +506,7 @@ def get_zmanim_range(request):
 def get_available_base_times(request):
     """Get all available fields from DailyZmanim that can be used for dynamic custom times or display"""
 
-    available_fields = {
-        # ========== BASIC ZMANIM TIMES (14 fields) ==========
-        'alos': 'Alos HaShachar',
-        'hanetz': 'Neitz HaChamah (Sunrise)',
-        'chatzos': 'Chatzos (Midday)',
-        'mincha_gedola': 'Mincha Gedola',
-        'mincha_ketana': 'Mincha Ketana',
-        'plag_hamincha': 'Plag HaMincha',
-        'shkia': 'Shkiah (Sunset)',
-        'tzais': 'Tzais (Nightfall)',
-        'tzais_72': 'Tzais 72 Minutes',
-        'sof_zman_krias_shema_gra': 'Sof Zman Krias Shema (GRA)',
-        'sof_zman_krias_shema_mga': 'Sof Zman Krias Shema (MGA)',
-        'sof_zman_tfila_gra': 'Sof Zman Tefillah (GRA)',
-        'sof_zman_tfila_mga': 'Sof Zman Tefillah (MGA)',
-        'candle_lighting': 'Candle Lighting',
-
-        # ========== ADDITIONAL ZMANIM TIMES (12 fields) ==========
-        'sea_level_sunrise': 'Sea Level Sunrise',
-        'sea_level_sunset': 'Sea Level Sunset',
-        'elevation_adjusted_sunrise': 'Elevation Adjusted Sunrise',
-        'elevation_adjusted_sunset': 'Elevation Adjusted Sunset',
-        'alos_16_1': 'Alos 16.1°',
-        'alos_18': 'Alos 18°',
-        'alos_19_8': 'Alos 19.8°',
-        'tzais_8_5': 'Tzais 8.5°',
-        'tzais_7_083': 'Tzais 7.083°',
-        'tzais_5_95': 'Tzais 5.95°',
-        'tzais_6_45': 'Tzais 6.45°',
-        'sun_transit': 'Sun Transit (Chatzos HaChamah)',
-
-        # ========== HALACHIC HOURS (3 fields) ==========
-        'shaah_zmanis_gra': 'Shaah Zmanis (GRA) - in minutes',
-        'shaah_zmanis_mga': 'Shaah Zmanis (MGA) - in minutes',
-        'temporal_hour': 'Temporal Hour - in minutes',
-
-        # ========== JEWISH CALENDAR - DATE INFO (5 fields) ==========
-        'jewish_year': 'Jewish Year',
-        'jewish_month': 'Jewish Month (Number)',
-        'jewish_month_name': 'Jewish Month Name',
-        'jewish_day': 'Jewish Day',
-        'day_of_week': 'Day of Week (1=Sunday, 7=Saturday)',
-
-        # ========== JEWISH CALENDAR - SPECIAL DAYS (3 fields) ==========
-        'significant_day': 'Significant Day (Holiday Name)',
-        'day_of_omer': 'Day of Omer',
-        'day_of_chanukah': 'Day of Chanukah',
-
-        # ========== JEWISH CALENDAR - BOOLEAN FLAGS (8 fields) ==========
-        'is_rosh_chodesh': 'Is Rosh Chodesh',
-        'is_yom_tov': 'Is Yom Tov',
-        'is_chol_hamoed': 'Is Chol HaMoed',
-        'is_erev_yom_tov': 'Is Erev Yom Tov',
-        'is_chanukah': 'Is Chanukah',
-        'is_taanis': 'Is Fast Day',
-        'is_assur_bemelacha': 'Is Assur Bemelacha',
-        'is_erev_rosh_chodesh': 'Is Erev Rosh Chodesh',
-
-        # ========== JEWISH CALENDAR - MOLAD (1 field) ==========
-        'molad_datetime': 'Molad (Date & Time)',
-
-        # ========== JEWISH CALENDAR - KIDDUSH LEVANA (3 fields) ==========
-        'kiddush_levana_earliest_3_days': 'Kiddush Levana Earliest (3 Days)',
-        'kiddush_levana_earliest_7_days': 'Kiddush Levana Earliest (7 Days)',
-        'kiddush_levana_latest_15_days': 'Kiddush Levana Latest (15 Days)',
-
-        # ========== BASIC LEARNING SCHEDULE (5 fields) ==========
-        'parsha': 'Parsha',
-        'daf_yomi_bavli': 'Daf Yomi Bavli',
-        'mishna_yomis': 'Mishna Yomis',
-        'tehillim_monthly': 'Tehillim Monthly',
-        'daf_yomi_yerushalmi': 'Daf Yomi Yerushalmi',
-
-        # ========== ADDITIONAL LEARNING SCHEDULES (3 fields) ==========
-        'pirkei_avos': 'Pirkei Avos',
-        'daf_hashavua_bavli': 'Daf HaShavua Bavli',
-        'amud_yomi_bavli_dirshu': 'Amud Yomi Bavli Dirshu',
-    }
+    available_fields = {field.name: field.label for field in ZMANIM_FIELDS}
 
     return Response(available_fields)
 
@@ -812,7 +546,13 @@ def master_admin_list_shuls(request):
     """Master admin: List all shuls"""
     shuls = Shul.objects.all().order_by('-created_at')
     serializer = ShulSerializer(shuls, many=True)
-    return Response(serializer.data)
+
+    # Live screen counts come from the display heartbeats in the cache
+    data = serializer.data
+    screens_online = count_screens_online([shul['id'] for shul in data])
+    for shul in data:
+        shul['screens_online'] = screens_online.get(shul['id'], 0)
+    return Response(data)
 
 
 @api_view(['GET'])
@@ -835,6 +575,7 @@ def master_admin_shul_detail(request, shul_id):
         'zmanim_records_future': DailyZmanim.objects.filter(shul=shul, date__gte=today).count(),
         'custom_times_count': CustomTime.objects.filter(shul=shul).count(),
         'custom_texts_count': CustomText.objects.filter(shul=shul).count(),
+        'screens_online': count_screens_online([shul.id])[shul.id],
         'admin_email': shul.admin.email,
         'admin_username': shul.admin.username,
     }
@@ -918,134 +659,136 @@ def master_admin_delete_shul(request, shul_id):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def shul_display_data(request, shul_slug):
-    """Get all display data for a specific shul's display screen"""
-    try:
-        shul = Shul.objects.get(slug=shul_slug, is_active=True)
-    except Shul.DoesNotExist:
-        return Response({'error': 'Shul not found or inactive'}, status=status.HTTP_404_NOT_FOUND)
+    """
+    Get all display data for a specific shul's display screen
+
+    Only the zmanim, calendar and limudim fields the shul's layout shows are
+    loaded and returned (see display_projection); ?full=1 returns all of
+    them for previews, cached as a separate entry so it costs no more than
+    a screen's poll.
+    """
+    import pytz
 
-    # Track display access (use timezone-aware UTC time)
-    from django.utils import timezone
-    shul.last_display_access = timezone.now()
-    shul.save(update_fields=['last_display_access'])
+    full = request.query_params.get('full') == '1'
+    variant = FULL_PAYLOAD if full else None
 
-    # Get current time in the shul's timezone
-    import pytz
-    tz = pytz.timezone(shul.timezone)
-    current_time = datetime.datetime.now(tz)
-    today = current_time.date()  # Use shul's local date, not server's date
+    # Cached payload for the shul's current local date (a single cache read)
+    entry, versions = get_display_payload(shul_slug, variant)
+
+    if entry is None:
+        try:
+            shul = Shul.objects.get(slug=shul_slug, is_active=True)
+        except Shul.DoesNotExist:
+            return Response({'error': 'Shul not found or inactive'}, status=status.HTTP_404_NOT_FOUND)
+
+        today = datetime.datetime.now(pytz.timezone(shul.timezone)).date()  # Use shul's local date, not server's date
+
+        from .models import ShulDisplayLayout
+        from .display_projection import get_projection
+        layout, created = ShulDisplayLayout.objects.get_or_create(shul=shul)
+        projection = None if full else get_projection(layout)
+
+        # Get today's zmanim from DailyZmanim table (calculated now if missing,
+        # so a screen never goes blank over a missing row)
+        from .zmanim_calculator import ZmanimCalculator
+        daily_zmanim = ZmanimCalculator.get_or_calculate_day(
+            shul, today, fields=projection.columns if projection else None
+        )
 
-    # Get today's zmanim from DailyZmanim table
-    daily_zmanim = DailyZmanim.objects.filter(shul=shul, date=today).first()
+        if not daily_zmanim:
+            return Response({'error': 'No zmanim data available for today'}, status=status.HTTP_404_NOT_FOUND)
+
+        payload = build_display_payload(shul, daily_zmanim, today, layout=layout, projection=projection)
+        entry = set_display_payload(shul, today, payload, versions, variant)
+
+    # Track display access - buffered in the cache, flushed to
+    # Shul.last_display_access by the flush_display_heartbeats task
+    # (previews are not screens)
+    if not full:
+        record_heartbeat(entry['shul_id'], get_screen_id(request))
+
+    # Screens poll constantly but the payload rarely changes - answer
+    # If-None-Match / If-Modified-Since with a 304 and no body
+    etag, last_modified = get_entry_validators(entry)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return _set_display_cache_headers(not_modified, etag, last_modified)
+
+    payload = entry['payload']
+    response = Response({
+        **payload,
+        'shul': _absolute_media_urls(request, payload['shul']),
+        'current_time': datetime.datetime.now(pytz.timezone(entry['timezone'])).isoformat(),
+    })
+    return _set_display_cache_headers(response, etag, last_modified)
 
-    if not daily_zmanim:
-        return Response({'error': 'No zmanim data available for today'}, status=status.HTTP_404_NOT_FOUND)
-
-    # Format zmanim data - BASIC ZMANIM
-    zmanim_data = {
-        'Alos HaShachar': format_value(daily_zmanim.alos, shul.time_format, shul.show_seconds, 'Alos HaShachar'),
-        'Neitz HaChamah': format_value(daily_zmanim.hanetz, shul.time_format, shul.show_seconds, 'Neitz HaChamah'),
-        'Chatzos': format_value(daily_zmanim.chatzos, shul.time_format, shul.show_seconds, 'Chatzos'),
-        'Mincha Gedola': format_value(daily_zmanim.mincha_gedola, shul.time_format, shul.show_seconds, 'Mincha Gedola'),
-        'Mincha Ketana': format_value(daily_zmanim.mincha_ketana, shul.time_format, shul.show_seconds, 'Mincha Ketana'),
-        'Plag HaMincha': format_value(daily_zmanim.plag_hamincha, shul.time_format, shul.show_seconds, 'Plag HaMincha'),
-        'Shkiah': format_value(daily_zmanim.shkia, shul.time_format, shul.show_seconds, 'Shkiah'),
-        'Tzais': format_value(daily_zmanim.tzais, shul.time_format, shul.show_seconds, 'Tzais'),
-        'Tzais 72 minutes': format_value(daily_zmanim.tzais_72, shul.time_format, shul.show_seconds, 'Tzais 72 minutes'),
-        'Sof Zman Krias Shema GRA': format_value(daily_zmanim.sof_zman_krias_shema_gra, shul.time_format, shul.show_seconds, 'Sof Zman Krias Shema GRA'),
-        'Sof Zman Krias Shema MGA': format_value(daily_zmanim.sof_zman_krias_shema_mga, shul.time_format, shul.show_seconds, 'Sof Zman Krias Shema MGA'),
-        'Sof Zman Tefillah GRA': format_value(daily_zmanim.sof_zman_tfila_gra, shul.time_format, shul.show_seconds, 'Sof Zman Tefillah GRA'),
-        'Sof Zman Tefillah MGA': format_value(daily_zmanim.sof_zman_tfila_mga, shul.time_format, shul.show_seconds, 'Sof Zman Tefillah MGA'),
-        'Candle Lighting': format_value(daily_zmanim.candle_lighting, shul.time_format, shul.show_seconds, 'Candle Lighting'),
-        # ADDITIONAL ZMANIM
-        'Sea Level Sunrise': format_value(daily_zmanim.sea_level_sunrise, shul.time_format, shul.show_seconds, 'Sea Level Sunrise'),
-        'Sea Level Sunset': format_value(daily_zmanim.sea_level_sunset, shul.time_format, shul.show_seconds, 'Sea Level Sunset'),
-        'Elevation Adjusted Sunrise': format_value(daily_zmanim.elevation_adjusted_sunrise, shul.time_format, shul.show_seconds, 'Elevation Adjusted Sunrise'),
-        'Elevation Adjusted Sunset': format_value(daily_zmanim.elevation_adjusted_sunset, shul.time_format, shul.show_seconds, 'Elevation Adjusted Sunset'),
-        'Alos 16.1°': format_value(daily_zmanim.alos_16_1, shul.time_format, shul.show_seconds, 'Alos 16.1°'),
-        'Alos 18°': format_value(daily_zmanim.alos_18, shul.time_format, shul.show_seconds, 'Alos 18°'),
-        'Alos 19.8°': format_value(daily_zmanim.alos_19_8, shul.time_format, shul.show_seconds, 'Alos 19.8°'),
-        'Tzais 8.5°': format_value(daily_zmanim.tzais_8_5, shul.time_format, shul.show_seconds, 'Tzais 8.5°'),
-        'Tzais 7.083°': format_value(daily_zmanim.tzais_7_083, shul.time_format, shul.show_seconds, 'Tzais 7.083°'),
-        'Tzais 5.95°': format_value(daily_zmanim.tzais_5_95, shul.time_format, shul.show_seconds, 'Tzais 5.95°'),
-        'Tzais 6.45°': format_value(daily_zmanim.tzais_6_45, shul.time_format, shul.show_seconds, 'Tzais 6.45°'),
-        'Sun Transit': format_value(daily_zmanim.sun_transit, shul.time_format, shul.show_seconds, 'Sun Transit'),
-        # HALACHIC HOURS
-        'Shaah Zmanis GRA': f"{(daily_zmanim.shaah_zmanis_gra / 60000):.1f} min" if daily_zmanim.shaah_zmanis_gra else None,
-        'Shaah Zmanis MGA': f"{(daily_zmanim.shaah_zmanis_mga / 60000):.1f} min" if daily_zmanim.shaah_zmanis_mga else None,
-        'Temporal Hour': f"{(daily_zmanim.temporal_hour / 60000):.1f} min" if daily_zmanim.temporal_hour else None,
-    }
 
-    # Add learning schedule - ALL LIMUDIM (8 fields)
-    limudim_data = {}
-    if daily_zmanim.parsha:
-        limudim_data['Parsha'] = daily_zmanim.parsha
-    if daily_zmanim.daf_yomi_bavli:
-        limudim_data['Daf Yomi Bavli'] = daily_zmanim.daf_yomi_bavli
-    if daily_zmanim.daf_yomi_yerushalmi:
-        limudim_data['Daf Yomi Yerushalmi'] = daily_zmanim.daf_yomi_yerushalmi
-    if daily_zmanim.mishna_yomis:
-        limudim_data['Mishna Yomis'] = daily_zmanim.mishna_yomis
-    if daily_zmanim.tehillim_monthly:
-        limudim_data['Tehillim Monthly'] = daily_zmanim.tehillim_monthly
-    if daily_zmanim.pirkei_avos:
-        limudim_data['Pirkei Avos'] = daily_zmanim.pirkei_avos
-    if daily_zmanim.daf_hashavua_bavli:
-        limudim_data['Daf HaShavua Bavli'] = daily_zmanim.daf_hashavua_bavli
-    if daily_zmanim.amud_yomi_bavli_dirshu:
-        limudim_data['Amud Yomi Bavli Dirshu'] = daily_zmanim.amud_yomi_bavli_dirshu
+def _absolute_media_urls(request, shul_data):
+    """Media is cached as relative URLs - the host depends on the request"""
+    shul_data = dict(shul_data)
+    for field in ('center_logo', 'background_image'):
+        if shul_data[field]:
+            shul_data[field] = request.build_absolute_uri(shul_data[field])
+    return shul_data
+
+
+def _set_display_cache_headers(response, etag, last_modified):
+    """Validators plus no-cache: clients may store the payload but must revalidate every poll"""
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def build_display_payload(shul, daily_zmanim, today, layout=None, projection=None):
+    """
+    Build the display payload for one shul and local date
+
+    Everything except current_time is fixed for the day, so the result is
+    cached by shul_display_data (see display_cache.py). Media fields are
+    relative URLs. With a DisplayProjection only its fields are included.
+    """
+    display_keys = projection.display_keys if projection else None
+
+    # Zmanim strings (BASIC, ADDITIONAL and HALACHIC HOURS), formatted at calculation time
+    zmanim_data = get_display_strings(daily_zmanim, shul, display_keys)
+
+    # LIMUDIM (those with a value today, names translated) and JEWISH CALENDAR
+    # DATA, formatted by the shul's precompiled formatter (see zmanim_fields)
+    formatter = shul_formatter(shul, display_keys)
+    translated_limudim = formatter.limudim(daily_zmanim)
+    jewish_calendar_data = formatter.jewish_calendar(daily_zmanim)
 
     # Apply translations based on shul language setting
     language = shul.language if shul.language else 'en'
 
-    # JEWISH CALENDAR DATA
-    # Translate month name
-    translated_month_name = daily_zmanim.jewish_month_name
-    if daily_zmanim.jewish_month_name:
-        month_name_lower = daily_zmanim.jewish_month_name.lower().replace(' ', '_')
-        translated_month_name = JEWISH_MONTH_NAMES.get(month_name_lower, {}).get(language, daily_zmanim.jewish_month_name)
-
-    jewish_calendar_data = {
-        'Jewish Year': daily_zmanim.jewish_year,
-        'Jewish Month': daily_zmanim.jewish_month,
-        'Jewish Month Name': translated_month_name,
-        'Jewish Day': daily_zmanim.jewish_day,
-        'Day of Week': ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'][daily_zmanim.day_of_week] if daily_zmanim.day_of_week is not None else None,
-        'Significant Day': daily_zmanim.significant_day if daily_zmanim.significant_day else None,
-        'Day of Omer': daily_zmanim.day_of_omer,
-        'Day of Chanukah': daily_zmanim.day_of_chanukah,
-        'Is Rosh Chodesh': daily_zmanim.is_rosh_chodesh,
-        'Is Yom Tov': daily_zmanim.is_yom_tov,
-        'Is Chol HaMoed': daily_zmanim.is_chol_hamoed,
-        'Is Erev Yom Tov': daily_zmanim.is_erev_yom_tov,
-        'Is Chanukah': daily_zmanim.is_chanukah,
-        'Is Fast Day': daily_zmanim.is_taanis,
-        'Is Assur Bemelacha': daily_zmanim.is_assur_bemelacha,
-        'Is Erev Rosh Chodesh': daily_zmanim.is_erev_rosh_chodesh,
-        'Molad': format_value(daily_zmanim.molad_datetime, shul.time_format, shul.show_seconds, 'Molad') if daily_zmanim.molad_datetime else None,
-        'Kiddush Levana Earliest (3 Days)': format_value(daily_zmanim.kiddush_levana_earliest_3_days, shul.time_format, shul.show_seconds, 'Kiddush Levana Earliest (3 Days)') if daily_zmanim.kiddush_levana_earliest_3_days else None,
-        'Kiddush Levana Earliest (7 Days)': format_value(daily_zmanim.kiddush_levana_earliest_7_days, shul.time_format, shul.show_seconds, 'Kiddush Levana Earliest (7 Days)') if daily_zmanim.kiddush_levana_earliest_7_days else None,
-        'Kiddush Levana Latest (15 Days)': format_value(daily_zmanim.kiddush_levana_latest_15_days, shul.time_format, shul.show_seconds, 'Kiddush Levana Latest (15 Days)') if daily_zmanim.kiddush_levana_latest_15_days else None,
-    }
-
     # Get custom times for today (using DailyZmanim instead of Shul fields)
     weekday = today.weekday()
     # Convert Python weekday (0=Monday) to our model format (0=Sunday)
     day_of_week = (weekday + 1) % 7
 
-    from django.db import models
-    # Get all custom times for this shul - we'll filter by day in calculate_time method
-    custom_times = CustomTime.objects.filter(shul=shul)
+    # Get all custom times for this shul - materialized occurrences are
+    # already resolved; anything not materialized yet is evaluated here
+    # (calculate_many filters by day and loads other dates' zmanim in one query)
+    custom_times = list(CustomTime.objects.filter(shul=shul))
+    occurrences = get_occurrences(shul, today)
+    calculated_times = {
+        custom_time_id: occurrence.time
+        for custom_time_id, occurrence in occurrences.items()
+    }
+    unresolved = [custom_time for custom_time in custom_times if custom_time.id not in occurrences]
+    if unresolved:
+        for custom_time_id, value in CustomTime.calculate_many(unresolved, today, {today: daily_zmanim}).items():
+            calculated_times[custom_time_id] = value.time() if value else None
 
     custom_times_data = []
     for custom_time in custom_times:
-        # Note: Custom times will need updating to use DailyZmanim instead of Shul fields
-        calculated_time = custom_time.calculate_time(today)
+        calculated_time = calculated_times[custom_time.id]
         if calculated_time:
             custom_times_data.append({
                 'internal_name': custom_time.internal_name,
                 'display_name': custom_time.display_name,
-                'time': format_value(calculated_time.time(), shul.time_format, shul.show_seconds),
+                'time': format_value(calculated_time, shul.time_format, shul.show_seconds),
                 'is_daily': custom_time.daily
             })
 
@@ -1083,42 +826,27 @@ def shul_display_data(request, shul_slug):
             formatted_hebrew_date = f"{daily_zmanim.jewish_day} {translated_month} {daily_zmanim.jewish_year}"
 
     # Create display name translations (keep original keys for lookup)
-    zmanim_display_names = {key: translate_term(key, language) for key in zmanim_data.keys()}
-    limudim_display_names = {key: translate_term(key, language) for key in limudim_data.keys()}
-    calendar_display_names = {key: translate_term(key, language) for key in jewish_calendar_data.keys()}
-
-    # Translate tractate names in Daf Yomi values
-    translated_limudim = {}
-    for key, value in limudim_data.items():
-        if key in ['Daf Yomi Bavli', 'Daf Yomi Yerushalmi', 'Daf HaShavua Bavli'] and value:
-            translated_limudim[key] = translate_daf_yomi(value, language)
-        elif key == 'Amud Yomi Bavli Dirshu' and value:
-            translated_limudim[key] = translate_amud_yomi(value, language)
-        elif key == 'Mishna Yomis' and value:
-            translated_limudim[key] = translate_mishna_yomis(value, language)
-        elif key == 'Tehillim Monthly' and value:
-            translated_limudim[key] = translate_tehillim(value, language)
-        elif key == 'Parsha' and value:
-            translated_limudim[key] = translate_parsha(value, language)
-        else:
-            translated_limudim[key] = value
+    zmanim_display_names = formatter.names(zmanim_data)
+    limudim_display_names = formatter.names(translated_limudim)
+    calendar_display_names = formatter.names(jewish_calendar_data)
 
     # Get global memorial boxes (applies to all shuls)
     global_memorial = GlobalMemorialBoxes.get_instance()
 
     # Get layout configuration for this shul
-    from .models import ShulDisplayLayout
-    layout_obj, created = ShulDisplayLayout.objects.get_or_create(shul=shul)
-    layout_config = layout_obj.layout_config if layout_obj.layout_config else {}
+    if layout is None:
+        from .models import ShulDisplayLayout
+        layout, created = ShulDisplayLayout.objects.get_or_create(shul=shul)
+    layout_config = layout.layout_config if layout.layout_config else {}
 
-    return Response({
+    return {
         'shul': {
             'name': shul.name,
             'language': shul.language,
             'time_format': shul.time_format,
             'show_seconds': shul.show_seconds,
             'timezone': shul.timezone,
-            'center_logo': request.build_absolute_uri(shul.center_logo.url) if shul.center_logo else None,
+            'center_logo': shul.center_logo.url if shul.center_logo else None,
             'center_logo_size': shul.center_logo_size,
             'center_text': shul.center_text,
             'center_text_size': shul.center_text_size,
@@ -1154,7 +882,7 @@ def shul_display_data(request, shul_slug):
             # Background customization
             'background_type': shul.background_type,
             'background_color': shul.background_color,
-            'background_image': request.build_absolute_uri(shul.background_image.url) if shul.background_image else None,
+            'background_image': shul.background_image.url if shul.background_image else None,
             # Global memorial boxes (shared across all shuls)
             'ilui_nishmat': global_memorial.ilui_nishmat,
             'refuah_shleima': global_memorial.refuah_shleima
@@ -1169,9 +897,8 @@ def shul_display_data(request, shul_slug):
         'custom_times': custom_times_data,
         'custom_texts': custom_texts_data,
         'layout': layout_config,
-        'current_time': current_time.isoformat(),
         'last_updated': daily_zmanim.updated_at.isoformat() if daily_zmanim.updated_at else None
-    })
+    }
 
 
 # ========== REGISTRATION APPROVAL WORKFLOW API ==========
@@ -1,159 +1,208 @@
+from collections import defaultdict
 from datetime import date, timedelta
-from .models import Shul, DailyZmanim
-from .get_daily_zmanim import get_daily_zmanim
-from .custom_zmanim_calculations import get_custom_zmanim
-from zmanim.util.geo_location import GeoLocation
-from zmanim.zmanim_calendar import ZmanimCalendar
-from zmanim.hebrew_calendar.jewish_calendar import JewishCalendar
+from .models import Shul, DailyZmanim, MonthlyZmanimBlob
+from .calendar_days import get_calendar_days
+from .solar_engine import SOLAR_FIELDS
+from .solar_memo import get_solar_range
+from .solar_buckets import calculate_shared_solar_ranges
+from .display_cache import invalidate_shul_display
+from .display_strings import apply_display_strings, shul_format_key
+from .packed_times import TIME_COLUMNS, compact_times_enabled, compact_row
+from .monthly_blobs import invalidate_month_blobs
+from .partitions import month_start
+from .custom_time_occurrences import materialize_occurrences, WEEKLY_TARGET_LOOKAHEAD
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min, Max, Count
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 500
+
+# Columns rewritten when a (shul, date) row already exists
+UPSERT_FIELDS = TIME_COLUMNS + ['calendar_day', 'display_strings', 'display_strings_format', 'updated_at']
+
+# Read-through day calculation: how long one request may hold a day's lock,
+# and how long other requests wait for it before giving up
+DAY_LOCK_TIMEOUT = 60
+DAY_LOCK_WAIT = 10
+DAY_LOCK_POLL_INTERVAL = 0.2
+
 
 class ZmanimCalculator:
     """Calculate and store zmanim for date ranges"""
 
     @staticmethod
-    def calculate_date_range(shul, start_date, end_date):
+    def calculate_date_range(shul, start_date, end_date, progress_callback=None, solar_days=None):
         """
-        Calculate zmanim for a date range and bulk insert to database
+        Calculate zmanim for a date range and upsert them to the database
 
         Args:
             shul: Shul model instance
             start_date: datetime.date
             end_date: datetime.date
+            progress_callback: Optional callable(days_done, days_total)
+            solar_days: Solar zmanim already calculated for the range
+                (e.g. shared with nearby shuls, see solar_buckets)
 
         Returns:
-            Number of records created
+            Number of records calculated (unchanged rows are not rewritten)
         """
         logger.info(f"Calculating zmanim for {shul.name} from {start_date} to {end_date}")
 
-        records_to_create = []
-        current_date = start_date
+        # Hebrew calendar and limudim are shared by all shuls - only
+        # calculated here for dates nobody has calculated yet
+        # (the slow part when dates are new, so it drives progress reporting)
+        calendar_days = get_calendar_days(start_date, end_date, in_israel=False, progress_callback=progress_callback)
+
+        # All solar zmanim for the whole range in one pass (cached per location and date)
+        if solar_days is None:
+            solar_days = get_solar_range(
+                shul.latitude,
+                shul.longitude,
+                shul.timezone,
+                start_date,
+                end_date,
+                name=shul.name
+            )
+        else:
+            solar_days = {
+                current_date: values for current_date, values in solar_days.items()
+                if start_date <= current_date <= end_date
+            }
+
+        records_to_create = ZmanimCalculator.build_records(shul, solar_days, calendar_days)
+
+        # Upsert - only rows that are new or whose values changed are written
+        written = ZmanimCalculator.store_records(shul, records_to_create)
+
+        if written:
+            # Custom times read these rows - re-resolve them, including the
+            # days just before the range whose weekly target falls inside it
+            first_stored_date = DailyZmanim.objects.filter(shul=shul).aggregate(first=Min('date'))['first']
+            materialize_occurrences(
+                shul,
+                max(start_date - timedelta(days=WEEKLY_TARGET_LOOKAHEAD), first_stored_date),
+                end_date
+            )
 
-        while current_date <= end_date:
-            try:
-                # Calculate basic zmanim for this date
-                zmanim = get_daily_zmanim(
-                    shul.latitude,
-                    shul.longitude,
-                    shul.timezone,
-                    target_date=current_date,
-                    name=shul.name
-                )
+            # DailyZmanim has no signals (bulk writes) - drop the cached display payload here
+            invalidate_shul_display(shul.slug)
 
-                # Calculate learning schedule
-                limudim = get_custom_zmanim(current_date, in_israel=False)
-
-                # Create ZmanimCalendar and JewishCalendar for additional fields
-                location = GeoLocation(shul.name, shul.latitude, shul.longitude, shul.timezone)
-                zc = ZmanimCalendar(geo_location=location, date=current_date)
-                jc = JewishCalendar()
-                jc.set_gregorian_date(current_date.year, current_date.month, current_date.day)
-
-                # Helper to convert datetime to time, handling None
-                def to_time(dt):
-                    return dt.time() if dt else None
-
-                # Create DailyZmanim record with ALL fields
-                daily_zmanim = DailyZmanim(
-                    shul=shul,
-                    date=current_date,
-
-                    # Basic zmanim times (14 fields)
-                    alos=to_time(zmanim.get('alos')),
-                    hanetz=to_time(zmanim.get('hanetz')),
-                    chatzos=to_time(zmanim.get('chatzos')),
-                    mincha_gedola=to_time(zmanim.get('mincha_gedola')),
-                    mincha_ketana=to_time(zmanim.get('mincha_ketana')),
-                    plag_hamincha=to_time(zmanim.get('plag_hamincha')),
-                    shkia=to_time(zmanim.get('shkia')),
-                    tzais=to_time(zmanim.get('tzais')),
-                    tzais_72=to_time(zmanim.get('tzais_72')),
-                    sof_zman_krias_shema_gra=to_time(zmanim.get('sof_zman_krias_shema_gra')),
-                    sof_zman_krias_shema_mga=to_time(zmanim.get('sof_zman_krias_shema_mga')),
-                    sof_zman_tfila_gra=to_time(zmanim.get('sof_zman_tfila_gra')),
-                    sof_zman_tfila_mga=to_time(zmanim.get('sof_zman_tfila_mga')),
-                    candle_lighting=to_time(zmanim.get('candle_lighting')),
-
-                    # Additional zmanim times (12 fields)
-                    sea_level_sunrise=to_time(zc.sea_level_sunrise()),
-                    sea_level_sunset=to_time(zc.sea_level_sunset()),
-                    elevation_adjusted_sunrise=to_time(zc.elevation_adjusted_sunrise()),
-                    elevation_adjusted_sunset=to_time(zc.elevation_adjusted_sunset()),
-                    alos_16_1=to_time(zc.alos({'degrees': 16.1})),
-                    alos_18=to_time(zc.alos({'degrees': 18})),
-                    alos_19_8=to_time(zc.alos({'degrees': 19.8})),
-                    tzais_8_5=to_time(zc.tzais({'degrees': 8.5})),
-                    tzais_7_083=to_time(zc.tzais({'degrees': 7.083})),
-                    tzais_5_95=to_time(zc.tzais({'degrees': 5.95})),
-                    tzais_6_45=to_time(zc.tzais({'degrees': 6.45})),
-                    sun_transit=to_time(zc.sun_transit()),
-
-                    # Halachic hours (3 fields)
-                    shaah_zmanis_gra=zc.shaah_zmanis_gra(),
-                    shaah_zmanis_mga=zc.shaah_zmanis_mga(),
-                    temporal_hour=zc.temporal_hour(),
-
-                    # Jewish calendar - date info (5 fields)
-                    jewish_year=jc.jewish_year,
-                    jewish_month=jc.jewish_month,
-                    jewish_month_name=jc.jewish_month_name(),
-                    jewish_day=jc.jewish_day,
-                    day_of_week=jc.day_of_week,
-
-                    # Jewish calendar - special days (3 fields)
-                    significant_day=jc.significant_day() or '',
-                    day_of_omer=jc.day_of_omer(),
-                    day_of_chanukah=jc.day_of_chanukah(),
-
-                    # Jewish calendar - boolean flags (8 fields)
-                    is_rosh_chodesh=jc.is_rosh_chodesh(),
-                    is_yom_tov=jc.is_yom_tov(),
-                    is_chol_hamoed=jc.is_chol_hamoed(),
-                    is_erev_yom_tov=jc.is_erev_yom_tov(),
-                    is_chanukah=jc.is_chanukah(),
-                    is_taanis=jc.is_taanis(),
-                    is_assur_bemelacha=jc.is_assur_bemelacha(),
-                    is_erev_rosh_chodesh=jc.is_erev_rosh_chodesh(),
-
-                    # Jewish calendar - molad (1 field)
-                    molad_datetime=jc.molad_as_datetime(),
-
-                    # Jewish calendar - kiddush levana (3 fields)
-                    kiddush_levana_earliest_3_days=jc.techilas_zman_kiddush_levana_3_days(),
-                    kiddush_levana_earliest_7_days=jc.techilas_zman_kiddush_levana_7_days(),
-                    kiddush_levana_latest_15_days=jc.sof_zman_kiddush_levana_15_days(),
-
-                    # Basic learning schedule (5 fields)
-                    parsha=limudim.get('parsha', ''),
-                    daf_yomi_bavli=limudim.get('dafyomibavli', ''),
-                    mishna_yomis=limudim.get('mishnayomis', ''),
-                    tehillim_monthly=limudim.get('tehillimmonthly', ''),
-                    daf_yomi_yerushalmi=limudim.get('DafYomiYerushalmi', ''),
-
-                    # Additional learning schedules (3 fields)
-                    pirkei_avos=limudim.get('pirkeiavos', ''),
-                    daf_hashavua_bavli=limudim.get('dafhashavuabavli', ''),
-                    amud_yomi_bavli_dirshu=limudim.get('amudyomibavlidirshu', ''),
-                )
+        if progress_callback:
+            days_total = (end_date - start_date).days + 1
+            progress_callback(days_total, days_total)
 
-                records_to_create.append(daily_zmanim)
+        logger.info(f"Calculated {len(records_to_create)} zmanim records for {shul.name} ({written} new or changed)")
+        return len(records_to_create)
 
-            except Exception as e:
-                logger.error(f"Error calculating zmanim for {current_date}: {str(e)}")
+    @staticmethod
+    def store_records(shul, records):
+        """
+        Upsert DailyZmanim rows on (shul, date), skipping unchanged rows
 
-            current_date += timedelta(days=1)
+        Existing rows are updated in place (INSERT ... ON CONFLICT DO UPDATE),
+        so a recalculation never leaves a window without data for live
+        displays, and rows whose values did not change are not rewritten
+        (a row whose display strings are in another format, or that is
+        stored compact/uncompacted while the setting says otherwise, has changed).
 
-        # Bulk insert (much faster than individual saves)
-        if records_to_create:
+        Returns:
+            Number of rows inserted or updated
+        """
+        if not records:
+            return 0
+
+        existing = {
+            row.date: row
+            for row in DailyZmanim.objects.select_related(None).filter(
+                shul=shul,
+                date__range=[records[0].date, records[-1].date]
+            ).only('date', 'calendar_day_id', 'display_strings_format', *TIME_COLUMNS)
+        }
+
+        def changed(record):
+            current = existing.get(record.date)
+            if current is None:
+                return True
+            if current.display_strings_format != record.display_strings_format:
+                return True
+            if current.calendar_day_id != record.calendar_day_id or current.packed_times != record.packed_times:
+                return True
+            # Compact records carry their values in packed_times only
+            return record.packed_times is None and any(
+                getattr(current, field) != getattr(record, field) for field in SOLAR_FIELDS
+            )
+
+        to_write = [record for record in records if changed(record)]
+        if to_write:
             DailyZmanim.objects.bulk_create(
-                records_to_create,
-                ignore_conflicts=True  # Skip if already exists
+                to_write,
+                update_conflicts=True,
+                unique_fields=['shul', 'date'],
+                update_fields=UPSERT_FIELDS,
+                batch_size=UPSERT_BATCH_SIZE,
             )
+            invalidate_month_blobs(shul.id, to_write[0].date, to_write[-1].date)
+        return len(to_write)
 
-        logger.info(f"Created {len(records_to_create)} zmanim records for {shul.name}")
-        return len(records_to_create)
+    @staticmethod
+    def build_records(shul, solar_days, calendar_days):
+        """
+        Build unsaved DailyZmanim rows from calculated solar zmanim
+
+        Args:
+            shul: Shul model instance
+            solar_days: Dict of date -> solar zmanim (from calculate_solar_range)
+            calendar_days: Dict of date -> JewishCalendarDay
+
+        Returns:
+            List of DailyZmanim instances (with their display strings, or
+            packed without them with ZMANIM_COMPACT_TIMES), ordered by date
+        """
+        compact = compact_times_enabled()
+        records = []
+        for current_date, values in sorted(solar_days.items()):
+            record = DailyZmanim(
+                shul=shul,
+                date=current_date,
+                calendar_day=calendar_days.get(current_date),
+                **{field: values.get(field) for field in SOLAR_FIELDS}
+            )
+            records.append(compact_row(record) if compact else apply_display_strings(record, shul))
+        return records
+
+    @staticmethod
+    def refresh_display_strings(shul, from_date=None):
+        """
+        Re-format stored rows whose display strings are not in the shul's
+        current time_format/show_seconds (after a settings change)
+
+        Only the display strings are rewritten; nothing is recalculated.
+        Compact rows store no display strings and are skipped.
+
+        Returns:
+            Number of rows updated
+        """
+        rows = DailyZmanim.objects.select_related(None).filter(shul=shul, packed_times__isnull=True).exclude(
+            display_strings_format=shul_format_key(shul)
+        ).only('date', 'display_strings', 'display_strings_format', *TIME_COLUMNS)
+        if from_date:
+            rows = rows.filter(date__gte=from_date)
+
+        rows = [apply_display_strings(row, shul) for row in rows]
+        if rows:
+            DailyZmanim.objects.bulk_update(
+                rows, ['display_strings', 'display_strings_format'], batch_size=UPSERT_BATCH_SIZE
+            )
+            invalidate_shul_display(shul.slug)
+
+        logger.info(f"Refreshed display strings of {len(rows)} zmanim records for {shul.name}")
+        return len(rows)
 
     @staticmethod
     def calculate_single_day(shul, target_date):
@@ -173,16 +222,290 @@ class ZmanimCalculator:
     def recalculate_from_date(shul, from_date=None):
         """
         Recalculate zmanim from a specific date (e.g., after coordinate change)
-        Deletes existing data from that date forward and recalculates
+        Upserts 6 months from that date; rows past the new range are dropped
         """
         if from_date is None:
             from_date = date.today()
 
         logger.info(f"Recalculating zmanim for {shul.name} from {from_date}")
 
-        # Delete existing records from this date forward
-        deleted_count, _ = DailyZmanim.objects.filter(shul=shul, date__gte=from_date).delete()
-        logger.info(f"Deleted {deleted_count} existing records")
+        # Recalculate 6 months forward, updating existing rows in place
+        count = ZmanimCalculator.calculate_six_months(shul, from_date)
+
+        # Anything beyond the recalculated range still has the old values
+        end_date = from_date + timedelta(days=180)
+        deleted_count, _ = DailyZmanim.objects.filter(shul=shul, date__gt=end_date).delete()
+        if deleted_count:
+            MonthlyZmanimBlob.objects.filter(shul=shul, month__gte=month_start(end_date)).delete()
+            invalidate_shul_display(shul.slug)
+            logger.info(f"Deleted {deleted_count} records past {end_date}")
+
+        return count
+
+    @staticmethod
+    def find_incomplete_shuls(start_date, end_date):
+        """
+        Find every active shul missing any date in a range, in one query
+
+        Returns:
+            Dict of shul_id -> number of missing days (complete shuls are left out)
+        """
+        expected_days = (end_date - start_date).days + 1
+        horizons = {
+            row['shul']: row
+            for row in DailyZmanim.objects.filter(
+                shul__is_active=True,
+                date__range=[start_date, end_date]
+            ).order_by().values('shul').annotate(last_date=Max('date'), days=Count('date'))
+        }
+
+        incomplete = {}
+        for shul_id in Shul.objects.filter(is_active=True).values_list('id', flat=True):
+            horizon = horizons.get(shul_id)
+            if horizon is None:
+                incomplete[shul_id] = expected_days
+            elif horizon['last_date'] < end_date or horizon['days'] < expected_days:
+                incomplete[shul_id] = expected_days - horizon['days']
+        return incomplete
+
+    @staticmethod
+    def fill_missing_dates(shul, start_date, end_date):
+        """
+        Calculate only the dates in a range that have no DailyZmanim row yet
+
+        Dates before the shul's local today are skipped (cleanup removes them).
+        Each run of consecutive missing dates is calculated in one batch.
+
+        Returns:
+            Number of days calculated
+        """
+        start_date = max(start_date, ZmanimCalculator.local_today(shul))
+        existing = set(DailyZmanim.objects.filter(
+            shul=shul,
+            date__range=[start_date, end_date]
+        ).values_list('date', flat=True))
+        runs = ZmanimCalculator._missing_runs(start_date, end_date, existing)
+
+        count = 0
+        for run_start, run_end in runs:
+            count += ZmanimCalculator.calculate_date_range(shul, run_start, run_end)
+
+        if count:
+            logger.info(f"Filled {count} missing days for {shul.name} in {len(runs)} ranges")
+        return count
 
-        # Recalculate 6 months forward
-        return ZmanimCalculator.calculate_six_months(shul, from_date)
+    @staticmethod
+    def fill_missing_dates_for_shuls(shuls, start_date, end_date):
+        """
+        fill_missing_dates() for several shuls, sharing the solar calculation
+        between shuls at nearly the same location (see solar_buckets)
+
+        Returns:
+            (days calculated, stats from calculate_shared_solar_ranges)
+        """
+        start_dates = {shul.id: max(start_date, ZmanimCalculator.local_today(shul)) for shul in shuls}
+        existing = defaultdict(set)
+        for shul_id, existing_date in DailyZmanim.objects.filter(
+            shul__in=shuls,
+            date__range=[min(start_dates.values()), end_date]
+        ).values_list('shul_id', 'date'):
+            existing[shul_id].add(existing_date)
+
+        runs = {
+            shul.id: ZmanimCalculator._missing_runs(start_dates[shul.id], end_date, existing[shul.id])
+            for shul in shuls
+        }
+        shuls = [shul for shul in shuls if runs[shul.id]]
+        if not shuls:
+            return 0, None
+
+        # One solar range covering every shul's gaps
+        solar_start = min(runs[shul.id][0][0] for shul in shuls)
+        solar_end = max(runs[shul.id][-1][1] for shul in shuls)
+        solar_by_shul, stats = calculate_shared_solar_ranges(
+            {shul.id: (shul.latitude, shul.longitude, shul.timezone) for shul in shuls},
+            solar_start,
+            solar_end
+        )
+
+        count = 0
+        for shul in shuls:
+            for run_start, run_end in runs[shul.id]:
+                count += ZmanimCalculator.calculate_date_range(
+                    shul, run_start, run_end, solar_days=solar_by_shul[shul.id]
+                )
+
+        logger.info(
+            f"Filled {count} missing days for {len(shuls)} shuls with {stats['calculations']} solar days calculated "
+            f"({stats['sample_calculations']} for sampling, {stats['saved']} saved, "
+            f"max error on the sampled dates {stats['max_error_seconds']:.1f}s)"
+        )
+        return count, stats
+
+    @staticmethod
+    def _missing_runs(start_date, end_date, existing_dates):
+        """Consecutive [first, last] date ranges between start and end that are not in existing_dates"""
+        runs = []
+        current_date = start_date
+        while current_date <= end_date:
+            if current_date not in existing_dates:
+                if runs and runs[-1][1] == current_date - timedelta(days=1):
+                    runs[-1][1] = current_date
+                else:
+                    runs.append([current_date, current_date])
+            current_date += timedelta(days=1)
+        return runs
+
+    @staticmethod
+    def refresh_shul(shul, progress_callback=None):
+        """
+        Recalculate 6 months from the shul's local today (manual refresh)
+
+        Returns:
+            Summary dict for the API response
+        """
+        today = ZmanimCalculator.local_today(shul)
+        end_date = today + timedelta(days=180)  # 6 months
+
+        # Delete all past records (before today)
+        DailyZmanim.objects.filter(shul=shul, date__lt=today).delete()
+        MonthlyZmanimBlob.objects.filter(shul=shul, month__lte=month_start(today)).delete()
+        invalidate_shul_display(shul.slug)
+
+        # Recalculate - existing rows in the range are updated in place
+        count = ZmanimCalculator.calculate_date_range(shul, today, end_date, progress_callback)
+
+        return {
+            'message': 'Recalculated zmanim for 6 months',
+            'start_date': today.isoformat(),
+            'end_date': end_date.isoformat(),
+            'records_created': count
+        }
+
+    @staticmethod
+    def extend_shul(shul, progress_callback=None):
+        """
+        Extend zmanim forward to 6 months from the shul's local today
+
+        Returns:
+            Summary dict for the API response
+        """
+        today = ZmanimCalculator.local_today(shul)
+        target_end_date = today + timedelta(days=180)  # 6 months from today
+
+        # Find last date we have data for
+        last_record = DailyZmanim.objects.filter(shul=shul).order_by('-date').first()
+
+        if last_record and last_record.date >= target_end_date:
+            return {
+                'message': 'Already have 6 months of zmanim data',
+                'last_date': last_record.date.isoformat(),
+                'target_date': target_end_date.isoformat(),
+                'records_created': 0
+            }
+
+        if last_record:
+            # Start from day after last record
+            start_date = last_record.date + timedelta(days=1)
+            days_missing = (target_end_date - last_record.date).days
+        else:
+            # No data exists, start from today
+            start_date = today
+            days_missing = 180
+
+        # Calculate missing zmanim up to 6 months from today
+        count = ZmanimCalculator.calculate_date_range(shul, start_date, target_end_date, progress_callback)
+
+        return {
+            'message': 'Extended zmanim to ensure 6 months from today',
+            'start_date': start_date.isoformat(),
+            'end_date': target_end_date.isoformat(),
+            'records_created': count,
+            'days_added': days_missing,
+            'last_date_before': last_record.date.isoformat() if last_record else None,
+            'last_date_after': target_end_date.isoformat()
+        }
+
+    @staticmethod
+    def onboard_shul(shul):
+        """
+        Initial zmanim for a newly registered shul
+
+        Only the first ZMANIM_ONBOARDING_INLINE_DAYS days are calculated in
+        the request, enough for the display to work straight away; the rest
+        of the 6 months is queued for a background task once the shul is
+        committed.
+
+        Returns:
+            Number of days calculated inline
+        """
+        from .tasks import fill_missing_zmanim
+
+        start_date = ZmanimCalculator.local_today(shul)
+        inline_days = getattr(settings, 'ZMANIM_ONBOARDING_INLINE_DAYS', 3)
+        end_date = start_date + timedelta(days=180)
+
+        count = ZmanimCalculator.calculate_date_range(shul, start_date, start_date + timedelta(days=inline_days - 1))
+
+        transaction.on_commit(lambda: fill_missing_zmanim.delay(
+            [shul.id], start_date.isoformat(), end_date.isoformat()
+        ))
+        return count
+
+    @staticmethod
+    def get_or_calculate_day(shul, target_date, fields=None):
+        """
+        DailyZmanim row for a date, calculated and stored on the spot if missing
+
+        Only one request calculates a missing day (cache lock); concurrent
+        ones wait for its row. The rest of the shul's horizon is queued for
+        the background. Disabled with ZMANIM_READ_THROUGH = False.
+
+        Args:
+            fields: Optional columns to load (.only()), e.g. a display projection
+
+        Returns:
+            DailyZmanim instance, or None if it could not be calculated
+        """
+        rows = DailyZmanim.objects.filter(shul=shul, date=target_date)
+        if fields:
+            rows = rows.only(*fields)
+
+        daily_zmanim = rows.first()
+        if daily_zmanim or not getattr(settings, 'ZMANIM_READ_THROUGH', True):
+            return daily_zmanim
+
+        lock_key = f'zmanim:day:lock:{shul.id}:{target_date.isoformat()}'
+        if cache.add(lock_key, 1, timeout=DAY_LOCK_TIMEOUT):
+            try:
+                logger.warning(f"No zmanim for {shul.name} on {target_date} - calculating on demand")
+                ZmanimCalculator.calculate_date_range(shul, target_date, target_date)
+            except Exception as e:
+                logger.error(f"On-demand zmanim calculation for {shul.name} on {target_date} failed: {str(e)}")
+            else:
+                transaction.on_commit(lambda: ZmanimCalculator._queue_fill(shul, target_date))
+            finally:
+                cache.delete(lock_key)
+        else:
+            # Another request is calculating this day - wait for its row
+            deadline = time.monotonic() + DAY_LOCK_WAIT
+            while cache.get(lock_key) and time.monotonic() < deadline:
+                time.sleep(DAY_LOCK_POLL_INTERVAL)
+
+        return rows.first()
+
+    @staticmethod
+    def _queue_fill(shul, target_date):
+        """Queue the rest of the horizon after an on-demand day (never fails the request)"""
+        from .tasks import fill_missing_zmanim
+        try:
+            fill_missing_zmanim.delay([shul.id], target_date.isoformat(), (target_date + timedelta(days=180)).isoformat())
+        except Exception as e:
+            logger.error(f"Could not queue the zmanim fill for {shul.name} from {target_date}: {str(e)}")
+
+    @staticmethod
+    def local_today(shul):
+        """Today's date in the shul's timezone, not the server's"""
+        import pytz
+        from datetime import datetime
+        return datetime.now(pytz.timezone(shul.timezone)).date()
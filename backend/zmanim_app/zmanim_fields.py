@@ -0,0 +1,335 @@
+"""
+Registry of the DailyZmanim fields: where each comes from and how it is shown
+
+Every field a shul can see is described once in FIELDS:
+
+    name         DailyZmanim attribute (calendar and limudim fields are read
+                 through calendar_day)
+    display_key  key in the display / get_zmanim payload, also the
+                 translate_term() key of its label
+    kind         TIME, DATETIME, HOURS, TEXT, NUMBER, FLAG or WEEKDAY
+    section      ZMANIM, CALENDAR or LIMUDIM (payload section)
+    label        label in the custom time / layout editors (get_available_base_times)
+    source       SOLAR for fields produced by solar_engine, otherwise
+                 callable(CalendarSource) used by calculate_calendar_day
+    rounding     'up', 'down' or 'nearest' when seconds are hidden
+    translate    callable(value, language) for translated values, or None
+
+get_formatter() turns the registry into a ShulFormatter for one
+(time_format, show_seconds, language): the rounding rule, format string and
+translations of every field are resolved once and kept per process, so
+formatting a row is a loop over prepared (key, getter, function) steps.
+Adding a field means adding it here (and to the models / solar_engine
+calculation that produces it).
+"""
+from collections import namedtuple
+from datetime import time as dt_time, datetime
+from functools import lru_cache
+from operator import attrgetter
+from .custom_zmanim_calculations import (
+    get_daf_yomi_bavli,
+    get_mishna_yomis,
+    get_tehillim_monthly,
+    get_daf_yomi_yerushalmi,
+    get_pirkei_avos,
+    get_daf_hashavua_bavli,
+    get_amud_yomi_bavli_dirshu,
+)
+from .translations import (
+    translate_term,
+    translate_daf_yomi,
+    translate_parsha,
+    translate_mishna_yomis,
+    translate_tehillim,
+    translate_amud_yomi,
+    JEWISH_MONTH_NAMES,
+)
+
+# Kinds
+TIME = 'time'
+DATETIME = 'datetime'
+HOURS = 'hours'
+TEXT = 'text'
+NUMBER = 'number'
+FLAG = 'flag'
+WEEKDAY = 'weekday'
+
+# Sections
+ZMANIM = 'zmanim'
+CALENDAR = 'jewish_calendar'
+LIMUDIM = 'limudim'
+
+# Source of the fields calculated by solar_engine
+SOLAR = 'solar'
+
+ZmanimField = namedtuple(
+    'ZmanimField',
+    ['name', 'display_key', 'kind', 'section', 'label', 'source', 'rounding', 'translate'],
+    defaults=[None, None]
+)
+
+# What calculate_calendar_day gives the calendar field sources for one date
+CalendarSource = namedtuple('CalendarSource', ['date', 'in_israel', 'jc', 'year_day'])
+
+WEEKDAY_NAMES = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+
+def get_rounding_direction(field_name):
+    """Determine rounding direction for a field based on halachic stringency"""
+    field_lower = field_name.lower()
+
+    # Round DOWN (truncate) - Latest times (deadlines)
+    round_down_fields = [
+        'sof zman', 'candle lighting', 'kiddush levana latest'
+    ]
+    if any(field in field_lower for field in round_down_fields):
+        return 'down'
+
+    # Round UP (ceiling) - Earliest times
+    round_up_fields = [
+        'alos', 'netz', 'neitz', 'sunrise', 'mincha gedola', 'mincha ketana',
+        'plag', 'tzais', 'tzeis', 'tzeit', 'kiddush levana earliest'
+    ]
+    if any(field in field_lower for field in round_up_fields):
+        return 'up'
+
+    # Round to NEAREST - Neutral times
+    round_nearest_fields = ['shkia', 'shkiah', 'sunset', 'chatzos', 'chatzot', 'sun transit']
+    if any(field in field_lower for field in round_nearest_fields):
+        return 'nearest'
+
+    # Default to rounding up for safety (le'chumra)
+    return 'up'
+
+
+def _translate_month_name(value, language):
+    return JEWISH_MONTH_NAMES.get(value.lower().replace(' ', '_'), {}).get(language, value)
+
+
+def _solar(name, display_key, label, kind=TIME):
+    return ZmanimField(name, display_key, kind, ZMANIM, label, SOLAR,
+                       get_rounding_direction(display_key) if kind == TIME else None)
+
+
+def _calendar(name, display_key, kind, label, source, translate=None):
+    return ZmanimField(name, display_key, kind, CALENDAR, label, source,
+                       get_rounding_direction(display_key) if kind == DATETIME else None, translate)
+
+
+def _limud(name, display_key, source, translate=None):
+    return ZmanimField(name, display_key, TEXT, LIMUDIM, display_key, source, None, translate)
+
+
+FIELDS = [
+    # ========== BASIC ZMANIM TIMES (14 fields) ==========
+    _solar('alos', 'Alos HaShachar', 'Alos HaShachar'),
+    _solar('hanetz', 'Neitz HaChamah', 'Neitz HaChamah (Sunrise)'),
+    _solar('chatzos', 'Chatzos', 'Chatzos (Midday)'),
+    _solar('mincha_gedola', 'Mincha Gedola', 'Mincha Gedola'),
+    _solar('mincha_ketana', 'Mincha Ketana', 'Mincha Ketana'),
+    _solar('plag_hamincha', 'Plag HaMincha', 'Plag HaMincha'),
+    _solar('shkia', 'Shkiah', 'Shkiah (Sunset)'),
+    _solar('tzais', 'Tzais', 'Tzais (Nightfall)'),
+    _solar('tzais_72', 'Tzais 72 minutes', 'Tzais 72 Minutes'),
+    _solar('sof_zman_krias_shema_gra', 'Sof Zman Krias Shema GRA', 'Sof Zman Krias Shema (GRA)'),
+    _solar('sof_zman_krias_shema_mga', 'Sof Zman Krias Shema MGA', 'Sof Zman Krias Shema (MGA)'),
+    _solar('sof_zman_tfila_gra', 'Sof Zman Tefillah GRA', 'Sof Zman Tefillah (GRA)'),
+    _solar('sof_zman_tfila_mga', 'Sof Zman Tefillah MGA', 'Sof Zman Tefillah (MGA)'),
+    _solar('candle_lighting', 'Candle Lighting', 'Candle Lighting'),
+
+    # ========== ADDITIONAL ZMANIM TIMES (12 fields) ==========
+    _solar('sea_level_sunrise', 'Sea Level Sunrise', 'Sea Level Sunrise'),
+    _solar('sea_level_sunset', 'Sea Level Sunset', 'Sea Level Sunset'),
+    _solar('elevation_adjusted_sunrise', 'Elevation Adjusted Sunrise', 'Elevation Adjusted Sunrise'),
+    _solar('elevation_adjusted_sunset', 'Elevation Adjusted Sunset', 'Elevation Adjusted Sunset'),
+    _solar('alos_16_1', 'Alos 16.1°', 'Alos 16.1°'),
+    _solar('alos_18', 'Alos 18°', 'Alos 18°'),
+    _solar('alos_19_8', 'Alos 19.8°', 'Alos 19.8°'),
+    _solar('tzais_8_5', 'Tzais 8.5°', 'Tzais 8.5°'),
+    _solar('tzais_7_083', 'Tzais 7.083°', 'Tzais 7.083°'),
+    _solar('tzais_5_95', 'Tzais 5.95°', 'Tzais 5.95°'),
+    _solar('tzais_6_45', 'Tzais 6.45°', 'Tzais 6.45°'),
+    _solar('sun_transit', 'Sun Transit', 'Sun Transit (Chatzos HaChamah)'),
+
+    # ========== HALACHIC HOURS (3 fields, milliseconds) ==========
+    _solar('shaah_zmanis_gra', 'Shaah Zmanis GRA', 'Shaah Zmanis (GRA) - in minutes', HOURS),
+    _solar('shaah_zmanis_mga', 'Shaah Zmanis MGA', 'Shaah Zmanis (MGA) - in minutes', HOURS),
+    _solar('temporal_hour', 'Temporal Hour', 'Temporal Hour - in minutes', HOURS),
+
+    # ========== JEWISH CALENDAR - DATE INFO (5 fields) ==========
+    _calendar('jewish_year', 'Jewish Year', NUMBER, 'Jewish Year', lambda s: s.jc.jewish_year),
+    _calendar('jewish_month', 'Jewish Month', NUMBER, 'Jewish Month (Number)', lambda s: s.jc.jewish_month),
+    _calendar('jewish_month_name', 'Jewish Month Name', TEXT, 'Jewish Month Name',
+              lambda s: s.jc.jewish_month_name(), _translate_month_name),
+    _calendar('jewish_day', 'Jewish Day', NUMBER, 'Jewish Day', lambda s: s.jc.jewish_day),
+    _calendar('day_of_week', 'Day of Week', WEEKDAY, 'Day of Week (1=Sunday, 7=Saturday)',
+              lambda s: s.jc.day_of_week),
+
+    # ========== JEWISH CALENDAR - SPECIAL DAYS (3 fields) ==========
+    _calendar('significant_day', 'Significant Day', TEXT, 'Significant Day (Holiday Name)',
+              lambda s: s.year_day.significant_day),
+    _calendar('day_of_omer', 'Day of Omer', NUMBER, 'Day of Omer', lambda s: s.year_day.day_of_omer),
+    _calendar('day_of_chanukah', 'Day of Chanukah', NUMBER, 'Day of Chanukah', lambda s: s.year_day.day_of_chanukah),
+
+    # ========== JEWISH CALENDAR - BOOLEAN FLAGS (8 fields) ==========
+    _calendar('is_rosh_chodesh', 'Is Rosh Chodesh', FLAG, 'Is Rosh Chodesh', lambda s: s.jc.is_rosh_chodesh()),
+    _calendar('is_yom_tov', 'Is Yom Tov', FLAG, 'Is Yom Tov', lambda s: s.jc.is_yom_tov()),
+    _calendar('is_chol_hamoed', 'Is Chol HaMoed', FLAG, 'Is Chol HaMoed', lambda s: s.jc.is_chol_hamoed()),
+    _calendar('is_erev_yom_tov', 'Is Erev Yom Tov', FLAG, 'Is Erev Yom Tov', lambda s: s.jc.is_erev_yom_tov()),
+    _calendar('is_chanukah', 'Is Chanukah', FLAG, 'Is Chanukah', lambda s: s.jc.is_chanukah()),
+    _calendar('is_taanis', 'Is Fast Day', FLAG, 'Is Fast Day', lambda s: s.jc.is_taanis()),
+    _calendar('is_assur_bemelacha', 'Is Assur Bemelacha', FLAG, 'Is Assur Bemelacha',
+              lambda s: s.jc.is_assur_bemelacha()),
+    _calendar('is_erev_rosh_chodesh', 'Is Erev Rosh Chodesh', FLAG, 'Is Erev Rosh Chodesh',
+              lambda s: s.jc.is_erev_rosh_chodesh()),
+
+    # ========== JEWISH CALENDAR - MOLAD (1 field) ==========
+    _calendar('molad_datetime', 'Molad', DATETIME, 'Molad (Date & Time)', lambda s: s.jc.molad_as_datetime()),
+
+    # ========== JEWISH CALENDAR - KIDDUSH LEVANA (3 fields) ==========
+    _calendar('kiddush_levana_earliest_3_days', 'Kiddush Levana Earliest (3 Days)', DATETIME,
+              'Kiddush Levana Earliest (3 Days)', lambda s: s.jc.techilas_zman_kiddush_levana_3_days()),
+    _calendar('kiddush_levana_earliest_7_days', 'Kiddush Levana Earliest (7 Days)', DATETIME,
+              'Kiddush Levana Earliest (7 Days)', lambda s: s.jc.techilas_zman_kiddush_levana_7_days()),
+    _calendar('kiddush_levana_latest_15_days', 'Kiddush Levana Latest (15 Days)', DATETIME,
+              'Kiddush Levana Latest (15 Days)', lambda s: s.jc.sof_zman_kiddush_levana_15_days()),
+
+    # ========== LEARNING SCHEDULES (8 fields, in display order) ==========
+    _limud('parsha', 'Parsha', lambda s: s.year_day.parsha, translate_parsha),
+    _limud('daf_yomi_bavli', 'Daf Yomi Bavli', lambda s: get_daf_yomi_bavli(s.date), translate_daf_yomi),
+    _limud('daf_yomi_yerushalmi', 'Daf Yomi Yerushalmi', lambda s: get_daf_yomi_yerushalmi(s.date), translate_daf_yomi),
+    _limud('mishna_yomis', 'Mishna Yomis', lambda s: get_mishna_yomis(s.date), translate_mishna_yomis),
+    _limud('tehillim_monthly', 'Tehillim Monthly', lambda s: get_tehillim_monthly(s.date), translate_tehillim),
+    _limud('pirkei_avos', 'Pirkei Avos', lambda s: get_pirkei_avos(s.date)),
+    _limud('daf_hashavua_bavli', 'Daf HaShavua Bavli', lambda s: get_daf_hashavua_bavli(s.date), translate_daf_yomi),
+    _limud('amud_yomi_bavli_dirshu', 'Amud Yomi Bavli Dirshu', lambda s: get_amud_yomi_bavli_dirshu(s.date),
+           translate_amud_yomi),
+]
+
+FIELDS_BY_NAME = {field.name: field for field in FIELDS}
+
+SOLAR_ZMANIM_FIELDS = [field for field in FIELDS if field.source == SOLAR]
+CALENDAR_SOURCE_FIELDS = [field for field in FIELDS if field.source != SOLAR]
+
+
+def section_fields(section):
+    return [field for field in FIELDS if field.section == section]
+
+
+@lru_cache(maxsize=None)
+def compile_time_formatter(time_format, show_seconds, rounding='up'):
+    """
+    callable(time or datetime) -> display string for one format and rounding rule
+
+    Same output as rounding to the minute and strftime('%I:%M' / '%H:%M',
+    seconds when shown, no leading zero in 12-hour format), done with
+    integer arithmetic. Only the time of day of a datetime is shown.
+    """
+    twelve_hour = time_format == "12h"
+
+    def hour_text(hour):
+        if twelve_hour:
+            return str(hour % 12 or 12)
+        return f"{hour:02d}"
+
+    if show_seconds:
+        def format_time(value):
+            return f"{hour_text(value.hour)}:{value.minute:02d}:{value.second:02d}"
+        return format_time
+
+    if rounding == 'down':
+        def minute_of_day(value):
+            return value.hour * 60 + value.minute
+    elif rounding == 'nearest':
+        def minute_of_day(value):
+            return value.hour * 60 + value.minute + (value.second >= 30)
+    else:
+        def minute_of_day(value):
+            return value.hour * 60 + value.minute + (value.second > 0)
+
+    def format_time(value):
+        hour, minute = divmod(minute_of_day(value) % 1440, 60)
+        return f"{hour_text(hour)}:{minute:02d}"
+    return format_time
+
+
+def _value_formatter(field, time_format, show_seconds, language):
+    """callable(raw value) -> payload value of one field"""
+    if field.kind in (TIME, DATETIME):
+        format_time = compile_time_formatter(time_format, show_seconds, field.rounding)
+        return lambda value: format_time(value) if value else None
+    if field.kind == HOURS:
+        return lambda value: f"{(value / 60000):.1f} min" if value else None
+    if field.kind == WEEKDAY:
+        # JewishCalendar.day_of_week is 1 (Sunday) to 7 (Saturday)
+        return lambda value: WEEKDAY_NAMES[value - 1] if value is not None else None
+    if field.translate is not None:
+        translate = field.translate
+        return lambda value: translate(value, language) if value else value
+    if field.kind == TEXT:
+        return lambda value: value if value else None
+    return lambda value: value
+
+
+class ShulFormatter:
+    """
+    All payload formatting for one (time_format, show_seconds, language),
+    optionally limited to a set of display keys (see display_projection)
+    """
+
+    def __init__(self, time_format, show_seconds, language, display_keys=None):
+        self.time_format = time_format
+        self.show_seconds = show_seconds
+        self.language = language
+        self.display_keys = display_keys
+        self.steps = {
+            section: [
+                (field.display_key, attrgetter(field.name), _value_formatter(field, time_format, show_seconds, language))
+                for field in section_fields(section)
+                if display_keys is None or field.display_key in display_keys
+            ]
+            for section in (ZMANIM, CALENDAR, LIMUDIM)
+        }
+        self.display_names = {field.display_key: translate_term(field.display_key, language) for field in FIELDS}
+
+    def zmanim(self, row):
+        return {key: format_field(get(row)) for key, get, format_field in self.steps[ZMANIM]}
+
+    def jewish_calendar(self, row):
+        return {key: format_field(get(row)) for key, get, format_field in self.steps[CALENDAR]}
+
+    def limudim(self, row):
+        """Only the limudim that have a value today"""
+        limudim = {}
+        for key, get, format_field in self.steps[LIMUDIM]:
+            value = get(row)
+            if value:
+                limudim[key] = format_field(value)
+        return limudim
+
+    def names(self, keys):
+        """Translated display names of payload keys"""
+        return {key: self.display_names.get(key, key) for key in keys}
+
+
+@lru_cache(maxsize=1024)
+def get_formatter(time_format, show_seconds, language='en', display_keys=None):
+    """
+    The (compiled once per process) ShulFormatter for these settings
+
+    display_keys: frozenset of the display keys to format, or None for all
+    """
+    return ShulFormatter(time_format, bool(show_seconds), language or 'en', display_keys)
+
+
+def shul_formatter(shul, display_keys=None):
+    return get_formatter(shul.time_format, shul.show_seconds, shul.language, display_keys)
+
+
+def format_value(value, time_format="24h", show_seconds=True, field_name=''):
+    """Format time values for display with intelligent rounding"""
+    if isinstance(value, (dt_time, datetime)):
+        return compile_time_formatter(time_format, show_seconds, get_rounding_direction(field_name))(value)
+    if hasattr(value, 'strftime'):
+        return value.strftime('%H:%M:%S') if show_seconds else value.strftime('%H:%M')
+    return str(value) if value is not None else None
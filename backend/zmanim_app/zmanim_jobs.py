@@ -0,0 +1,143 @@
+"""
+Background zmanim refresh / extend jobs with progress reporting
+
+The refresh and extend endpoints enqueue a Celery task and return a job id
+straight away. The task reports progress into the cache:
+
+    zmanim:job:<job_id>          progress dict (see start_job)
+    zmanim:job:lock:<shul_id>    id of the shul's running job
+
+Only one job runs per shul: starting another while one is queued or running
+returns the existing job instead of stacking a parallel recalculation. The
+lock of a queued job lasts as long as its progress, however long the job
+waits for a worker; once the task starts (claim_job) it is reset to
+JOB_LOCK_TIMEOUT so a crashed worker can't hold it for long.
+"""
+from django.core.cache import cache
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ('refresh', 'extend')
+
+# Progress stays readable this long after the job finishes
+JOB_TIMEOUT = 60 * 60
+
+# A crashed worker can't hold the shul's lock forever
+JOB_LOCK_TIMEOUT = 10 * 60
+
+# Lock of a job that is still waiting for a worker
+JOB_QUEUED_LOCK_TIMEOUT = JOB_TIMEOUT
+
+# Minimum seconds between progress writes while calculating
+PROGRESS_INTERVAL = 0.5
+
+
+def job_key(job_id):
+    return f'zmanim:job:{job_id}'
+
+
+def job_lock_key(shul_id):
+    return f'zmanim:job:lock:{shul_id}'
+
+
+def start_job(shul, kind):
+    """
+    Enqueue a refresh / extend job for a shul unless one is already running
+
+    Returns:
+        (job, created) - the job's progress dict and whether it was just created
+    """
+    from .tasks import run_zmanim_job
+
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown zmanim job kind: {kind}")
+
+    job_id = uuid.uuid4().hex
+    if not cache.add(job_lock_key(shul.id), job_id, timeout=JOB_QUEUED_LOCK_TIMEOUT):
+        running = get_job(cache.get(job_lock_key(shul.id)))
+        if running is not None:
+            return running, False
+        # Lock without progress (expired) - take it over
+        cache.set(job_lock_key(shul.id), job_id, timeout=JOB_QUEUED_LOCK_TIMEOUT)
+
+    job = {
+        'job_id': job_id,
+        'shul_id': shul.id,
+        'kind': kind,
+        'state': 'queued',
+        'days_done': 0,
+        'days_total': None,
+        'started_at': time.time(),
+        'finished_at': None,
+        'result': None,
+        'error': None,
+    }
+    cache.set(job_key(job_id), job, timeout=JOB_TIMEOUT)
+    run_zmanim_job.apply_async(args=[job_id, shul.id, kind], task_id=job_id)
+    return get_job(job_id) or job, True
+
+
+def get_job(job_id):
+    """Progress dict for a job, with elapsed_seconds filled in (None if unknown)"""
+    if not job_id:
+        return None
+    job = cache.get(job_key(job_id))
+    if job is None:
+        return None
+    end = job['finished_at'] or time.time()
+    job['elapsed_seconds'] = round(end - job['started_at'], 2)
+    return job
+
+
+def update_job(job_id, **fields):
+    job = cache.get(job_key(job_id))
+    if job is None:
+        return
+    job.update(fields)
+    cache.set(job_key(job_id), job, timeout=JOB_TIMEOUT)
+
+
+def claim_job(job_id, shul_id):
+    """
+    Mark a job as running when its task starts
+
+    Returns:
+        False if another job took over the shul's lock meanwhile (the job
+        must not run in parallel with it)
+    """
+    lock = cache.get(job_lock_key(shul_id))
+    if lock is not None and lock != job_id:
+        return False
+    cache.set(job_lock_key(shul_id), job_id, timeout=JOB_LOCK_TIMEOUT)
+    update_job(job_id, state='running')
+    return True
+
+
+def finish_job(job_id, shul_id, result=None, error=None):
+    """Record the outcome and release the shul's lock"""
+    update_job(
+        job_id,
+        state='failed' if error else 'done',
+        result=result,
+        error=error,
+        finished_at=time.time(),
+    )
+    if cache.get(job_lock_key(shul_id)) == job_id:
+        cache.delete(job_lock_key(shul_id))
+
+
+def progress_reporter(job_id):
+    """Progress callback for ZmanimCalculator, throttled to PROGRESS_INTERVAL"""
+    last_write = [0.0]
+
+    def report(days_done, days_total):
+        now = time.monotonic()
+        if days_done < days_total and now - last_write[0] < PROGRESS_INTERVAL:
+            return
+        last_write[0] = now
+        update_job(job_id, state='running', days_done=days_done, days_total=days_total)
+
+    return report
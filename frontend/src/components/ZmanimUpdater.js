@@ -1,11 +1,12 @@
 import React from 'react';
-import { api } from '../utils/api';
+import { api, waitForZmanimJob } from '../utils/api';
 
 function ZmanimUpdater({ onUpdate }) {
     const updateZmanim = async () => {
         try {
-            // First refresh the zmanim
-            await api.post('/zmanim/refresh/');
+            // First refresh the zmanim (runs in the background)
+            const job = await api.post('/zmanim/refresh/');
+            await waitForZmanimJob(job);
 
             // Then fetch the updated data
             const data = await api.get('/zmanim/');
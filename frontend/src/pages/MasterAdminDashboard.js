@@ -217,7 +217,12 @@ function MasterAdminDashboard() {
     }
   };
 
-  const getDisplayStatus = (lastDisplayAccess) => {
+  const getDisplayStatus = (lastDisplayAccess, screensOnline) => {
+    if (screensOnline > 0) {
+      const screens = screensOnline === 1 ? '1 screen' : `${screensOnline} screens`;
+      return { label: `Online (${screens})`, color: 'success', icon: '🟢' };
+    }
+
     if (!lastDisplayAccess) {
       return { label: 'Never Used', color: 'default', icon: '⚫' };
     }
@@ -333,7 +338,7 @@ function MasterAdminDashboard() {
                   </TableRow>
                 ) : (
                   shuls.map((shul) => {
-                    const displayStatus = getDisplayStatus(shul.last_display_access);
+                    const displayStatus = getDisplayStatus(shul.last_display_access, shul.screens_online);
                     return (
                       <TableRow key={shul.id}>
                         <TableCell>{shul.id}</TableCell>
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import { waitForZmanimJob } from '../utils/api';
 
 const API_URL = process.env.REACT_APP_API_BASE_URL || 'http://127.0.0.1:8000/api';
 
@@ -92,7 +93,17 @@ function ZmanimDebug() {
         throw new Error(errorData.error || 'Failed to extend zmanim');
       }
 
-      const data = await response.json();
+      let data = await response.json();
+      if (response.status === 202) {
+        // Extension runs in the background - show progress until it finishes
+        data = await waitForZmanimJob(data, {
+          onProgress: (job) => {
+            if (job.days_total) {
+              setExtendMessage(`Calculating... ${job.days_done}/${job.days_total} days`);
+            }
+          },
+        });
+      }
       setExtendMessage(`✓ ${data.message} (${data.records_created} days added)`);
 
       // Refresh the data after extending
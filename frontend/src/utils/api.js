@@ -99,4 +99,30 @@ export const api = {
   put: ApiService.put.bind(ApiService),
   patch: ApiService.patch.bind(ApiService),
   delete: ApiService.delete.bind(ApiService),
-};
\ No newline at end of file
+};
+// Poll a background zmanim job (refresh / extend) until it finishes.
+// Resolves with the job's result, rejects if the job failed, never left the
+// queue within maxQueuedMs (no worker picked it up) or took over maxWaitMs.
+export async function waitForZmanimJob(
+  job,
+  { interval = 1000, onProgress, maxQueuedMs = 2 * 60 * 1000, maxWaitMs = 30 * 60 * 1000 } = {}
+) {
+  const startedWaiting = Date.now();
+  let current = job;
+  while (current.state !== 'done' && current.state !== 'failed') {
+    const waited = Date.now() - startedWaiting;
+    if (current.state === 'queued' && waited > maxQueuedMs) {
+      throw new Error('Zmanim job did not start - the background worker may not be running. Please try again later.');
+    }
+    if (waited > maxWaitMs) {
+      throw new Error('Zmanim job is taking too long - please check again later.');
+    }
+    if (onProgress) onProgress(current);
+    await new Promise((resolve) => setTimeout(resolve, interval));
+    current = await api.get(`/zmanim/jobs/${current.job_id}/`);
+  }
+  if (current.state === 'failed') {
+    throw new Error(current.error || 'Zmanim calculation failed');
+  }
+  return current.result;
+}